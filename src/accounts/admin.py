@@ -1,7 +1,10 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.contrib.auth.hashers import make_password
 from django.utils.translation import gettext_lazy as _
 
+from core.paginator import EstimatedCountPaginator
+
 from .forms import UserChangeForm, UserCreationForm
 from .models import User
 
@@ -57,6 +60,9 @@ class UserAdmin(BaseUserAdmin):
     date_hierarchy = "date_joined"
     filter_horizontal = ("groups", "user_permissions")
 
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
     form = UserChangeForm
     add_form = UserCreationForm
     actions = [
@@ -87,8 +93,6 @@ class UserAdmin(BaseUserAdmin):
     deactivate.short_description = _("Deactivate")
 
     def set_unusable_password(self, request, queryset):
-        for q in queryset:
-            q.set_unusable_password()
-            q.save()
+        queryset.update(password=make_password(None))
 
     set_unusable_password.short_description = _("Set unusable password")
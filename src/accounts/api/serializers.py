@@ -17,6 +17,12 @@ class UserSerializer(serializers.ModelSerializer):
         },
     )
 
+    def validate_email(self, value):
+        # The field's own UniqueValidator is case-sensitive; the Lower(email) constraint is not
+        if User.objects.filter_by_email(value).exists():
+            raise serializers.ValidationError("user with this Email already exists.")
+        return value
+
     def validate(self, attrs):
         """Validate password for registration"""
 
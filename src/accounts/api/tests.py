@@ -1,4 +1,7 @@
+from unittest import mock
+
 from django.urls import reverse
+from kombu.exceptions import OperationalError
 from rest_framework import status
 from rest_framework.test import APITestCase
 
@@ -23,3 +26,35 @@ class UserProfileTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.user.refresh_from_db()
         self.assertEqual(self.user.name, "Updated Name")
+
+
+@mock.patch("accounts.api.views.warm_user_cache")
+class LoginTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="testuser@example.com", password="testpass123", name="Test User", is_verified=True
+        )
+        self.url = reverse("accounts_api:login")
+        self.credentials = {"email": "testuser@example.com", "password": "testpass123"}
+
+    def test_login_queues_cache_warmup_after_commit(self, warm_user_cache):
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.post(self.url, self.credentials)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("access", response.data)
+        warm_user_cache.apply_async.assert_not_called()
+        for callback in callbacks:
+            callback()
+        warm_user_cache.apply_async.assert_called_once_with((self.user.pk,), retry=False)
+
+    def test_broker_outage_does_not_fail_login(self, warm_user_cache):
+        warm_user_cache.apply_async.side_effect = OperationalError
+        with self.assertLogs("accounts.api.views", "WARNING"), self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, self.credentials)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_bad_credentials_queue_nothing(self, warm_user_cache):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, {**self.credentials, "password": "wrong"})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        warm_user_cache.apply_async.assert_not_called()
@@ -1,24 +1,33 @@
+import logging
+from functools import partial
+
 from django.conf import settings
+from django.db import transaction
 from django.template.loader import render_to_string
 from django.utils.encoding import force_str
 from django.utils.http import urlsafe_base64_decode
 from django.utils.encoding import force_bytes
 from django.utils.http import urlsafe_base64_encode
 from drf_spectacular.utils import OpenApiResponse, extend_schema, extend_schema_view
+from kombu.exceptions import OperationalError
 from rest_framework import generics, status
 from rest_framework.generics import UpdateAPIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenObtainPairView
 
 from accounts.models import User
 from accounts.tasks import send_email
 from accounts.utils import account_activation_token
+from pulp_fiction.tasks import warm_user_cache
 
 from .serializers import ChangePasswordSerializer, MyTokenObtainPairSerializer, UserProfileSerializer, UserSerializer
 
+logger = logging.getLogger(__name__)
+
 
 class RegisterView(generics.CreateAPIView):
     queryset = User.objects.all()
@@ -88,6 +97,24 @@ class RegisterView(generics.CreateAPIView):
 class LoginView(TokenObtainPairView):
     serializer_class = MyTokenObtainPairSerializer
 
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        try:
+            serializer.is_valid(raise_exception=True)
+        except TokenError as e:
+            raise InvalidToken(e.args[0]) from e
+        # Fill the dashboard caches while the client is still handling the token response
+        transaction.on_commit(partial(queue_cache_warmup, serializer.user.pk))
+        return Response(serializer.validated_data, status=status.HTTP_200_OK)
+
+
+def queue_cache_warmup(user_id):
+    # Best effort: without a broker the caches fill on first use, and the login must still succeed
+    try:
+        warm_user_cache.apply_async((user_id,), retry=False)
+    except OperationalError:
+        logger.warning("Could not queue cache warm-up for user %s", user_id, exc_info=True)
+
 
 class LogoutView(APIView):
     permission_classes = (IsAuthenticated,)
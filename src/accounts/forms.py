@@ -62,11 +62,9 @@ class UserCreationForm(BaseUserCreationForm):
 
     def clean_email(self):
         email = self.cleaned_data["email"].lower()
-        try:
-            User.objects.get(email__iexact=email)
-        except User.DoesNotExist:
-            return email
-        raise forms.ValidationError(self.error_messages["duplicate_email"])
+        if User.objects.filter_by_email(email).exists():
+            raise forms.ValidationError(self.error_messages["duplicate_email"])
+        return email
 
     def clean_password2(self):
         password1 = self.cleaned_data.get("password1")
@@ -95,7 +93,7 @@ class EditUserForm(forms.ModelForm):
         email = self.cleaned_data.get("email")
         if self.instance.email == email:
             return email
-        uu = User.objects.filter(email=email).exclude(pk=self.instance.pk).exists()
+        uu = User.objects.filter_by_email(email).exclude(pk=self.instance.pk).exists()
         if uu:
             raise forms.ValidationError(_("This email address is already using by another user."))
         return email
@@ -0,0 +1,65 @@
+import random
+import time
+
+from django.contrib.auth.hashers import check_password, make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from core.benchmarks import LATENCY_COLUMNS, latency_summary, query_runner, time_each
+
+TABLE = "bench_login_user"
+
+# What the login lookup (UserManager.get_by_natural_key) compiled to before and after the Lower(email) index
+LOOKUPS = {
+    "iexact": f'SELECT id FROM {TABLE} WHERE UPPER("email"::text) = UPPER(%s)',
+    "lower": f'SELECT id FROM {TABLE} WHERE LOWER("email") = LOWER(%s)',
+}
+
+
+class Command(BaseCommand):
+    help = "Compare the login user lookup with email__iexact and with the Lower(email) index (PostgreSQL)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1_000_000, help="Rows in the scratch user table.")
+        parser.add_argument("--queries", type=int, default=200, help="Timed lookups per variant.")
+        parser.add_argument("--keep", action="store_true", help="Keep the table; later runs reuse it.")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("This benchmark requires PostgreSQL.")
+        try:
+            self._create(options["users"])
+            rng = random.Random(0)
+            # Logins arrive in whatever case the user typed
+            emails = [f"User{rng.randint(1, options['users'])}@Example.COM" for _ in range(options["queries"])]
+            self.stdout.write(f"{'lookup':<8} {'plan':<18} {LATENCY_COLUMNS}")
+            with connection.cursor() as cursor:
+                for name, sql in LOOKUPS.items():
+                    cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", [emails[0]])
+                    plan = cursor.fetchone()[0][0]["Plan"]["Node Type"]
+                    timings = time_each(query_runner(cursor, sql), [[email] for email in emails])
+                    self.stdout.write(f"{name:<8} {plan:<18} {latency_summary(timings)}")
+            # Same for both lookups, and usually the larger share of a successful login
+            encoded = make_password("benchmark")
+            started = time.perf_counter()
+            check_password("benchmark", encoded)
+            self.stdout.write(f"Password check (default hasher): {(time.perf_counter() - started) * 1000:.2f} ms")
+        finally:
+            if not options["keep"]:
+                with connection.cursor() as cursor:
+                    cursor.execute(f"DROP TABLE IF EXISTS {TABLE}")
+
+    def _create(self, users):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT to_regclass(%s)", [TABLE])
+            if cursor.fetchone()[0] is not None:
+                self.stdout.write(f"Reusing {TABLE}")
+                return
+            self.stdout.write(f"Creating {TABLE} with {users} users...")
+            cursor.execute(f"CREATE UNLOGGED TABLE {TABLE} (id bigserial PRIMARY KEY, email varchar(255) UNIQUE)")
+            cursor.execute(
+                f"INSERT INTO {TABLE} (email) SELECT 'user' || g || '@example.com' FROM generate_series(1, %s) AS g",
+                [users],
+            )
+            cursor.execute(f'CREATE UNIQUE INDEX {TABLE}_email_lower_uniq ON {TABLE} (LOWER("email"))')
+            cursor.execute(f"VACUUM ANALYZE {TABLE}")
@@ -0,0 +1,40 @@
+# Generated by Django 5.1.15 on 2026-10-19 03:34
+
+import django.db.models.functions.text
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import Lower
+
+
+def check_case_duplicates(apps, schema_editor):
+    """Refuse to migrate while emails differing only in case exist; they have to be merged by hand first."""
+    User = apps.get_model("accounts", "User")
+    duplicates = (
+        User.objects.using(schema_editor.connection.alias)
+        .values(email_lower=Lower("email"))
+        .annotate(accounts=Count("id"))
+        .filter(accounts__gt=1)
+        .order_by("email_lower")
+    )
+    if duplicates.exists():
+        listed = ", ".join(f"{row['email_lower']} ({row['accounts']} accounts)" for row in duplicates[:20])
+        raise RuntimeError(
+            f"{duplicates.count()} emails are registered more than once with different case: {listed}. "
+            "Merge or rename these accounts, then run the migration again."
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_user_is_verified'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_case_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='user',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('email'), name='user_email_lower_uniq', violation_error_message='This email address is already registered by another user.'),
+        ),
+    ]
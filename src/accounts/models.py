@@ -4,6 +4,8 @@ from django.contrib.auth.models import (
     PermissionsMixin,
 )
 from django.db import models
+from django.db.models import Value
+from django.db.models.functions import Lower
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
@@ -47,8 +49,15 @@ class UserManager(BaseUserManager):
         """
         return self._create_user(email, name, password, True, True, **extra_fields)
 
+    def filter_by_email(self, email):
+        """Case-insensitive email match served by the ``Lower(email)`` unique index.
+
+        ``email__iexact`` compiles to ``UPPER(email) = UPPER(%s)``, which no index covers.
+        """
+        return self.alias(email_lower=Lower("email")).filter(email_lower=Lower(Value(email)))
+
     def get_by_natural_key(self, email):
-        return self.get(email__iexact=email)
+        return self.filter_by_email(email).get()
 
 
 class User(AbstractBaseUser, PermissionsMixin):
@@ -88,6 +97,13 @@ class User(AbstractBaseUser, PermissionsMixin):
         verbose_name = _("User")
         verbose_name_plural = _("Users")
         ordering = ["name", "-date_joined"]
+        constraints = [
+            models.UniqueConstraint(
+                Lower("email"),
+                name="user_email_lower_uniq",
+                violation_error_message=_("This email address is already registered by another user."),
+            ),
+        ]
 
     def get_first_name(self) -> str:
         """
@@ -1,5 +1,8 @@
+from django.db import IntegrityError, connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
+from ..api.serializers import UserSerializer
 from ..models import User
 
 
@@ -36,3 +39,16 @@ class UserTests(TestCase):
         self.assertTrue(self.u1.has_usable_password())
         self.assertTrue(self.u2.has_usable_password())
         self.assertTrue(self.u3.has_usable_password())
+
+    def test_email_lookup_is_case_insensitive_and_uses_lower(self):
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(User.objects.get_by_natural_key("Demo@MAIL.com"), self.u1)
+        self.assertIn('LOWER("accounts_user"."email")', ctx.captured_queries[0]["sql"])
+        self.assertNotIn("UPPER", ctx.captured_queries[0]["sql"])
+
+    def test_case_duplicate_emails_are_rejected(self):
+        serializer = UserSerializer(data={"email": "DEMO@mail.com", "name": "Copy", "password": "long-enough-1"})
+        self.assertFalse(serializer.is_valid())
+        self.assertIn("email", serializer.errors)
+        with self.assertRaises(IntegrityError):
+            User.objects.create_user("DEMO@mail.com", "Copy", "demo")
@@ -1,19 +1,7 @@
 import os
-from channels.routing import ProtocolTypeRouter, URLRouter
-from channels.auth import AuthMiddlewareStack
-from django.core.asgi import get_asgi_application
 
+from django.core.asgi import get_asgi_application
 
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.prod')
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.prod")
 
-django_asgi_app = get_asgi_application()
-application = ProtocolTypeRouter({
-    'http': django_asgi_app,
-    'websocket': AuthMiddlewareStack(
-        URLRouter(
-            [
-                # Add the consumers here
-            ]
-        )
-    ),
-})
+application = get_asgi_application()
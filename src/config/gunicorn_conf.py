@@ -0,0 +1,121 @@
+"""Gunicorn server profile: ``gunicorn -c config/gunicorn_conf.py``.
+
+Workers are sized from the CPUs and memory actually granted to the container (cgroup limits, not the host),
+the app is preloaded in the master, inherited DB/Redis sockets are dropped around fork and workers are
+recycled after a jittered number of requests. Every value can be overridden through ``GUNICORN_*`` env vars.
+The sizing helpers are plain functions so they can be tested without starting a server.
+"""
+import os
+
+CGROUP_ROOT = "/sys/fs/cgroup"
+# No limit in cgroup v1 is reported as a value close to 2**63
+UNLIMITED_THRESHOLD = 1 << 60
+
+
+def _read(path):
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def cgroup_cpu_limit(root=CGROUP_ROOT):
+    """CPU quota in cores from cgroup v2 ``cpu.max`` or v1 CFS files, or ``None`` when unlimited."""
+    cpu_max = _read(os.path.join(root, "cpu.max"))
+    if cpu_max:
+        quota, _, period = cpu_max.partition(" ")
+        if quota != "max" and period:
+            return int(quota) / int(period)
+        return None
+    quota = _read(os.path.join(root, "cpu", "cpu.cfs_quota_us"))
+    period = _read(os.path.join(root, "cpu", "cpu.cfs_period_us"))
+    if quota and period and int(quota) > 0:
+        return int(quota) / int(period)
+    return None
+
+
+def cgroup_memory_limit(root=CGROUP_ROOT):
+    """Memory limit in bytes from cgroup v2 ``memory.max`` or v1 ``memory.limit_in_bytes``, or ``None``."""
+    for path in (os.path.join(root, "memory.max"), os.path.join(root, "memory", "memory.limit_in_bytes")):
+        value = _read(path)
+        if value and value != "max" and int(value) < UNLIMITED_THRESHOLD:
+            return int(value)
+    return None
+
+
+def available_cpus(root=CGROUP_ROOT):
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+    quota = cgroup_cpu_limit(root)
+    if quota is not None:
+        cpus = min(cpus, quota)
+    return max(cpus, 1)
+
+
+def compute_workers(cpus, memory_bytes=None, worker_memory_mb=256, max_workers=None):
+    """Classic ``2 * cores + 1``, capped by how many workers fit in 80% of the memory limit."""
+    workers = int(2 * cpus) + 1
+    if memory_bytes:
+        workers = min(workers, int(memory_bytes * 0.8 // (worker_memory_mb * 1024 * 1024)))
+    if max_workers:
+        workers = min(workers, max_workers)
+    return max(workers, 1)
+
+
+def close_inherited_connections():
+    """Drop DB and Redis connections so a forked worker never shares sockets with the master."""
+    from django.core.cache import caches
+    from django.db import connections
+
+    connections.close_all()
+    for cache in caches.all(initialized_only=True):
+        for pool in getattr(getattr(cache, "_cache", None), "_pools", {}).values():
+            pool.reset()
+
+
+def _env_int(name, default):
+    return int(os.environ.get(name, default))
+
+
+# Server socket
+bind = f"0.0.0.0:{os.environ.get('APP_PORT', '8000')}"
+chdir = os.environ.get("GUNICORN_CHDIR", os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Worker processes
+use_asgi = os.environ.get("GUNICORN_ASGI", "0") == "1"
+wsgi_app = "config.asgi:application" if use_asgi else "config.wsgi:application"
+worker_class = "uvicorn.workers.UvicornWorker" if use_asgi else "gthread"
+workers = _env_int(
+    "GUNICORN_WORKERS",
+    compute_workers(
+        available_cpus(),
+        cgroup_memory_limit(),
+        worker_memory_mb=_env_int("GUNICORN_WORKER_MEMORY_MB", 256),
+        max_workers=_env_int("GUNICORN_MAX_WORKERS", 0) or None,
+    ),
+)
+threads = _env_int("GUNICORN_THREADS", 1 if use_asgi else 4)
+timeout = _env_int("GUNICORN_TIMEOUT", 30)
+graceful_timeout = _env_int("GUNICORN_GRACEFUL_TIMEOUT", 30)
+keepalive = _env_int("GUNICORN_KEEPALIVE", 5)
+
+# Load Django once in the master and share the pages copy-on-write
+preload_app = os.environ.get("GUNICORN_PRELOAD", "1") == "1"
+
+# Recycle workers to bound memory growth; jitter keeps them from restarting at the same moment
+max_requests = _env_int("GUNICORN_MAX_REQUESTS", 2000)
+max_requests_jitter = _env_int("GUNICORN_MAX_REQUESTS_JITTER", max_requests // 10)
+
+accesslog = os.environ.get("GUNICORN_ACCESSLOG", "-")
+errorlog = "-"
+loglevel = os.environ.get("GUNICORN_LOGLEVEL", "info")
+
+
+def pre_fork(server, worker):
+    if preload_app:
+        close_inherited_connections()
+
+
+def post_fork(server, worker):
+    if preload_app:
+        close_inherited_connections()
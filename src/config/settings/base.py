@@ -2,6 +2,7 @@ import os
 import sys
 from pathlib import Path
 
+from celery.schedules import crontab
 from decouple import Csv, config
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -44,9 +45,10 @@ INSTALLED_APPS = [
     "corsheaders",
     # 'polymorphic',
     # 'anymail',
+    # Ahead of django_extensions, whose clear_cache (a full cache.clear()) would otherwise shadow core's scoped one
+    "core",
     "django_extensions",
     # Add the apps here
-    "core",
     "accounts",
     "pulp_fiction",
 ]
@@ -75,17 +77,24 @@ if SENTRY_DSN:
 
 
 MIDDLEWARE = [
+    "core.middleware.AdmissionControlMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "whitenoise.middleware.WhiteNoiseMiddleware",  # /static/ when Caddy does not serve it; see STORAGES
+    "core.middleware.SlowQueryLogMiddleware",  # see core.slow_queries
+    "core.middleware.CompressionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
-    "django.contrib.sessions.middleware.SessionMiddleware",
+    "core.middleware.WebSessionMiddleware",
     "django.middleware.locale.LocaleMiddleware",
     "django.middleware.common.CommonMiddleware",
-    "django.middleware.csrf.CsrfViewMiddleware",
-    "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "core.middleware.WebCsrfViewMiddleware",
+    "core.middleware.WebAuthenticationMiddleware",
     "core.middleware.CurrentUserMiddleware",  # sets thread-local current user
-    "django.contrib.messages.middleware.MessageMiddleware",
+    "core.middleware.ProfilingMiddleware",  # staff-only, on demand; see core.profiling
+    "core.middleware.WebMessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
+# JWT-only routes, which the core.middleware.Web* session, CSRF, auth and messages middleware skip
+API_PATH_PREFIXES = ("/api/",)
 
 ROOT_URLCONF = "config.urls"
 
@@ -152,6 +161,14 @@ STATIC_ROOT = config("STATIC_ROOT", default=str(PROJECT_ROOT / "data" / "staticf
 
 STATICFILES_DIRS = (os.path.join(BASE_DIR, "static"),)
 
+# collectstatic writes content-hashed copies plus .gz and .br siblings (compressed in parallel) and a manifest
+# that {% static %} resolves names through. Caddy serves them precompressed and immutable from the static
+# volume (docker/caddy/Caddyfile); WhiteNoiseMiddleware does the same in-process for requests that reach Django
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage"},
+}
+
 MEDIA_URL = '/media/'
 MEDIA_ROOT = config('MEDIA_ROOT', default=str(PROJECT_ROOT / 'data' / 'media'))
 
@@ -165,9 +182,82 @@ KEY_PREFIX = config("KEY_PREFIX", default=PROJECT_NAME)
 CELERY_BROKER_URL = REDIS_URL
 CELERY_RESULT_BACKEND = REDIS_URL
 CELERY_BEAT_SCHEDULER = "redbeat.RedBeatScheduler"
+# Tasks are fire-and-forget unless they opt in with ignore_result=False, as those whose state clients poll do
+# (pulp_fiction.tasks.delete_author_in_batches)
+CELERY_TASK_IGNORE_RESULT = True
+CELERY_RESULT_EXPIRES = config("CELERY_RESULT_EXPIRES", default=3600, cast=int)
+# User-facing work stays on the default "celery" queue; bursts of mail and housekeeping get their own queues
+# (see the worker services in compose.*.yml)
+CELERY_TASK_ROUTES = {
+    "accounts.tasks.*": {"queue": "email"},
+    "core.tasks.*": {"queue": "maintenance"},
+    "pulp_fiction.tasks.warm_*": {"queue": "maintenance"},
+    "pulp_fiction.tasks.prune_tombstones": {"queue": "maintenance"},
+}
+# Reserve one task at a time so a worker busy with a long task does not sit on queued short ones
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
 # CELERYBEAT_SCHEDULE_FILENAME = config(
 #     'CELERYBEAT_SCHEDULE_FILENAME', default='/data/celerybeat-schedule.db')
-CELERY_BEAT_SCHEDULE = {}
+# Maintenance jobs are single-flight (core.maintenance.maintenance_job) and log their duration
+CELERY_BEAT_SCHEDULE = {
+    "gc-media": {
+        "task": "core.tasks.gc_media",
+        "schedule": crontab(hour=3, minute=30),
+    },
+    "prune-sync-tombstones": {
+        "task": "pulp_fiction.tasks.prune_tombstones",
+        "schedule": crontab(hour=4, minute=0),
+    },
+    "prune-expired-sessions": {
+        "task": "core.tasks.prune_expired_sessions",
+        "schedule": crontab(hour=4, minute=15),
+    },
+    "prune-expired-tokens": {
+        "task": "core.tasks.prune_expired_tokens",
+        "schedule": crontab(hour=4, minute=30),
+    },
+    "analyze-tables": {
+        "task": "core.tasks.analyze_tables",
+        "schedule": crontab(minute=45, hour="*/6"),
+    },
+    "refresh-user-payloads": {
+        "task": "pulp_fiction.tasks.warm_recent_users_cache",
+        "schedule": crontab(minute=5),
+    },
+}
+# Tables whose statistics analyze_tables refreshes, and the row batch size of the pruning jobs
+MAINTENANCE_ANALYZE_MODELS = ["pulp_fiction.Book", "pulp_fiction.Author", "pulp_fiction.Tombstone", "accounts.User"]
+MAINTENANCE_BATCH_SIZE = config("MAINTENANCE_BATCH_SIZE", default=1000, cast=int)
+
+# Orphaned media files younger than this are never collected (uploads in flight, pending transactions)
+MEDIA_GC_GRACE_HOURS = config("MEDIA_GC_GRACE_HOURS", default=24, cast=float)
+MEDIA_GC_MAX_DELETES_PER_SECOND = config("MEDIA_GC_MAX_DELETES_PER_SECOND", default=200, cast=float)
+
+# Authors with more books than this are deleted by a background task instead of inside the request
+AUTHOR_SYNC_DELETE_MAX_BOOKS = config("AUTHOR_SYNC_DELETE_MAX_BOOKS", default=200, cast=int)
+AUTHOR_DELETE_BATCH_SIZE = config("AUTHOR_DELETE_BATCH_SIZE", default=500, cast=int)
+
+# Admin changelists show the planner's row estimate instead of COUNT(*) above this many rows
+ADMIN_ESTIMATED_COUNT_THRESHOLD = config("ADMIN_ESTIMATED_COUNT_THRESHOLD", default=10000, cast=int)
+
+# Cached per-user payloads (analytics, author list) and their warm-up
+USER_PAYLOAD_CACHE_TIMEOUT = config("USER_PAYLOAD_CACHE_TIMEOUT", default=600, cast=int)
+CACHE_WARM_ACTIVE_DAYS = config("CACHE_WARM_ACTIVE_DAYS", default=7, cast=int)
+CACHE_WARM_MAX_USERS = config("CACHE_WARM_MAX_USERS", default=1000, cast=int)
+CACHE_WARM_RATE_LIMIT = config("CACHE_WARM_RATE_LIMIT", default="20/s")
+
+# Bearer token Prometheus uses to scrape /metrics/ (core.task_metrics); the endpoint is disabled when empty
+METRICS_TOKEN = config("METRICS_TOKEN", default="")
+
+# Delta sync (sync/changes): rows per stream and page, how long deletions are remembered, and how far behind
+# "now" the feed stays so rows from transactions that commit late are not skipped
+SYNC_PAGE_SIZE = config("SYNC_PAGE_SIZE", default=500, cast=int)
+SYNC_TOMBSTONE_RETENTION_DAYS = config("SYNC_TOMBSTONE_RETENTION_DAYS", default=30, cast=int)
+SYNC_SETTLE_SECONDS = config("SYNC_SETTLE_SECONDS", default=2, cast=float)
+
+# Hash partitions of the book table by owner (PostgreSQL only), created by migration 0007 or
+# `manage.py partition_books`; 0 keeps a plain table. See pulp_fiction.partitioning.
+BOOK_PARTITIONS = config("BOOK_PARTITIONS", default=0, cast=int)
 
 
 DEFAULT_FROM_EMAIL = config("DEFAULT_FROM_EMAIL", default="noreply@NEWPROJECTNAME.com")
@@ -204,13 +294,34 @@ REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": ("rest_framework_simplejwt.authentication.JWTAuthentication",),
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 9,
+    "DEFAULT_RENDERER_CLASSES": (
+        "core.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
     "DEFAULT_PARSER_CLASSES": (
-        "rest_framework.parsers.JSONParser",
+        "core.parsers.FastJSONParser",
         "rest_framework.parsers.FormParser",
         "rest_framework.parsers.MultiPartParser",
     ),
+    "DEFAULT_THROTTLE_CLASSES": ("core.throttling.TokenBucketThrottle",),
+    # Reverse proxies in front of Django that append to X-Forwarded-For; anon throttle buckets are keyed by the client
+    # address they recorded. 0 uses REMOTE_ADDR; DRF's default of None would trust the client-supplied header
+    "NUM_PROXIES": config("NUM_PROXIES", default=0, cast=int),
+    "DEFAULT_THROTTLE_RATES": {
+        "anon": config("THROTTLE_RATE_ANON", default="60/min"),
+        "user": config("THROTTLE_RATE_USER", default="600/min"),
+        # analytics, authors/all and other endpoints that aggregate a user's whole library
+        "heavy": config("THROTTLE_RATE_HEAVY", default="60/min"),
+    },
 }
 
+# Load shedding (core.middleware.AdmissionControlMiddleware); the proxy stamps X-Request-Start. 0 disables.
+# Off by default: only turn on behind a proxy that overwrites any X-Request-Start the client sent
+ADMISSION_TRUST_REQUEST_START = config("ADMISSION_TRUST_REQUEST_START", default=False, cast=bool)
+ADMISSION_TARGET_MS = config("ADMISSION_TARGET_MS", default=250, cast=int)
+ADMISSION_INTERVAL_MS = config("ADMISSION_INTERVAL_MS", default=1000, cast=int)
+ADMISSION_RETRY_AFTER = config("ADMISSION_RETRY_AFTER", default=2, cast=int)
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "Your Project API",
     "DESCRIPTION": "API documentation for Your Project",
@@ -227,6 +338,31 @@ SPECTACULAR_SETTINGS = {
     },
 }
 
+# API image uploads (core.uploads): size cap, accepted formats and a pixel cap against decompression bombs
+IMAGE_UPLOAD_MAX_BYTES = config("IMAGE_UPLOAD_MAX_BYTES", default=5 * 1024 * 1024, cast=int)
+IMAGE_UPLOAD_MAX_PIXELS = config("IMAGE_UPLOAD_MAX_PIXELS", default=40_000_000, cast=int)
+IMAGE_UPLOAD_FORMATS = ("JPEG", "PNG", "WEBP", "GIF")
+
+# Upper bound on ids accepted by the batch-get endpoints
+BATCH_GET_MAX_IDS = config("BATCH_GET_MAX_IDS", default=100, cast=int)
+
+# Responses smaller than this are sent uncompressed; see core.compression for codec levels
+COMPRESSION_MIN_SIZE = config("COMPRESSION_MIN_SIZE", default=1024, cast=int)
+
+# Prebuilt by `manage.py build_schema` on deploy; generated once per process when missing
+OPENAPI_SCHEMA_PATH = config("OPENAPI_SCHEMA_PATH", default=str(PROJECT_ROOT / "data" / "openapi.json"))
+
+# Per-request profiles captured by core.middleware.ProfilingMiddleware (ring buffer of PROFILE_MAX_FILES files)
+PROFILE_DIR = config("PROFILE_DIR", default=str(PROJECT_ROOT / "data" / "profiles"))
+PROFILE_MAX_FILES = config("PROFILE_MAX_FILES", default=50, cast=int)
+PROFILE_TOKEN_MAX_AGE = config("PROFILE_TOKEN_MAX_AGE", default=8 * 3600, cast=int)
+PROFILE_INTERVAL = config("PROFILE_INTERVAL", default=0.001, cast=float)
+
+# Slow query log (core.slow_queries): statements at or above the threshold are sampled into Redis. 0 disables.
+SLOW_QUERY_THRESHOLD_MS = config("SLOW_QUERY_THRESHOLD_MS", default=200, cast=float)
+SLOW_QUERY_SAMPLE_RATE = config("SLOW_QUERY_SAMPLE_RATE", default=1.0, cast=float)
+SLOW_QUERY_RETENTION_DAYS = config("SLOW_QUERY_RETENTION_DAYS", default=7, cast=int)
+
 CORS_ALLOW_ALL_ORIGINS = True
 
 # Add Simple JWT settings (optional)
@@ -235,4 +371,5 @@ from datetime import timedelta
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=60),
     "AUTH_HEADER_TYPES": ("Bearer",),
+    "UPDATE_LAST_LOGIN": True,  # cache warm-up prioritizes users by last_login
 }
@@ -4,6 +4,7 @@ DEBUG = False
 
 CELERY_BROKER_URL = "redis://"
 CELERY_RESULT_BACKEND = "redis://"
+CELERY_TASK_ALWAYS_EAGER = True
 
 PASSWORD_HASHERS = [
     "django.contrib.auth.hashers.MD5PasswordHasher",
@@ -15,6 +16,14 @@ CACHES = {
     }
 }
 
+# Tests never run collectstatic, so there is no manifest to resolve hashed names from
+STORAGES = {
+    **STORAGES,  # noqa: F405
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+# ...nor a STATIC_ROOT for WhiteNoiseMiddleware to index at startup
+WHITENOISE_AUTOREFRESH = True
+
 EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
 DEFAULT_FROM_EMAIL = "test@test.com"
 
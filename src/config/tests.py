@@ -0,0 +1,44 @@
+import os
+import tempfile
+
+from django.test import SimpleTestCase
+
+from config import gunicorn_conf
+
+
+class GunicornProfileTests(SimpleTestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def _write(self, name, value):
+        path = os.path.join(self.tmp.name, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(value)
+
+    def test_cgroup_v2_limits(self):
+        self._write("cpu.max", "150000 100000\n")
+        self._write("memory.max", str(1024**3))
+        self.assertEqual(gunicorn_conf.cgroup_cpu_limit(self.tmp.name), 1.5)
+        self.assertEqual(gunicorn_conf.cgroup_memory_limit(self.tmp.name), 1024**3)
+
+    def test_cgroup_v1_unlimited(self):
+        self._write("cpu/cpu.cfs_quota_us", "-1")
+        self._write("cpu/cpu.cfs_period_us", "100000")
+        self._write("memory/memory.limit_in_bytes", str(2**63 - 4096))
+        self.assertIsNone(gunicorn_conf.cgroup_cpu_limit(self.tmp.name))
+        self.assertIsNone(gunicorn_conf.cgroup_memory_limit(self.tmp.name))
+
+    def test_compute_workers(self):
+        self.assertEqual(gunicorn_conf.compute_workers(4), 9)
+        # 1 GiB * 0.8 fits three 256 MiB workers
+        self.assertEqual(gunicorn_conf.compute_workers(4, memory_bytes=1024**3), 3)
+        self.assertEqual(gunicorn_conf.compute_workers(4, max_workers=2), 2)
+        self.assertEqual(gunicorn_conf.compute_workers(1, memory_bytes=1), 1)
+
+    def test_module_defaults(self):
+        self.assertTrue(gunicorn_conf.preload_app)
+        self.assertEqual(gunicorn_conf.wsgi_app, "config.wsgi:application")
+        self.assertGreaterEqual(gunicorn_conf.workers, 1)
+        self.assertGreater(gunicorn_conf.max_requests_jitter, 0)
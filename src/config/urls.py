@@ -2,24 +2,29 @@ from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path, re_path
-from drf_spectacular.views import (
-    SpectacularAPIView,
-    SpectacularRedocView,
-    SpectacularSwaggerView,
-)
+from drf_spectacular.views import SpectacularRedocView, SpectacularSwaggerView
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
+from core.admin import profile_download_view, profile_list_view
+from core.schema import CachedSpectacularAPIView
+
 admin.site.site_header = "NEWPROJECTNAME | Admin console"
 # admin.site.enable_nav_sidebar = False
 
 
 urlpatterns = [
     path("superadmin/doc/", include("django.contrib.admindocs.urls")),
+    path("superadmin/profiles/", admin.site.admin_view(profile_list_view), name="admin-profiles"),
+    path(
+        "superadmin/profiles/<str:name>",
+        admin.site.admin_view(profile_download_view),
+        name="admin-profile-download",
+    ),
     path("superadmin/", admin.site.urls),
     path("api/token/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
     path("api/token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
     # drf-spectacular URLs
-    path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
+    path("api/schema/", CachedSpectacularAPIView.as_view(), name="schema"),
     # Swagger UI
     path("api/docs/", SpectacularSwaggerView.as_view(url_name="schema"), name="swagger-ui"),
     # Redoc UI
@@ -0,0 +1,29 @@
+import os
+
+from django.conf import settings
+from django.contrib import admin
+from django.http import FileResponse, Http404
+from django.template.response import TemplateResponse
+from django.utils.translation import gettext_lazy as _
+
+from core.profiling import PROFILE_NAME_RE, list_profiles, make_token
+
+
+def profile_list_view(request):
+    context = {
+        **admin.site.each_context(request),
+        "title": _("Request profiles"),
+        "profiles": list_profiles(),
+        "token": make_token(request.user),
+        "token_max_age_hours": settings.PROFILE_TOKEN_MAX_AGE // 3600,
+    }
+    return TemplateResponse(request, "admin/core/profiles.html", context)
+
+
+def profile_download_view(request, name):
+    if not PROFILE_NAME_RE.match(name):
+        raise Http404
+    try:
+        return FileResponse(open(os.path.join(settings.PROFILE_DIR, name), "rb"), as_attachment=True, filename=name)
+    except FileNotFoundError:
+        raise Http404
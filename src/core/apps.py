@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class CoreConfig(AppConfig):
+    name = "core"
+
+    def ready(self):
+        # Connects the Celery metrics signal handlers in web and worker processes alike
+        from . import task_metrics  # noqa: F401
@@ -0,0 +1,45 @@
+"""Timing and latency summaries shared by the ``bench_*`` management commands."""
+import statistics
+import time
+
+LATENCY_COLUMNS = f"{'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}"
+
+
+def time_each(func, items, *, warm_up=True):
+    """Milliseconds taken by each ``func(item)`` call, after an untimed pass over ``items`` when ``warm_up`` is set."""
+    if warm_up:
+        for item in items:
+            func(item)
+    timings = []
+    for item in items:
+        started = time.perf_counter()
+        func(item)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def time_per_call(func, items):
+    """Mean seconds per ``func(item)`` call over one pass through ``items``, timed as a whole.
+
+    For calls too short to time one by one, where two ``perf_counter()`` reads per call would skew the figure.
+    """
+    started = time.perf_counter()
+    for item in items:
+        func(item)
+    return (time.perf_counter() - started) / len(items)
+
+
+def query_runner(cursor, sql):
+    """A ``func(params)`` for :func:`time_each` that runs ``sql`` on ``cursor`` and fetches every row."""
+
+    def run(params):
+        cursor.execute(sql, params)
+        cursor.fetchall()
+
+    return run
+
+
+def latency_summary(timings):
+    """p50, p95 and max of ``timings`` (ms), lined up under :data:`LATENCY_COLUMNS`."""
+    p95 = statistics.quantiles(timings, n=20)[-1] if len(timings) > 1 else timings[0]
+    return f"{statistics.median(timings):>8.2f} {p95:>8.2f} {max(timings):>8.2f}"
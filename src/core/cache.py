@@ -0,0 +1,76 @@
+"""Cache key conventions and scoped invalidation for the shared Redis instance.
+
+Keys written through :func:`model_cache_key` look like ``<app_label>.<model>:user:<id>:<parts>``; Django
+then prepends ``<KEY_PREFIX>:<version>:``. That layout lets :func:`invalidate` target a single model or
+user with a glob pattern instead of flushing a database that also holds the Celery broker and results.
+Non-cache data kept in the same Redis uses :func:`redis_key`, outside that pattern.
+"""
+from dataclasses import dataclass
+
+from django.core.cache import cache
+
+
+@dataclass
+class InvalidationResult:
+    keys: int = 0
+    bytes: int = 0
+
+
+def model_cache_key(model, user_id, name, *parts):
+    return ":".join([model._meta.label_lower, "user", str(user_id), name, *map(str, parts)])
+
+
+def redis_key(namespace, *parts):
+    """``<KEY_PREFIX>-<namespace>:<parts>``, a key that :func:`build_pattern` (and so ``clear_cache``) never matches."""
+    return ":".join([f"{cache.key_prefix}-{namespace}", *map(str, parts)])
+
+
+def build_pattern(model=None, user_id=None):
+    """Return the raw Redis glob matching cache keys for the given model and/or user."""
+    label = model._meta.label_lower if model is not None else "*"
+    user = user_id if user_id is not None else "*"
+    if model is None and user_id is None:
+        return f"{cache.key_prefix}:*"
+    return f"{cache.key_prefix}:*:{label}:user:{user}:*"
+
+
+def get_redis_client():
+    """Return the raw redis-py client behind the default cache, or ``None`` for other backends."""
+    backend = getattr(cache, "_cache", None)
+    if backend is None or not hasattr(backend, "get_client"):
+        return None
+    return backend.get_client(write=True)
+
+
+def invalidate(pattern, batch_size=500, measure=True):
+    """Delete keys matching ``pattern`` using incremental SCAN and pipelined UNLINK.
+
+    Every round trip touches at most ``batch_size`` keys, so Redis is never blocked the way KEYS or
+    FLUSHDB would block it. With ``measure`` the freed memory is estimated via ``MEMORY USAGE``.
+    """
+    client = get_redis_client()
+    if client is None:
+        raise RuntimeError("Scoped invalidation requires the Redis cache backend.")
+
+    result = InvalidationResult()
+    batch = []
+
+    def flush():
+        pipe = client.pipeline(transaction=False)
+        if measure:
+            for key in batch:
+                pipe.memory_usage(key)
+        pipe.unlink(*batch)
+        replies = pipe.execute()
+        result.keys += replies[-1]
+        if measure:
+            result.bytes += sum(size or 0 for size in replies[:-1])
+        batch.clear()
+
+    for key in client.scan_iter(match=pattern, count=batch_size):
+        batch.append(key)
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+    return result
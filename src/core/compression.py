@@ -0,0 +1,122 @@
+"""Content-coding helpers shared by the compression middleware and its benchmark command.
+
+gzip is always available; brotli and zstd are used when the ``brotli`` / ``zstandard`` packages are
+installed. Levels default to fast settings because responses are compressed on the request path.
+"""
+import zlib
+
+from django.conf import settings
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+
+def _levels():
+    return {"zstd": 3, "br": 4, "gzip": 5, **getattr(settings, "COMPRESSION_LEVELS", {})}
+
+
+class GzipStream:
+    def __init__(self, level):
+        # wbits=31 produces a gzip container rather than a raw zlib stream
+        self._obj = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data):
+        return self._obj.compress(data)
+
+    def flush(self):
+        return self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._obj.flush(zlib.Z_FINISH)
+
+
+class BrotliStream:
+    def __init__(self, level):
+        self._obj = brotli.Compressor(quality=level)
+
+    def compress(self, data):
+        return self._obj.process(data)
+
+    def flush(self):
+        return self._obj.flush()
+
+    def finish(self):
+        return self._obj.finish()
+
+
+class ZstdStream:
+    def __init__(self, level):
+        self._obj = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data):
+        return self._obj.compress(data)
+
+    def flush(self):
+        return self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self):
+        return self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_FINISH)
+
+
+def available_encodings():
+    """Supported codings in server preference order."""
+    encodings = []
+    if zstandard is not None:
+        encodings.append("zstd")
+    if brotli is not None:
+        encodings.append("br")
+    encodings.append("gzip")
+    return encodings
+
+
+def get_stream(encoding):
+    stream_class = {"gzip": GzipStream, "br": BrotliStream, "zstd": ZstdStream}[encoding]
+    return stream_class(_levels()[encoding])
+
+
+def compress(encoding, data):
+    stream = get_stream(encoding)
+    return stream.compress(data) + stream.finish()
+
+
+def compress_iterator(encoding, chunks):
+    """Compress a streaming body chunk by chunk, flushing so clients see each chunk promptly."""
+    stream = get_stream(encoding)
+    for chunk in chunks:
+        data = stream.compress(chunk) + stream.flush()
+        if data:
+            yield data
+    yield stream.finish()
+
+
+def parse_accept_encoding(header):
+    """Return ``{coding: q}`` from an Accept-Encoding header."""
+    accepted = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding.strip().lower()] = q
+    return accepted
+
+
+def negotiate(header):
+    """Pick the coding with the highest client q-value, ties broken by server preference, or ``None``."""
+    accepted = parse_accept_encoding(header or "")
+    wildcard = accepted.get("*", 0)
+    q, _, encoding = max((accepted.get(e, wildcard), -i, e) for i, e in enumerate(available_encodings()))
+    return encoding if q > 0 else None
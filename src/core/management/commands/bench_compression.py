@@ -0,0 +1,46 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from rest_framework_simplejwt.tokens import AccessToken
+
+from core import compression
+
+DEFAULT_PATHS = ("/api/books/", "/api/authors/", "/api/authors/all/", "/api/analytics/", "/api/schema/")
+
+
+class Command(BaseCommand):
+    help = "Report bytes on the wire and compression CPU cost per endpoint and content coding."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", required=True, help="Email of the user whose data is fetched.")
+        parser.add_argument("--repeat", type=int, default=20, help="Compressions timed per endpoint and coding.")
+        parser.add_argument("paths", nargs="*", default=DEFAULT_PATHS)
+
+    def handle(self, *args, **options):
+        try:
+            user = get_user_model().objects.get_by_natural_key(options["user"])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"No user {options['user']}")
+
+        hosts = [host for host in settings.ALLOWED_HOSTS if host != "*"]
+        client = Client(HTTP_HOST=hosts[0].lstrip(".") if hosts else "testserver")
+        headers = {"HTTP_AUTHORIZATION": f"Bearer {AccessToken.for_user(user)}", "HTTP_ACCEPT_ENCODING": "identity"}
+
+        self.stdout.write(f"{'endpoint':<24} {'coding':<8} {'bytes':>10} {'ratio':>7} {'cpu ms':>8}")
+        for path in options["paths"]:
+            response = client.get(path, **headers)
+            if response.status_code != 200:
+                self.stderr.write(f"{path}: HTTP {response.status_code}, skipped")
+                continue
+            body = b"".join(response.streaming_content) if response.streaming else response.content
+            self.stdout.write(f"{path:<24} {'identity':<8} {len(body):>10} {1:>7.2f} {0:>8.3f}")
+            for encoding in compression.available_encodings():
+                started = time.process_time()
+                for _ in range(options["repeat"]):
+                    compressed = compression.compress(encoding, body)
+                cpu_ms = (time.process_time() - started) * 1000 / options["repeat"]
+                ratio = len(compressed) / len(body) if body else 1
+                self.stdout.write(f"{path:<24} {encoding:<8} {len(compressed):>10} {ratio:>7.2f} {cpu_ms:>8.3f}")
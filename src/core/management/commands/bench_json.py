@@ -0,0 +1,54 @@
+import io
+import timeit
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from core.parsers import FastJSONParser
+from core.renderers import FastJSONRenderer, orjson
+
+
+def payload(rows):
+    # Serializer DateTimeFields have already turned datetimes into ISO strings by render time
+    now = timezone.now().isoformat().replace("+00:00", "Z")
+    return [
+        {
+            "id": i,
+            "name": f"Book {i}",
+            "content": "Lorem ipsum dolor sit amet " * 8,
+            "image": None,
+            "image_url": f"https://example.com/media/images/book/{i}.png",
+            "author": {"id": i % 50, "name": f"Author {i % 50}", "details": "", "created_at": now, "updated_at": now},
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(rows)
+    ]
+
+
+class Command(BaseCommand):
+    help = "Compare FastJSONRenderer/FastJSONParser throughput with DRF's stdlib JSONRenderer/JSONParser."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, nargs="+", default=[10, 100, 1000], help="Books per payload.")
+        parser.add_argument("--number", type=int, default=50, help="Timed runs per payload and implementation.")
+
+    def handle(self, *args, **options):
+        number = options["number"]
+        self.stdout.write(f"orjson: {'yes' if orjson else 'not installed (fallback)'}")
+        self.stdout.write(
+            f"{'rows':>6} {'drf render':>12} {'fast render':>12} {'drf parse':>12} {'fast parse':>12}  (ms/op)"
+        )
+        for rows in options["rows"]:
+            data = payload(rows)
+            body = JSONRenderer().render(data)
+            timings = [
+                timeit.timeit(lambda r=renderer, d=data: r.render(d), number=number) * 1000 / number
+                for renderer in (JSONRenderer(), FastJSONRenderer())
+            ] + [
+                timeit.timeit(lambda p=parser, b=body: p.parse(io.BytesIO(b)), number=number) * 1000 / number
+                for parser in (JSONParser(), FastJSONParser())
+            ]
+            self.stdout.write(f"{rows:>6} " + " ".join(f"{t:>12.3f}" for t in timings))
@@ -0,0 +1,62 @@
+from django.conf import settings
+from django.core.handlers.base import BaseHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+from django.urls import path
+
+from core.benchmarks import time_per_call
+
+# The stock Django classes the core.middleware.Web* ones stand in for
+STOCK_MIDDLEWARE = {
+    "core.middleware.WebSessionMiddleware": "django.contrib.sessions.middleware.SessionMiddleware",
+    "core.middleware.WebCsrfViewMiddleware": "django.middleware.csrf.CsrfViewMiddleware",
+    "core.middleware.WebAuthenticationMiddleware": "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "core.middleware.WebMessageMiddleware": "django.contrib.messages.middleware.MessageMiddleware",
+}
+
+
+def empty_view(request):
+    return HttpResponse(b"ok", content_type="text/plain")
+
+
+# Served instead of ROOT_URLCONF so only the middleware is measured
+urlpatterns = [
+    path("api/bench/", empty_view),
+    path("bench/", empty_view),
+]
+
+
+class Command(BaseCommand):
+    help = "Time the middleware stack per request for an API and an HTML route, against Django's stock classes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=20000, help="Requests per stack and route.")
+
+    def handle(self, *args, **options):
+        factory = RequestFactory()
+        stacks = {
+            "stock": [STOCK_MIDDLEWARE.get(name, name) for name in settings.MIDDLEWARE],
+            "path-aware": list(settings.MIDDLEWARE),
+        }
+        self.stdout.write(f"{'stack':<12} {'route':<14} {'us/request':>10}")
+        for stack, middleware in stacks.items():
+            with override_settings(MIDDLEWARE=middleware, ROOT_URLCONF=__name__, ALLOWED_HOSTS=["testserver"]):
+                handler = BaseHandler()
+                handler.load_middleware()
+                for route in ("/api/bench/", "/bench/"):
+                    per_request = self._time(handler, factory, route, options["requests"])
+                    self.stdout.write(f"{stack:<12} {route:<14} {per_request:>10.1f}")
+
+    @staticmethod
+    def _time(handler, factory, route, count):
+        response = handler.get_response(factory.get(route))
+        response.close()
+        if response.status_code != 200:
+            raise CommandError(f"{route} answered HTTP {response.status_code}")
+        # Best of five rounds, each on fresh requests, to keep GC pauses and warm-up out of the figure
+        rounds = []
+        for _ in range(5):
+            requests = [factory.get(route) for _ in range(count // 5)]
+            rounds.append(time_per_call(lambda request: handler.get_response(request).close(), requests))
+        return min(rounds) * 1e6
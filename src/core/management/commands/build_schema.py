@@ -0,0 +1,15 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.schema import write_schema
+
+
+class Command(BaseCommand):
+    help = "Generate the OpenAPI schema artifact served at /api/schema/."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--path", default=settings.OPENAPI_SCHEMA_PATH, help="Where to write the schema JSON.")
+
+    def handle(self, *args, **options):
+        digest = write_schema(options["path"])
+        self.stdout.write(f"Wrote {options['path']} (sha256 {digest}).")
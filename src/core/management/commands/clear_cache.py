@@ -1,8 +1,44 @@
-from django.core.management.base import BaseCommand
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from core.cache import build_pattern, invalidate
 
 
 class Command(BaseCommand):
+    help = (
+        "Invalidate cache keys under KEY_PREFIX, optionally narrowed to a model and/or user. "
+        "Uses SCAN + UNLINK so the Redis instance shared with Celery is never flushed or blocked."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--model", help="Only keys of this model, as app_label.ModelName.")
+        parser.add_argument("--user", type=int, help="Only keys of this user id.")
+        parser.add_argument("--batch-size", type=int, default=500, help="Keys scanned and unlinked per round trip.")
+        parser.add_argument("--no-measure", action="store_true", help="Skip MEMORY USAGE (faster, no byte count).")
+        parser.add_argument(
+            "--flush-all",
+            action="store_true",
+            help="Call cache.clear() instead. Flushes the whole Redis database, including Celery data.",
+        )
+
     def handle(self, *args, **options):
         from django.core.cache import cache
 
-        cache.clear()
+        if options["flush_all"]:
+            cache.clear()
+            self.stdout.write("Cache cleared.")
+            return
+
+        model = None
+        if options["model"]:
+            try:
+                model = apps.get_model(options["model"])
+            except (LookupError, ValueError) as e:
+                raise CommandError(str(e))
+
+        pattern = build_pattern(model=model, user_id=options["user"])
+        try:
+            result = invalidate(pattern, batch_size=options["batch_size"], measure=not options["no_measure"])
+        except RuntimeError as e:
+            raise CommandError(str(e))
+        self.stdout.write(f"Removed {result.keys} keys matching {pattern!r} ({result.bytes} bytes).")
@@ -0,0 +1,43 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.media_gc import collect_orphans
+
+
+class Command(BaseCommand):
+    help = "Delete files under MEDIA_ROOT that are not referenced by any file/image field."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Only report orphans, do not delete them.")
+        parser.add_argument(
+            "--grace-hours",
+            type=float,
+            default=settings.MEDIA_GC_GRACE_HOURS,
+            help="Skip files modified more recently than this.",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000, help="Paths checked per database query.")
+        parser.add_argument(
+            "--max-deletes-per-second",
+            type=float,
+            default=settings.MEDIA_GC_MAX_DELETES_PER_SECOND,
+            help="Throttle deletions (0 means unlimited).",
+        )
+
+    def handle(self, *args, **options):
+        verbose = options["verbosity"] > 1
+
+        def on_orphan(path, size):
+            if verbose:
+                self.stdout.write(f"{'would delete' if options['dry_run'] else 'deleting'} {path} ({size} bytes)")
+
+        stats = collect_orphans(
+            grace_seconds=options["grace_hours"] * 3600,
+            batch_size=options["batch_size"],
+            dry_run=options["dry_run"],
+            max_deletes_per_second=options["max_deletes_per_second"],
+            on_orphan=on_orphan,
+        )
+        self.stdout.write(
+            f"Scanned {stats.scanned} files, skipped {stats.skipped_recent} recent, "
+            f"found {stats.orphaned} orphans, deleted {stats.deleted} ({stats.freed_bytes} bytes)."
+        )
@@ -0,0 +1,33 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from core import slow_queries
+
+
+class Command(BaseCommand):
+    help = "Show the slow query fingerprints with the highest total time, as recorded by SlowQueryLogMiddleware."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--top", type=int, default=20, help="Number of fingerprints to show.")
+        parser.add_argument("--plans", action="store_true", help="Include the captured EXPLAIN plans.")
+        parser.add_argument("--reset", action="store_true", help="Discard the recorded queries.")
+
+    def handle(self, *args, **options):
+        if options["reset"]:
+            slow_queries.reset()
+            self.stdout.write("Slow query log cleared.")
+            return
+        entries = slow_queries.top(options["top"])
+        if not entries:
+            self.stdout.write("No slow queries recorded.")
+        for entry in entries:
+            mean = entry["total_ms"] / entry["count"] if entry["count"] else 0
+            self.stdout.write(
+                f"{entry['digest']}  total {entry['total_ms']:.0f} ms  calls {entry['count']}  mean {mean:.0f} ms"
+                f"  last {entry.get('last_seen', '')}"
+            )
+            self.stdout.write(f"  {entry.get('view', '')} at {entry.get('frame', '')}")
+            self.stdout.write(f"  {entry.get('fingerprint', '')}")
+            if options["plans"] and entry["plan"] is not None:
+                self.stdout.write(json.dumps(entry["plan"], indent=2))
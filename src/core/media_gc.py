@@ -0,0 +1,123 @@
+"""Garbage collection of media files that are no longer referenced by any FileField/ImageField.
+
+The filesystem is walked lazily with ``os.scandir`` and candidate paths are checked against the
+database in fixed-size batches, so memory stays bounded regardless of how many files MEDIA_ROOT holds.
+"""
+import os
+import time
+from dataclasses import dataclass
+
+from django.apps import apps
+from django.conf import settings
+from django.db import models
+
+
+@dataclass
+class MediaGCStats:
+    scanned: int = 0
+    skipped_recent: int = 0
+    orphaned: int = 0
+    deleted: int = 0
+    freed_bytes: int = 0
+
+
+def iter_media_files(root):
+    """Yield ``(relative_posix_path, DirEntry)`` for every file below ``root``, depth first."""
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        yield os.path.relpath(entry.path, root).replace(os.sep, "/"), entry
+        except FileNotFoundError:
+            continue
+
+
+def file_field_columns():
+    """Return ``(model, field_name)`` for every concrete FileField in installed apps."""
+    return [
+        (model, field.name)
+        for model in apps.get_models()
+        for field in model._meta.concrete_fields
+        if isinstance(field, models.FileField)
+    ]
+
+
+def referenced_paths(paths, columns):
+    """Return the subset of ``paths`` stored in any of ``columns``; one query per column per batch."""
+    found = set()
+    for model, field_name in columns:
+        found.update(
+            model._base_manager.filter(**{f"{field_name}__in": paths}).values_list(field_name, flat=True)
+        )
+    return found
+
+
+def find_orphans(stats, root=None, grace_seconds=None, batch_size=1000):
+    """Scan phase: yield ``(path, DirEntry, size)`` for files older than the grace period that no row references.
+
+    Paths are checked against the database ``batch_size`` at a time as the walk goes; ``stats`` counts the scan.
+    """
+    root = root or settings.MEDIA_ROOT
+    if grace_seconds is None:
+        grace_seconds = settings.MEDIA_GC_GRACE_HOURS * 3600
+    cutoff = time.time() - grace_seconds
+    columns = file_field_columns()
+
+    def unreferenced(batch):
+        referenced = referenced_paths([path for path, _ in batch], columns)
+        for path, entry in batch:
+            if path not in referenced:
+                stats.orphaned += 1
+                yield path, entry, entry.stat(follow_symlinks=False).st_size
+
+    batch = []
+    for path, entry in iter_media_files(root):
+        stats.scanned += 1
+        if entry.stat(follow_symlinks=False).st_mtime > cutoff:
+            stats.skipped_recent += 1
+            continue
+        batch.append((path, entry))
+        if len(batch) >= batch_size:
+            yield from unreferenced(batch)
+            batch = []
+    if batch:
+        yield from unreferenced(batch)
+
+
+def delete_orphans(orphans, stats, dry_run=False, max_deletes_per_second=None, on_orphan=None):
+    """Delete phase: remove the files ``find_orphans`` yields, at most ``max_deletes_per_second`` (0 is unlimited).
+
+    ``on_orphan`` is called with ``(path, size)`` for every orphan, deleted or not.
+    """
+    if max_deletes_per_second is None:
+        max_deletes_per_second = settings.MEDIA_GC_MAX_DELETES_PER_SECOND
+    delay = 1.0 / max_deletes_per_second if max_deletes_per_second else 0
+    for path, entry, size in orphans:
+        if on_orphan:
+            on_orphan(path, size)
+        if dry_run:
+            continue
+        try:
+            os.remove(entry.path)
+        except FileNotFoundError:
+            continue
+        stats.deleted += 1
+        stats.freed_bytes += size
+        if delay:
+            time.sleep(delay)
+
+
+def collect_orphans(dry_run=False, max_deletes_per_second=None, on_orphan=None, **scan_options):
+    """Delete media files older than the grace period that no database row references.
+
+    ``scan_options`` (``root``, ``grace_seconds``, ``batch_size``) go to :func:`find_orphans`, the rest to
+    :func:`delete_orphans`; unset values fall back to the MEDIA_GC_* settings.
+    """
+    stats = MediaGCStats()
+    delete_orphans(find_orphans(stats, **scan_options), stats, dry_run, max_deletes_per_second, on_orphan)
+    return stats
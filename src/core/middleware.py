@@ -1,28 +1,96 @@
-from django.http import HttpResponseRedirect
-from django.urls import reverse
-from .user_context import set_current_user, clear_current_user
+import re
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth.middleware import AuthenticationMiddleware
 from django.contrib.auth.models import AnonymousUser
+from django.contrib.messages.middleware import MessageMiddleware
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.db import connection
+from django.http import HttpResponseRedirect, JsonResponse
+from django.middleware.csrf import CsrfViewMiddleware
+from django.urls import reverse
+from django.utils.cache import patch_vary_headers
 from rest_framework_simplejwt.authentication import JWTAuthentication
 
+from . import compression, profiling
+from .slow_queries import QueryTimer
+from .user_context import clear_current_user, set_current_user
+
 __all__ = [
     "is_restricted_internal_url",
+    "is_api_path",
     "login_required_middleware",
+    "WebSessionMiddleware",
+    "WebCsrfViewMiddleware",
+    "WebAuthenticationMiddleware",
+    "WebMessageMiddleware",
     "CurrentUserMiddleware",
+    "CompressionMiddleware",
+    "AdmissionControlMiddleware",
+    "ProfilingMiddleware",
+    "SlowQueryLogMiddleware",
 ]
 
 
+# Checked with a single str.startswith(tuple) call, which scans the prefixes in C
+URL_PREFIXES_EXCLUDES = (
+    # '/media/',
+    "/__debug__/",
+    "/login/",
+    "/register/",
+    "/logout/",
+    "/password-",
+    "/reset/",
+    "/superadmin/",
+)
+
+
 def is_restricted_internal_url(url):
-    URL_PREFIXES_EXCLUDES = [
-        # '/media/',
-        "/__debug__/",
-        "/login/",
-        "/register/",
-        "/logout/",
-        "/password-",
-        "/reset/",
-        "/superadmin/",
-    ]
-    return not max([url.startswith(x) for x in URL_PREFIXES_EXCLUDES])
+    return not url.startswith(URL_PREFIXES_EXCLUDES)
+
+
+def is_api_path(path):
+    return path.startswith(settings.API_PATH_PREFIXES)
+
+
+class WebOnlyMiddlewareMixin:
+    """Bypass the middleware on API routes (API_PATH_PREFIXES), which authenticate with bearer JWTs only.
+
+    Mixed into the session, CSRF, authentication and message middleware in place of Django's own classes, so
+    admin and HTML routes keep the full stack and ``/api/`` requests skip cookie parsing, session loading and
+    CSRF token handling. The subclasses keep Django's checks for the middleware the admin needs satisfied.
+    """
+
+    def __call__(self, request):
+        if is_api_path(request.path_info):
+            return self.get_response(request)
+        return super().__call__(request)
+
+
+class WebSessionMiddleware(WebOnlyMiddlewareMixin, SessionMiddleware):
+    pass
+
+
+class WebCsrfViewMiddleware(WebOnlyMiddlewareMixin, CsrfViewMiddleware):
+    def process_view(self, request, callback, callback_args, callback_kwargs):
+        # Registered with the handler directly, so __call__ alone does not bypass it
+        if is_api_path(request.path_info):
+            return None
+        return super().process_view(request, callback, callback_args, callback_kwargs)
+
+
+class WebAuthenticationMiddleware(WebOnlyMiddlewareMixin, AuthenticationMiddleware):
+    def __call__(self, request):
+        if is_api_path(request.path_info):
+            # Resolved from the bearer token by CurrentUserMiddleware and DRF
+            request.user = AnonymousUser()
+        return super().__call__(request)
+
+
+class WebMessageMiddleware(WebOnlyMiddlewareMixin, MessageMiddleware):
+    pass
 
 
 def login_required_middleware(get_response):
@@ -58,3 +126,138 @@ def CurrentUserMiddleware(get_response):
         return response
 
     return middleware
+
+
+# HTML is left alone: pages carry CSRF tokens, and compressing them together with reflected input enables BREACH
+COMPRESSIBLE_CONTENT_TYPE_RE = re.compile(
+    r"^(application/([\w.+-]*json|javascript|xml|vnd\.oai\.openapi)|text/(css|plain|javascript|csv|xml))", re.I
+)
+
+
+def CompressionMiddleware(get_response):
+    """Negotiate zstd/br/gzip for API-sized responses, compressing streaming bodies incrementally."""
+
+    def middleware(request):
+        response = get_response(request)
+        if response.has_header("Content-Encoding") or response.status_code == 304:
+            return response
+        if not COMPRESSIBLE_CONTENT_TYPE_RE.match(response.get("Content-Type", "")):
+            return response
+        patch_vary_headers(response, ("Accept-Encoding",))
+
+        if not response.streaming and len(response.content) < settings.COMPRESSION_MIN_SIZE:
+            return response
+        encoding = compression.negotiate(request.headers.get("Accept-Encoding"))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                return response
+            response.streaming_content = compression.compress_iterator(encoding, response.streaming_content)
+            del response["Content-Length"]
+        else:
+            compressed = compression.compress(encoding, response.content)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response["Content-Length"] = str(len(compressed))
+
+        # The representation changed, so a strong ETag no longer matches it byte for byte
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag
+        response["Content-Encoding"] = encoding
+        return response
+
+    return middleware
+
+
+def queue_delay_ms(request):
+    """Milliseconds since the proxy stamped ``X-Request-Start`` (``t=<epoch>`` in s, ms or us), or ``None``.
+
+    Clients can send the header themselves, so it is only read when ADMISSION_TRUST_REQUEST_START says a proxy in
+    front of Django overwrites it on every request.
+    """
+    if not settings.ADMISSION_TRUST_REQUEST_START:
+        return None
+    value = request.headers.get("X-Request-Start", "").removeprefix("t=")
+    try:
+        started = float(value)
+    except ValueError:
+        return None
+    if started < 1e11:
+        started *= 1000
+    elif started > 1e14:
+        started /= 1000
+    return max(time.time() * 1000 - started, 0)
+
+
+def AdmissionControlMiddleware(get_response):
+    """Answer 503 + Retry-After instead of queueing when the worker is overloaded.
+
+    Like CoDel, a single slow request is tolerated: shedding starts once the queueing delay has stayed above
+    ADMISSION_TARGET_MS for ADMISSION_INTERVAL_MS and stops with the first request seen under target. Rejections
+    are cheap, so the backlog drains quickly instead of every queued request timing out. Requests without the
+    proxy's X-Request-Start header, and all requests unless ADMISSION_TRUST_REQUEST_START is on, are never shed.
+    """
+    lock = threading.Lock()
+    above_since = None
+
+    def middleware(request):
+        nonlocal above_since
+        delay = queue_delay_ms(request) if settings.ADMISSION_TARGET_MS else None
+        if delay is not None:
+            now = time.monotonic()
+            with lock:
+                if delay <= settings.ADMISSION_TARGET_MS:
+                    above_since = None
+                elif above_since is None:
+                    above_since = now
+                shed = above_since is not None and (now - above_since) * 1000 >= settings.ADMISSION_INTERVAL_MS
+            if shed:
+                response = JsonResponse({"detail": "Server is overloaded, retry later."}, status=503)
+                response["Retry-After"] = str(settings.ADMISSION_RETRY_AFTER)
+                return response
+        return get_response(request)
+
+    return middleware
+
+
+def ProfilingMiddleware(get_response):
+    """Profile requests carrying a staff member's profiling token; see core.profiling."""
+
+    def middleware(request):
+        token = profiling.requested_token(request)
+        if not token or not profiling.check_token(token, getattr(request, "user", None)):
+            return get_response(request)
+        if not profiling.lock.acquire(blocking=False):
+            response = get_response(request)
+            response["X-Profile-Skipped"] = "busy"
+            return response
+        try:
+            backend = profiling.get_backend()
+            started = time.perf_counter()
+            backend.start()
+            try:
+                response = get_response(request)
+            finally:
+                backend.stop()
+            response["X-Profile-Id"] = profiling.save_profile(backend, request, time.perf_counter() - started)
+        finally:
+            profiling.lock.release()
+        return response
+
+    return middleware
+
+
+def SlowQueryLogMiddleware(get_response):
+    """Time every statement of the request and log slow ones; see core.slow_queries."""
+
+    def middleware(request):
+        if not settings.SLOW_QUERY_THRESHOLD_MS:
+            return get_response(request)
+        with connection.execute_wrapper(QueryTimer(request)):
+            return get_response(request)
+
+    return middleware
@@ -1,6 +1,10 @@
 from django.conf import settings
 from django.db import models
 from django.utils.translation import gettext_lazy as _
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+from rest_framework import serializers
+from rest_framework.decorators import action
+from rest_framework.response import Response
 
 try:
     from .user_context import get_current_user
@@ -50,3 +54,36 @@ class UserScopedQuerysetMixin:
         if not user or not user.is_authenticated:
             return qs.none()
         return qs.filter(created_by=user)
+
+
+class BatchIdsSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=settings.BATCH_GET_MAX_IDS
+    )
+
+
+class BatchRetrieveMixin:
+    """Adds ``batch-get``: fetch many objects by id in one (user-scoped) ``pk__in`` query.
+
+    ``GET .../batch-get/?ids=3,1,2`` or ``POST .../batch-get/`` with ``{"ids": [3, 1, 2]}``. Results keep the
+    requested order; ids that do not exist or belong to another user are listed under ``missing``.
+    """
+
+    @extend_schema(
+        request=BatchIdsSerializer,
+        parameters=[OpenApiParameter("ids", str, description="Comma separated ids (GET only).")],
+        description=f"Retrieve up to {settings.BATCH_GET_MAX_IDS} objects by id, in request order.",
+    )
+    @action(detail=False, methods=["get", "post"], url_path="batch-get", pagination_class=None)
+    def batch_get(self, request):
+        if request.method == "GET":
+            data = {"ids": [part for part in request.query_params.get("ids", "").split(",") if part.strip()]}
+        else:
+            data = request.data
+        ids_serializer = BatchIdsSerializer(data=data)
+        ids_serializer.is_valid(raise_exception=True)
+        ids = list(dict.fromkeys(ids_serializer.validated_data["ids"]))
+
+        found = {obj.pk: obj for obj in self.get_queryset().filter(pk__in=ids)}
+        serializer = self.get_serializer([found[pk] for pk in ids if pk in found], many=True)
+        return Response({"results": serializer.data, "missing": [pk for pk in ids if pk not in found]})
@@ -0,0 +1,46 @@
+import json
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator that trusts PostgreSQL's row estimate for large result sets.
+
+    Unfiltered querysets use ``pg_class.reltuples``; filtered ones use the planner estimate from
+    ``EXPLAIN``. Either way no rows are scanned. Only when the estimate is below
+    ADMIN_ESTIMATED_COUNT_THRESHOLD, where an exact COUNT(*) is cheap, is the real count returned.
+    Other database backends always count exactly.
+    """
+
+    @cached_property
+    def count(self):
+        estimate = self._estimate()
+        if estimate is not None and estimate > settings.ADMIN_ESTIMATED_COUNT_THRESHOLD:
+            return estimate
+        return super().count
+
+    def _estimate(self):
+        queryset = self.object_list
+        if not hasattr(queryset, "query"):
+            return None
+        connection = connections[queryset.db]
+        if connection.vendor != "postgresql":
+            return None
+        with connection.cursor() as cursor:
+            if not queryset.query.where:
+                cursor.execute(
+                    "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                    [queryset.model._meta.db_table],
+                )
+                row = cursor.fetchone()
+                # reltuples is -1 for a table that was never vacuumed or analyzed
+                return row[0] if row and row[0] >= 0 else None
+            sql, params = queryset.order_by().query.sql_with_params()
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
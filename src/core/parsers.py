@@ -0,0 +1,34 @@
+"""orjson-backed drop-in replacement for DRF's JSONParser, and a multipart parser with streaming image uploads."""
+import codecs
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser, MultiPartParser
+
+from core.renderers import FastJSONRenderer, orjson
+from core.uploads import StreamingImageUploadHandler
+
+
+class FastJSONParser(JSONParser):
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        # orjson only reads UTF-8 and always rejects NaN/Infinity, i.e. behaves like STRICT_JSON
+        if orjson is None or not self.strict or codecs.lookup(encoding).name != "utf-8":
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
+
+
+class StreamingMultiPartParser(MultiPartParser):
+    """MultiPartParser that spools files to disk with StreamingImageUploadHandler instead of the global handlers."""
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        request = parser_context["request"]
+        request.upload_handlers = [StreamingImageUploadHandler(request._request)]
+        return super().parse(stream, media_type, parser_context)
@@ -0,0 +1,136 @@
+"""On-demand profiling of single requests for staff users.
+
+``core.middleware.ProfilingMiddleware`` profiles a request only when it carries a token from :func:`make_token`,
+either in the ``X-Profile`` header or the ``_profile`` query parameter, and the authenticated user is the staff
+member the token was issued to. Other requests only pay for a header lookup and a substring test on the raw query
+string.
+
+Profiles are written to PROFILE_DIR as speedscope JSON when ``pyinstrument`` is installed (a sampling profiler,
+low overhead) and as cProfile ``.prof`` files otherwise. The directory is a ring buffer of PROFILE_MAX_FILES
+entries. Only one request per process is profiled at a time, since cProfile hooks the whole interpreter.
+"""
+import cProfile
+import os
+import re
+import tempfile
+import threading
+
+from django.conf import settings
+from django.core import signing
+from django.utils import timezone
+from django.utils.text import slugify
+
+try:
+    import pyinstrument
+    from pyinstrument.renderers import SpeedscopeRenderer
+except ImportError:  # optional dependency
+    pyinstrument = None
+
+SIGNING_SALT = "core.profiling"
+PROFILE_NAME_RE = re.compile(
+    r"^(?P<ts>\d{8}T\d{12})-(?P<method>[A-Z]+)-(?P<path>[\w-]*)-(?P<ms>\d+)ms\.(speedscope\.json|prof)$"
+)
+
+# Held while a request is profiled; see the module docstring
+lock = threading.Lock()
+
+
+class CProfileBackend:
+    extension = "prof"
+
+    def __init__(self):
+        self._profiler = cProfile.Profile()
+
+    def start(self):
+        self._profiler.enable()
+
+    def stop(self):
+        self._profiler.disable()
+
+    def write(self, path):
+        self._profiler.dump_stats(path)
+
+
+class PyinstrumentBackend:
+    extension = "speedscope.json"
+
+    def __init__(self):
+        self._profiler = pyinstrument.Profiler(interval=settings.PROFILE_INTERVAL, async_mode="disabled")
+
+    def start(self):
+        self._profiler.start()
+
+    def stop(self):
+        self._profiler.stop()
+
+    def write(self, path):
+        with open(path, "w") as f:
+            f.write(self._profiler.output(SpeedscopeRenderer()))
+
+
+def get_backend():
+    return PyinstrumentBackend() if pyinstrument is not None else CProfileBackend()
+
+
+def make_token(user):
+    return signing.TimestampSigner(salt=SIGNING_SALT).sign(str(user.pk))
+
+
+def check_token(token, user):
+    if not (user and user.is_active and user.is_staff):
+        return False
+    signer = signing.TimestampSigner(salt=SIGNING_SALT)
+    try:
+        return signer.unsign(token, max_age=settings.PROFILE_TOKEN_MAX_AGE) == str(user.pk)
+    except signing.BadSignature:
+        return False
+
+
+def save_profile(backend, request, duration):
+    """Write the profile into PROFILE_DIR, drop the oldest ones beyond PROFILE_MAX_FILES and return the file name."""
+    os.makedirs(settings.PROFILE_DIR, exist_ok=True)
+    # Microseconds, so that back-to-back profiles neither overwrite each other nor sort out of order
+    stamp = timezone.now().strftime("%Y%m%dT%H%M%S%f")
+    path_slug = slugify(request.path.replace("/", " "))[:60]
+    name = f"{stamp}-{request.method}-{path_slug}-{int(duration * 1000)}ms.{backend.extension}"
+    with tempfile.NamedTemporaryFile(dir=settings.PROFILE_DIR, delete=False) as f:
+        tmp = f.name
+    backend.write(tmp)
+    os.replace(tmp, os.path.join(settings.PROFILE_DIR, name))
+    for old in list_profiles()[settings.PROFILE_MAX_FILES :]:
+        try:
+            os.unlink(os.path.join(settings.PROFILE_DIR, old["name"]))
+        except FileNotFoundError:
+            pass
+    return name
+
+
+def list_profiles():
+    """Stored profiles, newest first, with the request details encoded in their names."""
+    try:
+        entries = os.scandir(settings.PROFILE_DIR)
+    except FileNotFoundError:
+        return []
+    profiles = []
+    with entries:
+        for entry in entries:
+            match = PROFILE_NAME_RE.match(entry.name)
+            if match:
+                profiles.append(
+                    {
+                        "name": entry.name,
+                        "method": match["method"],
+                        "path": match["path"],
+                        "duration_ms": int(match["ms"]),
+                        "size": entry.stat().st_size,
+                        "created_at": timezone.datetime.strptime(match["ts"], "%Y%m%dT%H%M%S%f"),
+                    }
+                )
+    return sorted(profiles, key=lambda p: p["name"], reverse=True)
+
+
+def requested_token(request):
+    token = request.headers.get("X-Profile")
+    if token is None and "_profile=" in request.META.get("QUERY_STRING", ""):
+        token = request.GET.get("_profile")
+    return token
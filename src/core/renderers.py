@@ -0,0 +1,43 @@
+"""orjson-backed drop-in replacement for DRF's JSONRenderer.
+
+Output is byte-for-byte identical to ``rest_framework.renderers.JSONRenderer`` for compact rendering:
+datetimes, dates and times are routed through DRF's encoder (millisecond precision, ``Z`` suffix), as are
+Decimals, lazy translation strings and every other type orjson does not handle itself. Indented output,
+non-default UNICODE_JSON/COMPACT_JSON/STRICT_JSON settings and anything orjson rejects (e.g. integers above
+64 bits) fall back to the stdlib implementation. Floats in exponent notation are the one known difference
+(``1e16`` vs ``1e+16``), and so are NaN/Infinity, which orjson renders as ``null`` instead of raising.
+"""
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # a pyproject.toml dependency; the stdlib path keeps working without it
+    orjson = None
+
+_default = JSONEncoder().default
+_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+
+
+class FastJSONRenderer(JSONRenderer):
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None
+            or data is None
+            or self.ensure_ascii
+            or not self.compact
+            or not self.strict
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=_default, option=_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Same strict-javascript-subset escaping as DRF
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
@@ -0,0 +1,79 @@
+"""OpenAPI schema served as a prebuilt artifact instead of being generated per request.
+
+``manage.py build_schema`` writes the schema to OPENAPI_SCHEMA_PATH on deploy. Each process loads it once
+(or generates it once when the file is missing, e.g. in development) and keeps the rendered bytes per
+format in memory, tagged with a content hash for conditional requests.
+"""
+import hashlib
+import json
+import os
+import tempfile
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from drf_spectacular.renderers import OpenApiJsonRenderer2
+from drf_spectacular.settings import spectacular_settings
+from drf_spectacular.utils import extend_schema
+from drf_spectacular.views import SCHEMA_KWARGS, SpectacularAPIView
+
+_schema = None
+_rendered = {}
+
+
+def generate_schema():
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS()
+    return generator.get_schema(request=None, public=True)
+
+
+def write_schema(path=None):
+    """Generate the schema and atomically replace the artifact; returns its content hash."""
+    path = path or settings.OPENAPI_SCHEMA_PATH
+    content = OpenApiJsonRenderer2().render(generate_schema())
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=os.path.dirname(path), delete=False) as f:
+        f.write(content)
+    os.replace(f.name, path)
+    return hashlib.sha256(content).hexdigest()
+
+
+def get_schema():
+    global _schema
+    if _schema is None:
+        try:
+            with open(settings.OPENAPI_SCHEMA_PATH, "rb") as f:
+                _schema = json.load(f)
+        except FileNotFoundError:
+            _schema = generate_schema()
+    return _schema
+
+
+def get_rendered_schema(renderer):
+    """Return ``(content, etag)`` for the schema rendered by ``renderer``, rendering at most once."""
+    key = renderer.media_type
+    if key not in _rendered:
+        content = renderer.render(get_schema(), renderer_context={})
+        _rendered[key] = (content, f'"{hashlib.sha256(content).hexdigest()[:32]}"')
+    return _rendered[key]
+
+
+def reset_schema_cache():
+    global _schema
+    _schema = None
+    _rendered.clear()
+
+
+class CachedSpectacularAPIView(SpectacularAPIView):
+    """SpectacularAPIView that serves the prebuilt schema with ETag support."""
+
+    @extend_schema(**SCHEMA_KWARGS)
+    def get(self, request, *args, **kwargs):
+        renderer = request.accepted_renderer
+        content, etag = get_rendered_schema(renderer)
+        if etag in request.headers.get("If-None-Match", ""):
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(content, content_type=request.accepted_media_type or renderer.media_type)
+        response["ETag"] = etag
+        response["Cache-Control"] = "public, max-age=0, must-revalidate"
+        response["Vary"] = "Accept"
+        return response
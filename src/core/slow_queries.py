@@ -0,0 +1,181 @@
+"""Slow query log aggregated in Redis, with EXPLAIN plans captured off the request path.
+
+``core.middleware.SlowQueryLogMiddleware`` times every statement of a request through ``execute_wrapper``. A sample
+(SLOW_QUERY_SAMPLE_RATE) of those slower than SLOW_QUERY_THRESHOLD_MS is grouped by :func:`core.sql.fingerprint`,
+together with the view and the innermost project stack frame that issued it. The first sighting of a SELECT
+fingerprint enqueues ``core.tasks.explain_slow_query``, which runs ``EXPLAIN (FORMAT JSON)`` (never ``ANALYZE``) for
+that example in a worker and then discards its bind parameters; no other parameters are stored. Entries expire
+SLOW_QUERY_RETENTION_DAYS after their last sighting. ``manage.py slow_queries`` prints the fingerprints with the
+highest total time.
+"""
+import hashlib
+import json
+import logging
+import os
+import random
+import time
+import traceback
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+from kombu.exceptions import OperationalError
+from redis.exceptions import RedisError
+
+from .cache import get_redis_client, redis_key
+from .sql import fingerprint
+
+logger = logging.getLogger(__name__)
+
+_THIS_FILE = os.path.abspath(__file__)
+
+# Seconds an unexplained example (with its bind parameters) survives, should the EXPLAIN task never run
+EXAMPLE_TTL = 3600
+
+
+def _key(*parts):
+    return redis_key("slowq", *parts)
+
+
+def _caller_frame():
+    """``path:line in function`` of the innermost frame in project code, skipping this module and libraries."""
+    base = str(settings.BASE_DIR.parent)
+    for frame in reversed(traceback.extract_stack()):
+        filename = os.path.abspath(frame.filename)
+        if filename.startswith(base) and filename != _THIS_FILE and "site-packages" not in filename:
+            return f"{os.path.relpath(filename, base)}:{frame.lineno} in {frame.name}"
+    return ""
+
+
+def _view_name(request):
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return request.path
+    return match.view_name or match._func_path
+
+
+class QueryTimer:
+    """``execute_wrapper`` that records sampled statements slower than SLOW_QUERY_THRESHOLD_MS."""
+
+    def __init__(self, request):
+        self.request = request
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000
+            if duration_ms >= settings.SLOW_QUERY_THRESHOLD_MS and random.random() < settings.SLOW_QUERY_SAMPLE_RATE:
+                record(sql, None if many else params, duration_ms, _view_name(self.request), _caller_frame())
+
+
+def _explainable(sql, params):
+    return params is not None and sql.lstrip().upper().startswith(("SELECT", "WITH"))
+
+
+def record(sql, params, duration_ms, view="", frame=""):
+    normalized = fingerprint(sql)
+    digest = hashlib.sha1(normalized.encode()).hexdigest()[:16]
+    client = get_redis_client()
+    if client is None:
+        logger.warning("Slow query (%.0f ms) from %s at %s: %s", duration_ms, view, frame, normalized)
+        return
+    key = _key(digest)
+    retention = settings.SLOW_QUERY_RETENTION_DAYS * 86400
+    try:
+        pipe = client.pipeline(transaction=False)
+        pipe.zincrby(_key("total"), duration_ms, digest)
+        pipe.expire(_key("total"), retention)
+        pipe.hincrby(key, "count", 1)
+        pipe.hincrbyfloat(key, "total_ms", duration_ms)
+        pipe.hset(
+            key,
+            mapping={
+                "fingerprint": normalized,
+                "sql": sql,
+                "view": view,
+                "frame": frame,
+                "last_ms": round(duration_ms, 1),
+                "last_seen": timezone.now().isoformat(),
+            },
+        )
+        pipe.expire(key, retention)
+        pipe.hsetnx(key, "explain_requested", timezone.now().isoformat())
+        explain_now = pipe.execute()[-1] and _explainable(sql, params)
+        if explain_now:
+            # Bind parameters can hold personal data: kept only until the worker has run EXPLAIN with them
+            example = json.dumps({"sql": sql, "params": params}, default=str)
+            client.set(_key(digest, "example"), example, ex=EXAMPLE_TTL)
+    except RedisError:
+        logger.debug("Could not record slow query", exc_info=True)
+        return
+    if explain_now:
+        request_explain(client, digest)
+
+
+def request_explain(client, digest):
+    from .tasks import explain_slow_query
+
+    # Runs inside the execute wrapper: a broker outage must not fail, or mask the error of, the query itself
+    try:
+        explain_slow_query.apply_async((digest,), retry=False)
+    except OperationalError:
+        logger.warning("Could not queue EXPLAIN for slow query %s", digest, exc_info=True)
+        try:
+            client.hdel(_key(digest), "explain_requested")  # so the next sighting asks again
+        except RedisError:
+            logger.debug("Could not reset the EXPLAIN request", exc_info=True)
+
+
+def explain(digest):
+    """Store the JSON plan of the fingerprint's first example; returns it, or ``None`` when it cannot be explained.
+
+    The example and its parameters are deleted whether or not a plan could be captured.
+    """
+    client = get_redis_client()
+    if client is None:
+        return None
+    pipe = client.pipeline(transaction=False)
+    pipe.get(_key(digest, "example"))
+    pipe.delete(_key(digest, "example"))
+    example = pipe.execute()[0]
+    if example is None or connection.vendor != "postgresql":
+        return None
+    example = json.loads(example)
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {example['sql']}", example["params"])
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    pipe = client.pipeline(transaction=False)
+    pipe.hset(_key(digest), mapping={"plan": json.dumps(plan), "explained_at": timezone.now().isoformat()})
+    pipe.expire(_key(digest), settings.SLOW_QUERY_RETENTION_DAYS * 86400)
+    pipe.execute()
+    return plan
+
+
+def top(n=20):
+    """The ``n`` fingerprints with the highest total time, slowest first, as dicts."""
+    client = get_redis_client()
+    if client is None:
+        return []
+    entries = []
+    for digest, total_ms in client.zrevrange(_key("total"), 0, n - 1, withscores=True):
+        digest = digest.decode() if isinstance(digest, bytes) else digest
+        entry = {k.decode(): v.decode() for k, v in client.hgetall(_key(digest)).items()}
+        if not entry:  # expired after SLOW_QUERY_RETENTION_DAYS
+            continue
+        entry.update(digest=digest, total_ms=total_ms, count=int(entry.get("count", 0)))
+        entry["plan"] = json.loads(entry["plan"]) if "plan" in entry else None
+        entries.append(entry)
+    return entries
+
+
+def reset():
+    client = get_redis_client()
+    if client is None:
+        return
+    digests = client.zrange(_key("total"), 0, -1)
+    keys = [_key(d.decode() if isinstance(d, bytes) else d) for d in digests]
+    client.unlink(_key("total"), *keys)
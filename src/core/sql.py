@@ -0,0 +1,20 @@
+"""SQL normalization shared by the query-count test helpers and query logging."""
+import re
+
+_PLACEHOLDER_RE = re.compile(r"%s|%\(\w+\)s")
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"(?<![\w.\"])-?\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\bIN \((?:\s*\?\s*,?)+\)", re.I)
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def fingerprint(sql):
+    """Normalize ``sql`` so statements differing only in parameters compare equal.
+
+    Literals and ``%s`` placeholders become ``?`` and ``IN`` lists collapse to ``IN (...)``.
+    """
+    sql = _PLACEHOLDER_RE.sub("?", sql)
+    sql = _STRING_RE.sub("?", sql)
+    sql = _NUMBER_RE.sub("?", sql)
+    sql = _IN_LIST_RE.sub("IN (...)", sql)
+    return _WHITESPACE_RE.sub(" ", sql).strip()
@@ -0,0 +1,144 @@
+"""Celery task metrics aggregated in Redis and served in the Prometheus text format (``/metrics/``).
+
+Signal handlers run in every process that receives or executes tasks and add their observations to a single
+Redis hash, so one scrape of any web process covers all web and worker processes without a per-process exporter.
+Recorded per task name:
+
+- ``celery_task_queue_seconds``: enqueue-to-start latency, from an ``enqueued_at`` header stamped at publish time
+- ``celery_task_runtime_seconds``: execution time
+- ``celery_task_payload_bytes``: message body size, as received by the worker
+- ``celery_task_total`` by final state and ``celery_task_retries_total``
+
+Recording never raises; when Redis is unavailable observations are simply lost.
+"""
+import logging
+import time
+
+from celery.signals import before_task_publish, task_postrun, task_prerun, task_received, task_retry
+from redis.exceptions import RedisError
+
+from .cache import get_redis_client, redis_key
+
+logger = logging.getLogger(__name__)
+
+SECONDS_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1, 5, 30, 60, 300)
+HISTOGRAMS = {
+    "celery_task_queue_seconds": ("Time between publishing a task and a worker starting it.", SECONDS_BUCKETS),
+    "celery_task_runtime_seconds": ("Task execution time.", SECONDS_BUCKETS),
+    "celery_task_payload_bytes": (
+        "Serialized task message body size.",
+        (256, 1024, 4096, 16384, 65536, 262144, 1048576),
+    ),
+}
+COUNTERS = {
+    "celery_task_total": ("Finished tasks by final state.", "state"),
+    "celery_task_retries_total": ("Task retries.", None),
+}
+
+_started = {}
+
+
+def metrics_key():
+    return redis_key("metrics", "celery")
+
+
+def _observe(pipe, metric, task, value):
+    # Buckets are stored non-cumulative (one increment per observation) and accumulated when rendering
+    le = next((str(bound) for bound in HISTOGRAMS[metric][1] if value <= bound), "+Inf")
+    pipe.hincrby(metrics_key(), f"{metric}|{task}|{le}", 1)
+    pipe.hincrbyfloat(metrics_key(), f"{metric}|{task}|sum", value)
+    pipe.hincrby(metrics_key(), f"{metric}|{task}|count", 1)
+
+
+def record(task, observations=(), counters=()):
+    """Store ``(metric, value)`` histogram observations and ``(metric, label)`` counter increments in one round trip."""
+    client = get_redis_client()
+    if client is None:
+        return
+    try:
+        pipe = client.pipeline(transaction=False)
+        for metric, value in observations:
+            _observe(pipe, metric, task, value)
+        for metric, label in counters:
+            pipe.hincrby(metrics_key(), f"{metric}|{task}|{label or ''}", 1)
+        pipe.execute()
+    except RedisError:
+        logger.debug("Could not record task metrics", exc_info=True)
+
+
+def _enqueued_at(request):
+    # Worker requests expose message headers as attributes; eager ones keep them under ``headers``
+    return getattr(request, "enqueued_at", None) or (getattr(request, "headers", None) or {}).get("enqueued_at")
+
+
+@before_task_publish.connect
+def stamp_published_task(headers=None, **kwargs):
+    # Publishing happens on the request path: only stamp the header, the worker records everything else
+    headers["enqueued_at"] = time.time()
+
+
+@task_received.connect
+def record_task_received(request=None, **kwargs):
+    # The body exactly as kombu delivered it, so the size costs no re-serialization; messages in the legacy
+    # protocols arrive already decoded and are not measured
+    if isinstance(request.body, bytes | str):
+        record(request.name, observations=[("celery_task_payload_bytes", len(request.body))])
+
+
+@task_prerun.connect
+def mark_task_started(task_id=None, task=None, **kwargs):
+    _started[task_id] = (time.monotonic(), time.time())
+
+
+@task_postrun.connect
+def record_task_finished(task_id=None, task=None, state=None, **kwargs):
+    started = _started.pop(task_id, None)
+    if started is None:
+        return
+    observations = [("celery_task_runtime_seconds", time.monotonic() - started[0])]
+    enqueued_at = _enqueued_at(task.request)
+    if enqueued_at:
+        observations.append(("celery_task_queue_seconds", max(started[1] - float(enqueued_at), 0)))
+    record(task.name, observations, counters=[("celery_task_total", state)])
+
+
+@task_retry.connect
+def record_task_retry(sender=None, **kwargs):
+    record(sender.name, counters=[("celery_task_retries_total", None)])
+
+
+def _number(value):
+    return f"{value:.6f}".rstrip("0").rstrip(".") if isinstance(value, float) else str(value)
+
+
+def format_metrics(data):
+    """Render the stored hash (``{field: value}``, bytes or str) in the Prometheus text exposition format."""
+    values = {}
+    for field, value in data.items():
+        field = field.decode() if isinstance(field, bytes) else field
+        value = value.decode() if isinstance(value, bytes) else str(value)
+        metric, task, suffix = field.split("|", 2)
+        values.setdefault(metric, {}).setdefault(task, {})[suffix] = float(value) if "." in value else int(value)
+
+    lines = []
+    for metric, (help_text, buckets) in HISTOGRAMS.items():
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} histogram"]
+        for task, series in sorted(values.get(metric, {}).items()):
+            cumulative = 0
+            for le in [*map(str, buckets), "+Inf"]:
+                cumulative += series.get(le, 0)
+                lines.append(f'{metric}_bucket{{task="{task}",le="{le}"}} {cumulative}')
+            lines.append(f'{metric}_sum{{task="{task}"}} {_number(series.get("sum", 0))}')
+            lines.append(f'{metric}_count{{task="{task}"}} {series.get("count", 0)}')
+    for metric, (help_text, label) in COUNTERS.items():
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} counter"]
+        for task, series in sorted(values.get(metric, {}).items()):
+            for label_value, count in sorted(series.items()):
+                labels = f'task="{task}"' + (f',{label}="{label_value}"' if label else "")
+                lines.append(f"{metric}{{{labels}}} {count}")
+    return "\n".join(lines) + "\n"
+
+
+def render_metrics():
+    client = get_redis_client()
+    return format_metrics(client.hgetall(metrics_key()) if client is not None else {})
@@ -0,0 +1,57 @@
+import logging
+
+from celery import shared_task
+from django.apps import apps
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.db import connection
+from django.utils import timezone
+
+from core.maintenance import delete_in_batches, maintenance_job
+from core.media_gc import collect_orphans
+from core.slow_queries import explain
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(ignore_result=True)
+@maintenance_job(lock_timeout=4 * 3600)
+def gc_media():
+    return collect_orphans()
+
+
+@shared_task(ignore_result=True)
+@maintenance_job()
+def analyze_tables(models=None):
+    """Refresh planner statistics for the hot tables between autovacuum runs."""
+    if connection.vendor not in {"postgresql", "sqlite"}:
+        return []
+    tables = [apps.get_model(label)._meta.db_table for label in models or settings.MAINTENANCE_ANALYZE_MODELS]
+    with connection.cursor() as cursor:
+        for table in tables:
+            cursor.execute(f"ANALYZE {connection.ops.quote_name(table)}")
+    return tables
+
+
+@shared_task(ignore_result=True)
+@maintenance_job()
+def prune_expired_sessions():
+    return delete_in_batches(Session.objects.filter(expire_date__lt=timezone.now()), settings.MAINTENANCE_BATCH_SIZE)
+
+
+@shared_task(ignore_result=True)
+@maintenance_job()
+def prune_expired_tokens():
+    """Drop outstanding (and with them blacklisted) refresh tokens past expiry, if the blacklist app is used."""
+    if not apps.is_installed("rest_framework_simplejwt.token_blacklist"):
+        return 0
+    from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+
+    expired = OutstandingToken.objects.filter(expires_at__lt=timezone.now())
+    return delete_in_batches(expired, settings.MAINTENANCE_BATCH_SIZE)
+
+
+@shared_task(ignore_result=True)
+def explain_slow_query(digest):
+    """Capture the plan of a newly seen slow query fingerprint; see core.slow_queries."""
+    explain(digest)
@@ -0,0 +1,74 @@
+"""Query-count assertions for tests.
+
+``query_budget(n)`` fails a block (or decorated test) running more than ``n`` queries; ``no_n_plus_one()`` fails
+when the same statement runs repeatedly with different parameters, the signature of a query issued per row.
+Both work as context managers and decorators and report the repeated statements first.
+"""
+from abc import ABC, abstractmethod
+from collections import Counter
+from contextlib import ContextDecorator
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import CaptureQueriesContext
+
+from core.sql import fingerprint
+
+
+def repeated_queries(queries, threshold=2):
+    """``[(count, fingerprint)]`` for statements captured at least ``threshold`` times, most frequent first."""
+    counts = Counter(fingerprint(query["sql"]) for query in queries)
+    return [(count, sql) for sql, count in counts.most_common() if count >= threshold]
+
+
+def describe_queries(queries):
+    lines = [f"  {count}x {sql}" for count, sql in repeated_queries(queries)]
+    if lines:
+        lines.insert(0, "Repeated statements (possible N+1):")
+    lines.append("Queries:")
+    lines += [f"  {i}. {query['sql']}" for i, query in enumerate(queries, 1)]
+    return "\n".join(lines)
+
+
+class _QueryAssertion(ContextDecorator, ABC):
+    def __init__(self, using=DEFAULT_DB_ALIAS):
+        self.using = using
+
+    def __enter__(self):
+        self.context = CaptureQueriesContext(connections[self.using])
+        return self.context.__enter__()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.context.__exit__(exc_type, exc_value, traceback)
+        if exc_type is None:
+            self.check(self.context.captured_queries)
+        return False
+
+    @abstractmethod
+    def check(self, queries):
+        """Raise ``AssertionError`` if the queries captured in a block that ran cleanly break the assertion."""
+
+
+class query_budget(_QueryAssertion):
+    def __init__(self, n, using=DEFAULT_DB_ALIAS):
+        super().__init__(using)
+        self.n = n
+
+    def _recreate_cm(self):
+        return type(self)(self.n, self.using)
+
+    def check(self, queries):
+        if len(queries) > self.n:
+            raise AssertionError(f"{len(queries)} queries executed, budget is {self.n}\n{describe_queries(queries)}")
+
+
+class no_n_plus_one(_QueryAssertion):
+    def __init__(self, threshold=3, using=DEFAULT_DB_ALIAS):
+        super().__init__(using)
+        self.threshold = threshold
+
+    def _recreate_cm(self):
+        return type(self)(self.threshold, self.using)
+
+    def check(self, queries):
+        if repeated_queries(queries, self.threshold):
+            raise AssertionError(f"Statement repeated {self.threshold}+ times\n{describe_queries(queries)}")
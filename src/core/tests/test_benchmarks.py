@@ -0,0 +1,35 @@
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+
+from core.benchmarks import LATENCY_COLUMNS, latency_summary, query_runner, time_each, time_per_call
+
+
+class TimingTests(SimpleTestCase):
+    def test_time_each_warms_up_untimed(self):
+        calls = []
+        timings = time_each(calls.append, [1, 2, 3])
+        self.assertEqual(calls, [1, 2, 3, 1, 2, 3])
+        self.assertEqual(len(timings), 3)
+        self.assertTrue(all(t >= 0 for t in timings))
+
+        calls.clear()
+        time_each(calls.append, [1, 2], warm_up=False)
+        self.assertEqual(calls, [1, 2])
+
+    def test_time_per_call_is_a_mean(self):
+        calls = []
+        self.assertGreaterEqual(time_per_call(calls.append, range(4)), 0)
+        self.assertEqual(calls, [0, 1, 2, 3])
+
+    def test_latency_summary_lines_up_with_columns(self):
+        summary = latency_summary([float(ms) for ms in range(1, 101)])
+        self.assertEqual(summary.split(), ["50.50", "95.95", "100.00"])
+        self.assertEqual(len(summary), len(LATENCY_COLUMNS))
+        self.assertEqual(latency_summary([2.0]).split(), ["2.00", "2.00", "2.00"])
+
+
+class QueryRunnerTests(TestCase):
+    def test_runs_and_fetches(self):
+        with connection.cursor() as cursor:
+            run = query_runner(cursor, "SELECT %s")
+            self.assertEqual(len(time_each(run, [[1], [2]])), 2)
@@ -0,0 +1,103 @@
+from fnmatch import fnmatchcase
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, override_settings
+
+from core import cache as core_cache
+from core.cache import build_pattern, invalidate, model_cache_key, redis_key
+from pulp_fiction.models import Author, Book
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def memory_usage(self, key):
+        self.commands.append(len(self.redis.keys.get(key, b"")) or None)
+
+    def unlink(self, *keys):
+        self.commands.append(sum(self.redis.keys.pop(key, None) is not None for key in keys))
+        self.redis.unlinks.append(len(keys))
+
+    def execute(self):
+        return self.commands
+
+
+class FakeRedis:
+    """Just enough of redis-py for invalidate(), matching SCAN patterns with the same glob rules."""
+
+    def __init__(self, keys):
+        self.keys = dict.fromkeys(keys, b"value")
+        self.unlinks = []
+
+    def scan_iter(self, match, count):
+        return [key for key in list(self.keys) if fnmatchcase(key, match)]
+
+    def pipeline(self, transaction):
+        return FakePipeline(self)
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "KEY_PREFIX": "proj"}}
+)
+class CacheInvalidationTests(SimpleTestCase):
+    def setUp(self):
+        self.book_7 = cache.make_key(model_cache_key(Book, 7, "list", 1))
+        self.book_8 = cache.make_key(model_cache_key(Book, 8, "list", 1))
+        self.author_7 = cache.make_key(model_cache_key(Author, 7, "all"))
+        self.foreign = [
+            "celery-task-meta-3f2a",
+            "_kombu.binding.celery",
+            "redbeat::schedule",
+            "other:1:pulp_fiction.book:user:7:list:1",
+            redis_key("slowq", "total"),
+        ]
+        self.redis = FakeRedis([self.book_7, self.book_8, self.author_7, *self.foreign])
+        patcher = mock.patch.object(core_cache, "get_redis_client", return_value=self.redis)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def matching(self, pattern):
+        return {key for key in self.redis.keys if fnmatchcase(key, pattern)}
+
+    def test_model_cache_key_layout(self):
+        self.assertEqual(self.book_7, "proj:1:pulp_fiction.book:user:7:list:1")
+
+    def test_patterns_narrow_to_model_and_user(self):
+        self.assertEqual(self.matching(build_pattern(model=Book)), {self.book_7, self.book_8})
+        self.assertEqual(self.matching(build_pattern(user_id=7)), {self.book_7, self.author_7})
+        self.assertEqual(self.matching(build_pattern(model=Book, user_id=7)), {self.book_7})
+
+    def test_default_pattern_stays_within_key_prefix(self):
+        self.assertEqual(build_pattern(), "proj:*")
+        self.assertEqual(self.matching(build_pattern()), {self.book_7, self.book_8, self.author_7})
+
+    def test_invalidate_unlinks_in_batches_and_measures(self):
+        result = invalidate(build_pattern(), batch_size=2)
+        self.assertEqual((result.keys, result.bytes), (3, 3 * len(b"value")))
+        self.assertEqual(self.redis.unlinks, [2, 1])
+        self.assertEqual(sorted(self.redis.keys), sorted(self.foreign))
+
+    def test_command_model_and_user_options(self):
+        out = StringIO()
+        call_command("clear_cache", "--model", "pulp_fiction.Book", "--user", "7", "--no-measure", stdout=out)
+        self.assertIn("Removed 1 keys matching 'proj:*:pulp_fiction.book:user:7:*' (0 bytes)", out.getvalue())
+        self.assertEqual(set(self.redis.keys), {self.book_8, self.author_7, *self.foreign})
+
+    def test_command_default_run_keeps_other_keys(self):
+        call_command("clear_cache", stdout=StringIO())
+        self.assertEqual(sorted(self.redis.keys), sorted(self.foreign))
+
+    def test_command_rejects_unknown_model(self):
+        with self.assertRaisesMessage(CommandError, "pulp_fiction"):
+            call_command("clear_cache", "--model", "pulp_fiction.Missing", stdout=StringIO())
+        self.assertEqual(len(self.redis.keys), 3 + len(self.foreign))
+
+    def test_command_requires_redis(self):
+        no_redis = mock.patch.object(core_cache, "get_redis_client", return_value=None)
+        with no_redis, self.assertRaisesMessage(CommandError, "Redis cache backend"):
+            call_command("clear_cache", stdout=StringIO())
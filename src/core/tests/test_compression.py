@@ -0,0 +1,33 @@
+import gzip
+
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from core.middleware import CompressionMiddleware
+
+
+@override_settings(COMPRESSION_MIN_SIZE=100)
+class CompressionMiddlewareTests(SimpleTestCase):
+    body = b'{"results": [' + b'{"name": "Book"},' * 200 + b"{}]}"
+
+    def _get(self, response, accept="gzip"):
+        request = RequestFactory().get("/api/books/", HTTP_ACCEPT_ENCODING=accept)
+        return CompressionMiddleware(lambda r: response)(request)
+
+    def test_compresses_json(self):
+        resp = self._get(HttpResponse(self.body, content_type="application/json"))
+        self.assertEqual(resp["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(resp.content), self.body)
+        self.assertIn("Accept-Encoding", resp["Vary"])
+
+    def test_skips_small_html_and_unaccepted(self):
+        self.assertFalse(self._get(HttpResponse(b"{}", content_type="application/json")).has_header("Content-Encoding"))
+        self.assertFalse(self._get(HttpResponse(self.body, content_type="text/html")).has_header("Content-Encoding"))
+        resp = self._get(HttpResponse(self.body, content_type="application/json"), accept="gzip;q=0, identity")
+        self.assertFalse(resp.has_header("Content-Encoding"))
+
+    def test_streaming_response(self):
+        chunks = [self.body[i : i + 500] for i in range(0, len(self.body), 500)]
+        resp = self._get(StreamingHttpResponse(iter(chunks), content_type="application/json"))
+        self.assertEqual(resp["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(b"".join(resp.streaming_content)), self.body)
@@ -0,0 +1,77 @@
+import datetime
+import decimal
+import io
+import uuid
+from unittest import skipIf
+
+from django.test import SimpleTestCase
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework import serializers
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from core.parsers import FastJSONParser
+from core.renderers import FastJSONRenderer, orjson
+
+
+class SampleSerializer(serializers.Serializer):
+    name = serializers.CharField()
+    price = serializers.DecimalField(max_digits=6, decimal_places=2)
+    created_at = serializers.DateTimeField()
+
+
+def sample_payloads():
+    now = timezone.now().replace(microsecond=123456)
+    return [
+        {"a": 1, "b": [1, 2.5, None, True, False], "c": "ünïcode ✓"},
+        {"separators": "  and  "},
+        {"aware": now, "utc_no_micro": now.replace(microsecond=0), "date": now.date(), "time": now.time()},
+        {"naive": datetime.datetime(2024, 1, 2, 3, 4, 5, 678901)},
+        {"other_tz": now.astimezone(datetime.timezone(datetime.timedelta(hours=2)))},
+        {"delta": datetime.timedelta(hours=1, microseconds=5)},
+        {"decimal": decimal.Decimal("12.50"), "uuid": uuid.UUID(int=42), "lazy": _("Name")},
+        {1: "int key", "bytes": b"raw"},
+        {"huge": 2**70},
+        SampleSerializer(
+            [{"name": "Book", "price": decimal.Decimal("9.99"), "created_at": now}] * 3, many=True
+        ).data,
+        SampleSerializer({"name": "One", "price": decimal.Decimal("1"), "created_at": now}).data,
+        [],
+        "plain string",
+    ]
+
+
+class FastJSONRendererEquivalenceTests(SimpleTestCase):
+    def test_byte_for_byte_equal_to_drf(self):
+        for payload in sample_payloads():
+            with self.subTest(payload=payload):
+                self.assertEqual(FastJSONRenderer().render(payload), JSONRenderer().render(payload))
+
+    def test_indent_and_none(self):
+        payload = {"a": [1, {"b": 2}]}
+        self.assertEqual(
+            FastJSONRenderer().render(payload, "application/json; indent=4"),
+            JSONRenderer().render(payload, "application/json; indent=4"),
+        )
+        self.assertEqual(FastJSONRenderer().render(None), b"")
+
+    @skipIf(orjson is None, "orjson is not installed")
+    def test_uses_orjson(self):
+        self.assertEqual(FastJSONRenderer().render({"a": 1}), orjson.dumps({"a": 1}))
+
+
+class FastJSONParserEquivalenceTests(SimpleTestCase):
+    def test_parses_like_drf(self):
+        for body in (b'{"a": [1, 2.5, null, true], "b": "\\u00fc\\u2028"}', b"[]", '{"c": "ü"}'.encode()):
+            with self.subTest(body=body):
+                self.assertEqual(FastJSONParser().parse(io.BytesIO(body)), JSONParser().parse(io.BytesIO(body)))
+
+    def test_rejects_what_drf_rejects(self):
+        for body in (b"{", b'{"a": NaN}', b"[Infinity]"):
+            with self.subTest(body=body):
+                with self.assertRaises(ParseError):
+                    JSONParser().parse(io.BytesIO(body))
+                with self.assertRaises(ParseError):
+                    FastJSONParser().parse(io.BytesIO(body))
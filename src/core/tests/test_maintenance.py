@@ -0,0 +1,47 @@
+from unittest import mock
+
+from django.contrib.sessions.backends.db import SessionStore
+from django.contrib.sessions.models import Session
+from django.test import TestCase
+from django.utils import timezone
+
+from core import maintenance
+from core.maintenance import delete_in_batches, maintenance_job
+from core.tasks import analyze_tables, prune_expired_sessions
+
+
+class MaintenanceJobTests(TestCase):
+    def test_skips_while_lock_is_held(self):
+        client = mock.Mock()
+        client.lock.return_value.acquire.return_value = False
+        job = mock.Mock(__name__="job", __module__="tests", return_value=1)
+        with mock.patch.object(maintenance, "get_redis_client", return_value=client):
+            with self.assertLogs("core.maintenance", "INFO") as logs:
+                self.assertIsNone(maintenance_job()(job)())
+        job.assert_not_called()
+        self.assertIn("already running", logs.output[0])
+
+    def test_logs_duration_and_releases_lock(self):
+        client = mock.Mock()
+        client.lock.return_value.acquire.return_value = True
+        with mock.patch.object(maintenance, "get_redis_client", return_value=client):
+            with self.assertLogs("core.maintenance", "INFO") as logs:
+                self.assertEqual(maintenance_job()(lambda: 3)(), 3)
+        client.lock.return_value.release.assert_called_once()
+        self.assertRegex(logs.output[0], r"finished in \d+\.\d\ds: 3")
+
+    def test_prune_expired_sessions_in_batches(self):
+        for expired in (True, True, True, False):
+            store = SessionStore()
+            store.set_expiry(-60 if expired else 60)
+            store.save()
+        self.assertEqual(Session.objects.filter(expire_date__lt=timezone.now()).count(), 3)
+        with self.settings(MAINTENANCE_BATCH_SIZE=2), self.assertNumQueries(5):
+            prune_expired_sessions()
+        self.assertEqual(Session.objects.count(), 1)
+
+    def test_analyze_tables(self):
+        self.assertEqual(analyze_tables(["accounts.User"]), ["accounts_user"])
+
+    def test_delete_in_batches_empty(self):
+        self.assertEqual(delete_in_batches(Session.objects.none(), 10), 0)
@@ -0,0 +1,55 @@
+import os
+import tempfile
+import time
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from core.media_gc import MediaGCStats, find_orphans
+from pulp_fiction.models import Author
+
+
+class GCMediaTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(self.media_root.cleanup)
+        os.makedirs(os.path.join(self.media_root.name, "images", "author"))
+        old = time.time() - 7 * 24 * 3600
+        for name in ("kept.png", "orphan.png", "recent.png"):
+            path = os.path.join(self.media_root.name, "images", "author", name)
+            with open(path, "wb") as f:
+                f.write(b"x" * 10)
+            if name != "recent.png":
+                os.utime(path, (old, old))
+        Author.objects.create(name="Kept", image="images/author/kept.png")
+
+    def _exists(self, name):
+        return os.path.exists(os.path.join(self.media_root.name, "images", "author", name))
+
+    def test_deletes_only_old_unreferenced_files(self):
+        with override_settings(MEDIA_ROOT=self.media_root.name):
+            call_command("gc_media", stdout=StringIO())
+        self.assertTrue(self._exists("kept.png"))
+        self.assertTrue(self._exists("recent.png"))
+        self.assertFalse(self._exists("orphan.png"))
+
+    def test_dry_run_keeps_files(self):
+        with override_settings(MEDIA_ROOT=self.media_root.name):
+            call_command("gc_media", "--dry-run", stdout=StringIO())
+        self.assertTrue(self._exists("orphan.png"))
+
+    def test_scan_phase_deletes_nothing(self):
+        stats = MediaGCStats()
+        orphans = list(find_orphans(stats, root=self.media_root.name, grace_seconds=3600))
+        self.assertEqual([(path, size) for path, _, size in orphans], [("images/author/orphan.png", 10)])
+        self.assertEqual((stats.scanned, stats.skipped_recent, stats.orphaned), (3, 1, 1))
+        self.assertTrue(self._exists("orphan.png"))
+
+    @override_settings(MEDIA_GC_MAX_DELETES_PER_SECOND=4)
+    def test_deletions_throttled_by_default(self):
+        with override_settings(MEDIA_ROOT=self.media_root.name), mock.patch("core.media_gc.time.sleep") as sleep:
+            call_command("gc_media", stdout=StringIO())
+        sleep.assert_called_once_with(0.25)
+        self.assertFalse(self._exists("orphan.png"))
@@ -0,0 +1,38 @@
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase
+
+from core.middleware import (
+    WebAuthenticationMiddleware,
+    WebCsrfViewMiddleware,
+    WebSessionMiddleware,
+    is_restricted_internal_url,
+)
+
+
+def view(request):
+    return HttpResponse()
+
+
+class WebOnlyMiddlewareTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def test_api_routes_skip_session_and_auth(self):
+        api, page = self.factory.get("/api/books/"), self.factory.get("/superadmin/")
+        WebSessionMiddleware(WebAuthenticationMiddleware(view))(api)
+        WebSessionMiddleware(WebAuthenticationMiddleware(view))(page)
+        self.assertFalse(hasattr(api, "session"))
+        self.assertIsInstance(api.user, AnonymousUser)
+        self.assertTrue(hasattr(page, "session"))
+
+    def test_csrf_only_enforced_outside_api(self):
+        middleware = WebCsrfViewMiddleware(view)
+        self.assertIsNone(middleware.process_view(self.factory.post("/api/books/"), view, (), {}))
+        self.assertEqual(middleware.process_view(self.factory.post("/logout/"), view, (), {}).status_code, 403)
+
+    def test_restricted_internal_url(self):
+        self.assertFalse(is_restricted_internal_url("/superadmin/pulp_fiction/"))
+        self.assertFalse(is_restricted_internal_url("/password-reset/"))
+        self.assertTrue(is_restricted_internal_url("/api/books/"))
+        self.assertTrue(is_restricted_internal_url("/"))
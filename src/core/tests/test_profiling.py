@@ -0,0 +1,52 @@
+import os
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from core.middleware import ProfilingMiddleware
+from core.profiling import list_profiles, make_token
+
+
+class ProfilingMiddlewareTests(TestCase):
+    def setUp(self):
+        self.profile_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.profile_dir.cleanup)
+        profile_settings = override_settings(PROFILE_DIR=self.profile_dir.name, PROFILE_MAX_FILES=2)
+        profile_settings.enable()
+        self.addCleanup(profile_settings.disable)
+        User = get_user_model()
+        self.staff = User.objects.create_superuser(email="staff@example.com", name="Staff", password="x")
+        self.middleware = ProfilingMiddleware(lambda request: HttpResponse("ok"))
+
+    def _get(self, user, path="/api/books/", **extra):
+        request = RequestFactory().get(path, **extra)
+        request.user = user
+        return self.middleware(request)
+
+    def test_profiles_with_valid_token_into_ring_buffer(self):
+        token = make_token(self.staff)
+        names = [self._get(self.staff, HTTP_X_PROFILE=token)["X-Profile-Id"] for _ in range(2)]
+        names.append(self._get(self.staff, f"/api/authors/?_profile={token}")["X-Profile-Id"])
+        self.assertEqual([p["name"] for p in list_profiles()], names[:0:-1])
+        self.assertEqual(list_profiles()[0]["path"], "api-authors")
+        self.assertEqual(len(os.listdir(self.profile_dir.name)), 2)
+
+    def test_ignored_without_staff_or_valid_token(self):
+        User = get_user_model()
+        member = User.objects.create_user(email="member@example.com", name="Member", password="x")
+        self.assertNotIn("X-Profile-Id", self._get(member, HTTP_X_PROFILE=make_token(member)))
+        self.assertNotIn("X-Profile-Id", self._get(self.staff, HTTP_X_PROFILE=make_token(member)))
+        self.assertNotIn("X-Profile-Id", self._get(self.staff, HTTP_X_PROFILE="forged"))
+        self.assertEqual(list_profiles(), [])
+
+    def test_admin_listing_and_download(self):
+        name = self._get(self.staff, HTTP_X_PROFILE=make_token(self.staff))["X-Profile-Id"]
+        self.client.force_login(self.staff)
+        resp = self.client.get(reverse("admin-profiles"))
+        self.assertContains(resp, name)
+        resp = self.client.get(reverse("admin-profile-download", args=[name]))
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(self.client.get(reverse("admin-profile-download", args=["..%2Fsecret"])).status_code, 404)
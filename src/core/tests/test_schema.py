@@ -0,0 +1,29 @@
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core.schema import reset_schema_cache
+
+
+class CachedSchemaTests(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "openapi.json")
+        reset_schema_cache()
+        self.addCleanup(reset_schema_cache)
+
+    def test_serves_built_artifact_with_etag(self):
+        with override_settings(OPENAPI_SCHEMA_PATH=self.path):
+            call_command("build_schema", stdout=StringIO())
+            self.assertTrue(os.path.exists(self.path))
+            resp = self.client.get(reverse("schema"), HTTP_ACCEPT="application/json")
+            self.assertEqual(resp.status_code, 200)
+            self.assertIn("/api/authors/", resp.json()["paths"])
+
+            resp = self.client.get(reverse("schema"), HTTP_ACCEPT="application/json", HTTP_IF_NONE_MATCH=resp["ETag"])
+            self.assertEqual(resp.status_code, 304)
@@ -0,0 +1,162 @@
+import json
+from io import StringIO
+from types import SimpleNamespace
+from unittest import mock
+
+from django.contrib.sessions.models import Session
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from kombu.exceptions import OperationalError
+
+from core import slow_queries
+
+
+class FakeRedis:
+    def __init__(self):
+        self.hashes = {}
+        self.zsets = {}
+        self.strings = {}
+        self.ttls = {}
+
+    def pipeline(self, transaction=True):
+        self.results = []
+        return self
+
+    def execute(self):
+        return self.results
+
+    def expire(self, key, seconds):
+        self.ttls[key] = seconds
+        self.results.append(1)
+
+    def set(self, key, value, ex=None):
+        self.strings[key] = value.encode()
+        self.ttls[key] = ex
+
+    def get(self, key):
+        self.results.append(self.strings.get(key))
+
+    def delete(self, *keys):
+        self.results.append(sum(self.strings.pop(key, None) is not None for key in keys))
+
+    def _hash(self, key):
+        return self.hashes.setdefault(key, {})
+
+    def zincrby(self, key, amount, member):
+        zset = self.zsets.setdefault(key, {})
+        zset[member] = zset.get(member, 0) + amount
+        self.results.append(zset[member])
+
+    def hincrby(self, key, field, amount):
+        value = int(self._hash(key).get(field, 0)) + amount
+        self._hash(key)[field] = str(value)
+        self.results.append(value)
+
+    def hincrbyfloat(self, key, field, amount):
+        value = float(self._hash(key).get(field, 0)) + amount
+        self._hash(key)[field] = str(value)
+        self.results.append(value)
+
+    def hset(self, key, mapping):
+        self._hash(key).update({field: str(value) for field, value in mapping.items()})
+        self.results.append(len(mapping))
+
+    def hsetnx(self, key, field, value):
+        added = field not in self._hash(key)
+        self._hash(key).setdefault(field, str(value))
+        self.results.append(int(added))
+
+    def hdel(self, key, *fields):
+        for field in fields:
+            self._hash(key).pop(field, None)
+
+    def hgetall(self, key):
+        return {field.encode(): value.encode() for field, value in self.hashes.get(key, {}).items()}
+
+    def zrevrange(self, key, start, end, withscores=False):
+        ranked = sorted(self.zsets.get(key, {}).items(), key=lambda item: item[1], reverse=True)[start : end + 1]
+        return [(member.encode(), score) for member, score in ranked]
+
+    def zrange(self, key, start, end):
+        return [member.encode() for member in self.zsets.get(key, {})]
+
+    def unlink(self, *keys):
+        for key in keys:
+            self.hashes.pop(key, None)
+            self.zsets.pop(key, None)
+
+
+@override_settings(SLOW_QUERY_THRESHOLD_MS=0, SLOW_QUERY_SAMPLE_RATE=1.0)
+class SlowQueryLogTests(TestCase):
+    def setUp(self):
+        self.redis = FakeRedis()
+        for patcher in (
+            mock.patch.object(slow_queries, "get_redis_client", return_value=self.redis),
+            mock.patch("core.tasks.explain_slow_query.apply_async"),
+        ):
+            self.apply_async = patcher.start()
+            self.addCleanup(patcher.stop)
+        self.request = SimpleNamespace(path="/api/books/", resolver_match=SimpleNamespace(view_name="api:book-list"))
+
+    def run_queries(self, *keys):
+        with connection.execute_wrapper(slow_queries.QueryTimer(self.request)):
+            for key in keys:
+                list(Session.objects.filter(session_key=key))
+
+    def test_groups_by_fingerprint_and_explains_once(self):
+        self.run_queries("a", "b", "c")
+        [entry] = slow_queries.top()
+        self.assertEqual(entry["count"], 3)
+        self.assertIn('"session_key" = ?', entry["fingerprint"])
+        self.assertEqual(entry["view"], "api:book-list")
+        self.assertRegex(entry["frame"], r"^core/tests/test_slow_queries\.py:\d+ in run_queries$")
+        self.assertNotIn("params", entry)
+        self.apply_async.assert_called_once_with((entry["digest"],), retry=False)
+
+    def test_only_select_parameters_are_kept_until_explained(self):
+        self.run_queries("secret")
+        [entry] = slow_queries.top()
+        [(example_key, example)] = self.redis.strings.items()
+        self.assertTrue(example_key.endswith(f"{entry['digest']}:example"))
+        self.assertEqual(json.loads(example)["params"], ["secret"])
+        self.assertEqual(self.redis.ttls[example_key], slow_queries.EXAMPLE_TTL)
+        self.assertEqual(set(self.redis.ttls.values()), {slow_queries.EXAMPLE_TTL, 7 * 86400})
+        with mock.patch.object(connection, "vendor", "sqlite"):
+            slow_queries.explain(entry["digest"])
+        self.assertEqual(self.redis.strings, {})
+
+        with connection.execute_wrapper(slow_queries.QueryTimer(self.request)):
+            Session.objects.filter(session_key="other").update(session_data="secret")
+        self.assertEqual(self.redis.strings, {})
+        self.assertEqual(self.apply_async.call_count, 1)
+
+    def test_broker_outage_does_not_fail_the_query(self):
+        self.apply_async.side_effect = OperationalError
+        with self.assertLogs("core.slow_queries", "WARNING"):
+            self.run_queries("a")
+        [entry] = slow_queries.top()
+        self.assertNotIn("explain_requested", entry)
+        self.apply_async.side_effect = None
+        self.run_queries("b")
+        self.assertEqual(self.apply_async.call_count, 2)
+
+    @override_settings(SLOW_QUERY_SAMPLE_RATE=0)
+    def test_sampling(self):
+        self.run_queries("a")
+        self.assertEqual(slow_queries.top(), [])
+
+    def test_explain_skipped_outside_postgres(self):
+        self.run_queries("a")
+        [entry] = slow_queries.top()
+        with mock.patch.object(connection, "vendor", "sqlite"):
+            self.assertIsNone(slow_queries.explain(entry["digest"]))
+
+    def test_command_reports_and_resets(self):
+        self.run_queries("a")
+        out = StringIO()
+        call_command("slow_queries", stdout=out)
+        self.assertIn("calls 1", out.getvalue())
+        self.assertIn("api:book-list", out.getvalue())
+        call_command("slow_queries", "--reset", stdout=StringIO())
+        self.assertEqual(slow_queries.top(), [])
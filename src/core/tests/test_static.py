@@ -0,0 +1,63 @@
+import json
+import os
+import tempfile
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.signals import request_finished
+from django.db import close_old_connections
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+# The production backend, which config.settings.test swaps out
+STORAGES = {**settings.STORAGES, "staticfiles": {"BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage"}}
+
+
+class StaticPipelineTests(SimpleTestCase):
+    def setUp(self):
+        source = tempfile.TemporaryDirectory()
+        self.static_root = tempfile.TemporaryDirectory()
+        self.addCleanup(source.cleanup)
+        self.addCleanup(self.static_root.cleanup)
+        os.mkdir(os.path.join(source.name, "css"))
+        with open(os.path.join(source.name, "css", "site.css"), "w") as f:
+            f.write("body { margin: 0; padding: 0; }\n" * 100)
+        # Only the files above, so the test does not compress every vendored and admin asset
+        self.static_settings = override_settings(
+            STATIC_ROOT=self.static_root.name,
+            STATICFILES_DIRS=[source.name],
+            STATICFILES_FINDERS=["django.contrib.staticfiles.finders.FileSystemFinder"],
+            STORAGES=STORAGES,
+        )
+        self.static_settings.enable()
+        self.addCleanup(self.static_settings.disable)
+        # Closing a response fires request_finished, whose close_old_connections would touch the database
+        request_finished.disconnect(close_old_connections)
+        self.addCleanup(request_finished.connect, close_old_connections)
+
+    def collectstatic(self):
+        call_command("collectstatic", interactive=False, verbosity=0)
+        with open(os.path.join(self.static_root.name, "staticfiles.json")) as f:
+            return json.load(f)["paths"]["css/site.css"]
+
+    def test_collectstatic_writes_hashed_precompressed_files(self):
+        hashed = self.collectstatic()
+        self.assertRegex(hashed, r"^css/site\.[0-9a-f]{12}\.css$")
+        for suffix in ("", ".gz", ".br"):
+            self.assertTrue(os.path.exists(os.path.join(self.static_root.name, hashed + suffix)), suffix)
+
+    def test_hashed_files_served_precompressed_and_immutable(self):
+        hashed = self.collectstatic()
+        middleware = WhiteNoiseMiddleware(lambda _request: HttpResponse(status=404))
+        factory = RequestFactory()
+
+        response = middleware(factory.get("/static/css/site.css"))
+        self.assertNotIn("immutable", response["Cache-Control"])
+        response.close()
+
+        response = middleware(factory.get(f"/static/{hashed}", HTTP_ACCEPT_ENCODING="br, gzip"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertIn("immutable", response["Cache-Control"])
+        response.close()
@@ -0,0 +1,73 @@
+import time
+from types import SimpleNamespace
+from unittest import mock
+
+from celery.signals import before_task_publish, task_received
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+
+from config.celery import app
+from core import task_metrics
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    def pipeline(self, transaction=True):
+        return self
+
+    def hincrby(self, key, field, amount):
+        self.data[field] = self.data.get(field, 0) + amount
+
+    hincrbyfloat = hincrby
+
+    def execute(self):
+        pass
+
+    def hgetall(self, key):
+        return {field.encode(): str(value).encode() for field, value in self.data.items()}
+
+
+@app.task(name="core.tests.add")
+def add(x, y):
+    return x + y
+
+
+class TaskMetricsTests(SimpleTestCase):
+    def setUp(self):
+        self.redis = FakeRedis()
+        patcher = mock.patch.object(task_metrics, "get_redis_client", return_value=self.redis)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_records_queue_latency_runtime_and_state(self):
+        add.apply((1, 2), headers={"enqueued_at": time.time() - 2})
+        output = task_metrics.render_metrics()
+        self.assertIn('celery_task_queue_seconds_bucket{task="core.tests.add",le="1"} 0', output)
+        self.assertIn('celery_task_queue_seconds_bucket{task="core.tests.add",le="5"} 1', output)
+        self.assertIn('celery_task_runtime_seconds_count{task="core.tests.add"} 1', output)
+        self.assertIn('celery_task_total{task="core.tests.add",state="SUCCESS"} 1', output)
+
+    def test_publish_only_stamps_header(self):
+        headers = {}
+        before_task_publish.send(sender="core.tests.add", body=((1, 2), {}, {}), headers=headers)
+        self.assertAlmostEqual(headers["enqueued_at"], time.time(), delta=5)
+        self.assertEqual(self.redis.data, {})
+
+    def test_worker_records_received_payload_size(self):
+        task_received.send(sender=None, request=SimpleNamespace(name="core.tests.add", body=b"x" * 300))
+        output = task_metrics.render_metrics()
+        self.assertIn('celery_task_payload_bytes_bucket{task="core.tests.add",le="256"} 0', output)
+        self.assertIn('celery_task_payload_bytes_bucket{task="core.tests.add",le="1024"} 1', output)
+        self.assertIn("# TYPE celery_task_retries_total counter", output)
+
+    def test_endpoint_requires_token(self):
+        url = reverse("metrics")
+        with override_settings(METRICS_TOKEN=""):
+            self.assertEqual(self.client.get(url).status_code, 404)
+        with override_settings(METRICS_TOKEN="secret"):
+            self.assertEqual(self.client.get(url).status_code, 401)
+            resp = self.client.get(url, HTTP_AUTHORIZATION="Bearer secret")
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp["Content-Type"].startswith("text/plain; version=0.0.4"))
@@ -0,0 +1,40 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from core.sql import fingerprint
+from core.testing import no_n_plus_one, query_budget, repeated_queries
+
+
+class FingerprintTests(TestCase):
+    def test_literals_and_in_lists_are_normalized(self):
+        self.assertEqual(
+            fingerprint("SELECT \"t1\".\"id\" FROM t1 WHERE id IN (1, 2,3) AND name = 'o''b'  LIMIT 21"),
+            "SELECT \"t1\".\"id\" FROM t1 WHERE id IN (...) AND name = ? LIMIT ?",
+        )
+
+
+class QueryAssertionTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.pks = [User.objects.create_user(email=f"u{i}@example.com", name="U").pk for i in range(3)]
+
+    def fetch_one_by_one(self):
+        for pk in self.pks:
+            get_user_model().objects.get(pk=pk)
+
+    def test_budget_failure_reports_repeated_statement(self):
+        with self.assertRaisesMessage(AssertionError, "3 queries executed, budget is 2") as ctx:
+            with query_budget(2):
+                self.fetch_one_by_one()
+        self.assertIn("3x SELECT", str(ctx.exception))
+
+    def test_decorator_and_n_plus_one(self):
+        query_budget(1)(lambda: list(get_user_model().objects.filter(pk__in=self.pks)))()
+        with self.assertRaises(AssertionError):
+            no_n_plus_one()(self.fetch_one_by_one)()
+        with self.assertNumQueries(3), no_n_plus_one(threshold=4):
+            self.fetch_one_by_one()
+
+    def test_repeated_queries(self):
+        queries = [{"sql": "SELECT 1 WHERE id = 1"}, {"sql": "SELECT 1 WHERE id = 2"}, {"sql": "SELECT 2"}]
+        self.assertEqual(repeated_queries(queries), [(2, "SELECT ? WHERE id = ?")])
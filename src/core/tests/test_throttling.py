@@ -0,0 +1,92 @@
+import time
+from unittest import mock
+
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from redis.exceptions import ConnectionError
+from rest_framework.request import Request
+
+from core import throttling
+from core.middleware import AdmissionControlMiddleware
+from core.throttling import TokenBucketThrottle, parse_rate
+
+
+class ThrottledView:
+    throttle_scope = "heavy"
+
+
+class TokenBucketThrottleTests(SimpleTestCase):
+    def setUp(self):
+        throttling._script = None
+        self.addCleanup(setattr, throttling, "_script", None)
+        self.request = Request(RequestFactory().get("/api/analytics/"))
+        self.request.user = mock.Mock(pk=7, is_authenticated=True)
+
+    def _allow(self, client):
+        throttle = TokenBucketThrottle()
+        with mock.patch.object(throttling, "get_redis_client", return_value=client):
+            return throttle, throttle.allow_request(self.request, ThrottledView())
+
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate("600/min"), (600, 60))
+        self.assertEqual(parse_rate("5/s"), (5, 1))
+
+    @override_settings(REST_FRAMEWORK={"DEFAULT_THROTTLE_RATES": {"heavy": "60/min"}})
+    def test_bucket_key_and_rejection(self):
+        client = mock.Mock()
+        script = client.register_script.return_value
+        script.return_value = [0, 1500]
+        throttle, allowed = self._allow(client)
+        self.assertFalse(allowed)
+        self.assertEqual(throttle.wait(), 1.5)
+        kwargs = script.call_args.kwargs
+        self.assertTrue(kwargs["keys"][0].endswith("-throttle:heavy:ThrottledView:7"))
+        self.assertEqual(kwargs["args"], [60, 60 / 60000, 1])
+
+    @override_settings(REST_FRAMEWORK={"DEFAULT_THROTTLE_RATES": {"heavy": "60/min"}})
+    def test_fails_open(self):
+        self.assertTrue(self._allow(None)[1])
+        client = mock.Mock()
+        client.register_script.return_value.side_effect = ConnectionError
+        with self.assertLogs("core.throttling", "WARNING"):
+            self.assertTrue(self._allow(client)[1])
+
+    def test_anonymous_scope(self):
+        self.request.user = AnonymousUser()
+        self.assertEqual(TokenBucketThrottle().get_scope(self.request, ThrottledView()), "anon")
+
+    def test_anonymous_key_ignores_spoofed_forwarded_for(self):
+        request = Request(RequestFactory().get("/", HTTP_X_FORWARDED_FOR="1.1.1.1, 10.0.0.9", REMOTE_ADDR="10.0.0.2"))
+        key = TokenBucketThrottle().get_cache_key(request, ThrottledView(), "anon")
+        self.assertTrue(key.endswith(":10.0.0.2"))
+        with override_settings(REST_FRAMEWORK={"NUM_PROXIES": 1}):
+            key = TokenBucketThrottle().get_cache_key(request, ThrottledView(), "anon")
+        self.assertTrue(key.endswith(":10.0.0.9"))
+
+
+@override_settings(
+    ADMISSION_TARGET_MS=100, ADMISSION_INTERVAL_MS=0, ADMISSION_RETRY_AFTER=3, ADMISSION_TRUST_REQUEST_START=True
+)
+class AdmissionControlMiddlewareTests(SimpleTestCase):
+    def _get(self, middleware, age_ms=None):
+        headers = {} if age_ms is None else {"HTTP_X_REQUEST_START": f"t={int(time.time() * 1000 - age_ms)}"}
+        return middleware(RequestFactory().get("/api/books/", **headers))
+
+    def test_sheds_while_queueing_delay_is_above_target(self):
+        middleware = AdmissionControlMiddleware(lambda r: HttpResponse())
+        resp = self._get(middleware, age_ms=5000)
+        self.assertEqual(resp.status_code, 503)
+        self.assertEqual(resp["Retry-After"], "3")
+        self.assertEqual(self._get(middleware, age_ms=0).status_code, 200)
+        self.assertEqual(self._get(middleware).status_code, 200)
+
+    @override_settings(ADMISSION_INTERVAL_MS=60000)
+    def test_tolerates_short_spikes(self):
+        middleware = AdmissionControlMiddleware(lambda r: HttpResponse())
+        self.assertEqual(self._get(middleware, age_ms=5000).status_code, 200)
+
+    @override_settings(ADMISSION_TRUST_REQUEST_START=False)
+    def test_ignores_header_unless_trusted(self):
+        middleware = AdmissionControlMiddleware(lambda _request: HttpResponse())
+        self.assertEqual(self._get(middleware, age_ms=5000).status_code, 200)
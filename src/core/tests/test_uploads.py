@@ -0,0 +1,47 @@
+import io
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from PIL import Image
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+
+from core.parsers import StreamingMultiPartParser
+from core.uploads import UploadTooLarge, sniff_image_format
+
+
+def png_bytes(size=(8, 8)):
+    buffer = io.BytesIO()
+    Image.new("RGB", size).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+class StreamingImageUploadTests(SimpleTestCase):
+    def _parse(self, content, name="cover.png"):
+        request = RequestFactory().post("/api/books/", {"name": "Book", "image": SimpleUploadedFile(name, content)})
+        return Request(request, parsers=[StreamingMultiPartParser()]).data
+
+    def test_accepts_image_and_records_header(self):
+        image = self._parse(png_bytes((30, 20)))["image"]
+        self.assertEqual((image.image_format, image.image_size, image.content_type), ("PNG", (30, 20), "image/png"))
+        self.assertTrue(hasattr(image, "temporary_file_path"))
+
+    def test_rejects_non_image_on_first_chunk(self):
+        with self.assertRaises(ValidationError) as ctx:
+            self._parse(b"%PDF-1.7 not an image")
+        self.assertIn("image", ctx.exception.detail)
+
+    @override_settings(IMAGE_UPLOAD_MAX_PIXELS=100)
+    def test_rejects_oversized_dimensions_without_decoding(self):
+        with self.assertRaises(ValidationError):
+            self._parse(png_bytes((20, 20)))
+
+    @override_settings(IMAGE_UPLOAD_MAX_BYTES=64, DATA_UPLOAD_MAX_MEMORY_SIZE=10_000)
+    def test_rejects_large_upload(self):
+        with self.assertRaises(UploadTooLarge):
+            self._parse(png_bytes() + b"\0" * 1000)
+
+    def test_sniff_image_format(self):
+        self.assertEqual(sniff_image_format(b"RIFF\0\0\0\0WEBPVP8 "), "WEBP")
+        self.assertEqual(sniff_image_format(b"\xff\xd8\xff\xe0"), "JPEG")
+        self.assertIsNone(sniff_image_format(b"<svg"))
@@ -0,0 +1,92 @@
+"""Token-bucket request throttling on the shared Redis instance.
+
+Each (scope, view class, user) triple owns a bucket holding up to ``num`` tokens that refills continuously at
+``num / period``, so a rate of ``"600/min"`` allows bursts of 600 requests and 10 requests/s sustained. Refill and
+spend happen in one Lua script, atomically across all gunicorn workers, using the Redis clock. Rates come from
+``REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"]``; views pick a scope with ``throttle_scope`` (``@action`` accepts it
+as a keyword too) and default to ``"user"``, or ``"anon"`` for unauthenticated requests.
+
+Throttling fails open: without the Redis cache backend, or when Redis errors, requests are let through.
+"""
+import logging
+
+from redis.exceptions import RedisError
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+from .cache import get_redis_client, redis_key
+
+logger = logging.getLogger(__name__)
+
+# KEYS[1] bucket; ARGV capacity, refill per millisecond, cost. Returns {allowed, milliseconds until allowed}.
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local refill = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local time = redis.call("TIME")
+local now = time[1] * 1000 + math.floor(time[2] / 1000)
+local state = redis.call("HMGET", KEYS[1], "tokens", "ts")
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * refill)
+local allowed, wait = 0, 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    wait = math.ceil((cost - tokens) / refill)
+end
+redis.call("HSET", KEYS[1], "tokens", tokens, "ts", now)
+redis.call("PEXPIRE", KEYS[1], math.ceil((capacity - tokens) / refill) + 1000)
+return {allowed, wait}
+"""
+
+PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+_script = None
+
+
+def parse_rate(rate):
+    """``"600/min"`` -> ``(600, 60)``; only the first letter of the period counts, as in DRF."""
+    num, _, period = rate.partition("/")
+    return int(num), PERIODS[period[0]]
+
+
+def take_token(client, key, capacity, period, cost=1):
+    """Spend ``cost`` tokens from the bucket at ``key``; returns ``(allowed, wait_seconds)``."""
+    global _script
+    if _script is None:
+        _script = client.register_script(TOKEN_BUCKET_SCRIPT)
+    allowed, wait_ms = _script(keys=[key], args=[capacity, capacity / (period * 1000), cost], client=client)
+    return bool(allowed), wait_ms / 1000
+
+
+class TokenBucketThrottle(BaseThrottle):
+    def __init__(self):
+        self.wait_seconds = None
+
+    def get_scope(self, request, view):
+        if not request.user or not request.user.is_authenticated:
+            return "anon"
+        return getattr(view, "throttle_scope", None) or "user"
+
+    def get_cache_key(self, request, view, scope):
+        ident = request.user.pk if scope != "anon" else self.get_ident(request)
+        return redis_key("throttle", scope, type(view).__name__, ident)
+
+    def allow_request(self, request, view):
+        scope = self.get_scope(request, view)
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(scope)
+        client = get_redis_client()
+        if rate is None or client is None:
+            return True
+        capacity, period = parse_rate(rate)
+        try:
+            allowed, self.wait_seconds = take_token(client, self.get_cache_key(request, view, scope), capacity, period)
+        except RedisError:
+            logger.warning("Throttle bucket unavailable, letting request through", exc_info=True)
+            return True
+        return allowed
+
+    def wait(self):
+        return self.wait_seconds
@@ -0,0 +1,80 @@
+"""Streaming upload handling for image fields.
+
+Uploads go straight to a temporary file (never memory) and are rejected as early as possible: from the
+Content-Length before any byte is read, as soon as the running size passes IMAGE_UPLOAD_MAX_BYTES, and from the
+magic bytes of the first chunk. Once complete, format and dimensions are read from the image header alone;
+Pillow's lazy ``Image.open`` never decodes pixel data, and files marked as checked skip the full ``verify()``
+pass in the serializer.
+"""
+from django.conf import settings
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from django.template.defaultfilters import filesizeformat
+from PIL import Image
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+
+IMAGE_SIGNATURES = {
+    b"\xff\xd8\xff": "JPEG",
+    b"\x89PNG\r\n\x1a\n": "PNG",
+    b"GIF87a": "GIF",
+    b"GIF89a": "GIF",
+}
+
+
+class UploadTooLarge(APIException):
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    default_detail = "Upload is too large."
+    default_code = "upload_too_large"
+
+
+def sniff_image_format(header):
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "WEBP"
+    for signature, image_format in IMAGE_SIGNATURES.items():
+        if header.startswith(signature):
+            return image_format
+    return None
+
+
+class StreamingImageUploadHandler(TemporaryFileUploadHandler):
+    def _reject(self, message):
+        self.file.close()
+        raise ValidationError({self.field_name: [message]})
+
+    def _too_large(self):
+        return UploadTooLarge(f"Images may not exceed {filesizeformat(settings.IMAGE_UPLOAD_MAX_BYTES)}.")
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        # The body also carries the regular form fields, which Django caps at DATA_UPLOAD_MAX_MEMORY_SIZE
+        if content_length > settings.IMAGE_UPLOAD_MAX_BYTES + settings.DATA_UPLOAD_MAX_MEMORY_SIZE:
+            raise self._too_large()
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.received = 0
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        if self.received > settings.IMAGE_UPLOAD_MAX_BYTES:
+            self.file.close()
+            raise self._too_large()
+        if start == 0 and sniff_image_format(raw_data[:12]) not in settings.IMAGE_UPLOAD_FORMATS:
+            self._reject("Upload a valid image. Supported formats: %s." % ", ".join(settings.IMAGE_UPLOAD_FORMATS))
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        file = super().file_complete(file_size)
+        try:
+            with Image.open(file) as image:
+                image_format, (width, height) = image.format, image.size
+        except (OSError, Image.DecompressionBombError):
+            self._reject("Upload a valid image. The file you uploaded was either not an image or a corrupted image.")
+        if image_format not in settings.IMAGE_UPLOAD_FORMATS:
+            self._reject(f"Unsupported image format {image_format}.")
+        if width * height > settings.IMAGE_UPLOAD_MAX_PIXELS:
+            self._reject(f"Image is too large ({width}x{height} pixels).")
+        file.seek(0)
+        file.content_type = Image.MIME[image_format]
+        file.image_format = image_format
+        file.image_size = (width, height)
+        return file
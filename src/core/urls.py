@@ -1,2 +1,7 @@
+from django.urls import path
 
-urlpatterns = []
+from core import views
+
+urlpatterns = [
+    path("metrics/", views.metrics, name="metrics"),
+]
@@ -1,5 +1,19 @@
+from django.conf import settings
+from django.http import Http404, HttpResponse
 from django.shortcuts import render
+from django.utils.crypto import constant_time_compare
+
+from core.task_metrics import render_metrics
 
 
 def index(request):
     return render(request, "index.html", {})
+
+
+def metrics(request):
+    """Prometheus scrape endpoint; disabled unless METRICS_TOKEN is set, then requires it as a bearer token."""
+    if not settings.METRICS_TOKEN:
+        raise Http404
+    if not constant_time_compare(request.headers.get("Authorization", ""), f"Bearer {settings.METRICS_TOKEN}"):
+        return HttpResponse(status=401)
+    return HttpResponse(render_metrics(), content_type="text/plain; version=0.0.4; charset=utf-8")
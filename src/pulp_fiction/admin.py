@@ -1,3 +1,63 @@
 from django.contrib import admin
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
 
-# Register your models here.
+from core.paginator import EstimatedCountPaginator
+
+from .cache import invalidate_queryset_owners
+from .models import Author, Book
+from .tasks import delete_books, schedule_author_deletion
+
+
+@admin.register(Author)
+class AuthorAdmin(admin.ModelAdmin):
+    list_display = ("name", "created_by", "created_at", "pending_deletion")
+    list_filter = ("pending_deletion",)
+    list_select_related = ("created_by",)
+    search_fields = ("name",)
+    raw_id_fields = ("created_by",)
+    readonly_fields = ("created_at", "updated_at")
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    actions = ["delete_in_background", "clear_image"]
+
+    def delete_model(self, request, obj):
+        schedule_author_deletion(Author.objects.filter(pk=obj.pk))
+
+    def delete_queryset(self, request, queryset):
+        schedule_author_deletion(queryset)
+
+    def delete_in_background(self, request, queryset):
+        # Skips the delete_selected confirmation page, which would collect every related book
+        scheduled = schedule_author_deletion(queryset)
+        self.message_user(request, _("%d author(s) scheduled for deletion.") % len(scheduled))
+
+    delete_in_background.short_description = _("Delete in background")
+
+    def clear_image(self, request, queryset):
+        queryset.update(image="", updated_at=timezone.now())
+        invalidate_queryset_owners(queryset)
+
+    clear_image.short_description = _("Clear image")
+
+
+@admin.register(Book)
+class BookAdmin(admin.ModelAdmin):
+    list_display = ("name", "author_name", "created_by", "created_at")
+    list_select_related = ("created_by",)
+    search_fields = ("name", "author_name")
+    autocomplete_fields = ("author",)
+    raw_id_fields = ("created_by",)
+    readonly_fields = ("created_at", "updated_at")
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    actions = ["clear_image"]
+
+    def delete_queryset(self, request, queryset):
+        delete_books(queryset)
+
+    def clear_image(self, request, queryset):
+        queryset.update(image="", updated_at=timezone.now())
+        invalidate_queryset_owners(queryset)
+
+    clear_image.short_description = _("Clear image")
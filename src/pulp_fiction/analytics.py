@@ -0,0 +1,89 @@
+"""Per-user dashboard statistics served by the analytics endpoint."""
+from django.db.models import Count
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from pulp_fiction.models import Author, Book
+
+
+def build_analytics_payload(user):
+    now = timezone.now()
+    last30 = now - timezone.timedelta(days=30)
+    prev30_start = now - timezone.timedelta(days=60)
+    prev30_end = last30
+
+    user_filter = {"created_by": user} if user else {}
+
+    # Totals
+    total_books = Book.objects.filter(**user_filter).count()
+    total_authors = Author.objects.filter(**user_filter).count()
+
+    # New entities
+    new_books_last30 = Book.objects.filter(created_at__gte=last30, **user_filter).count()
+    new_books_prev30 = Book.objects.filter(created_at__gte=prev30_start, created_at__lt=prev30_end, **user_filter).count()
+    new_authors_last30 = Author.objects.filter(created_at__gte=last30, **user_filter).count()
+    new_authors_prev30 = Author.objects.filter(created_at__gte=prev30_start, created_at__lt=prev30_end, **user_filter).count()
+
+    def pct_change(current: int, prev: int) -> float:
+        if prev == 0:
+            return 0.0 if current == 0 else 100.0
+        return ((current - prev) / prev) * 100.0
+
+    books_growth_pct = pct_change(new_books_last30, new_books_prev30)
+    authors_growth_pct = pct_change(new_authors_last30, new_authors_prev30)
+
+    # Helper to shift months like JS new Date(year, month - i, 1)
+    def shift_month(dt: timezone.datetime, offset: int) -> timezone.datetime:
+        base_month = dt.month - 1
+        total = base_month + offset
+        year = dt.year + total // 12
+        month = total % 12 + 1
+        return timezone.datetime(year=year, month=month, day=1, tzinfo=dt.tzinfo)
+
+    # Determine earliest bucket's first day
+    current_month_start = timezone.datetime(year=now.year, month=now.month, day=1, tzinfo=now.tzinfo)
+    start_month = shift_month(current_month_start, -5)
+
+    # Aggregate per month using TruncMonth
+    book_months = (
+        Book.objects.filter(created_at__gte=start_month, **user_filter)
+        .annotate(month=TruncMonth("created_at"))
+        .values("month")
+        .annotate(count=Count("id"))
+        .order_by("month")
+    )
+    author_months = (
+        Author.objects.filter(created_at__gte=start_month, **user_filter)
+        .annotate(month=TruncMonth("created_at"))
+        .values("month")
+        .annotate(count=Count("id"))
+        .order_by("month")
+    )
+    # Build a dict for quick lookup
+    books_by_month = {bm["month"].date(): bm["count"] for bm in book_months}
+    authors_by_month = {am["month"].date(): am["count"] for am in author_months}
+
+    # Prepare labels and ensure 6 buckets (including current month)
+    buckets = []
+    for i in range(5, -1, -1):
+        month_dt = shift_month(current_month_start, -i)
+        month_key = month_dt.date()
+        label = month_dt.strftime("%b")
+        buckets.append(
+            {
+                "label": label,
+                "books": int(books_by_month.get(month_key, 0)),
+                "authors": int(authors_by_month.get(month_key, 0)),
+            }
+        )
+
+    payload = {
+        "totalBooks": int(total_books),
+        "totalAuthors": int(total_authors),
+        "newBooksLast30": int(new_books_last30),
+        "newAuthorsLast30": int(new_authors_last30),
+        "booksGrowthPct": float(books_growth_pct),
+        "authorsGrowthPct": float(authors_growth_pct),
+        "buckets": buckets,
+    }
+    return payload
@@ -1,11 +1,12 @@
 from rest_framework.routers import SimpleRouter
 
-from pulp_fiction.api.views import AuthorViewSet, BookViewSet, AnalyticsView
+from pulp_fiction.api.views import AuthorViewSet, BookViewSet, AnalyticsView, SyncView
 
 router = SimpleRouter()
 router.register(r"authors", AuthorViewSet, basename="author")
 router.register(r"books", BookViewSet, basename="book")
 router.register(r"analytics", AnalyticsView, basename="analytics")
+router.register(r"sync", SyncView, basename="sync")
 
 api_urlpatterns = [
     *router.urls,
@@ -3,13 +3,18 @@ from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema_field
 
 from core.user_context import get_current_user
-from pulp_fiction.models import Author, Book
+from pulp_fiction.models import Author, Book, Tombstone
 
 
 @extend_schema_field(OpenApiTypes.BINARY)
 class UploadImageField(serializers.ImageField):
     """ImageField that forces OpenAPI spec to render as a binary/file input."""
-    pass
+
+    def to_internal_value(self, data):
+        if getattr(data, "image_format", None):
+            # Header already validated by core.uploads.StreamingImageUploadHandler; skip Pillow's verify() pass
+            return serializers.FileField.to_internal_value(self, data)
+        return super().to_internal_value(data)
 
 
 class AuthorSerializer(serializers.ModelSerializer):
@@ -28,6 +33,48 @@ class AuthorSerializer(serializers.ModelSerializer):
         return None
 
 
+class AuthorWithStatsSerializer(AuthorSerializer):
+    """AuthorSerializer plus the annotations from ``Author.objects.with_book_stats()``."""
+
+    books_count = serializers.IntegerField(read_only=True)
+    latest_book_at = serializers.DateTimeField(read_only=True, allow_null=True)
+
+    class Meta(AuthorSerializer.Meta):
+        fields = AuthorSerializer.Meta.fields + ("books_count", "latest_book_at")
+
+
+class CompactBookSerializer(serializers.ModelSerializer):
+    """Book representation nested under its author, so the author itself is left out."""
+
+    image_url = serializers.SerializerMethodField(read_only=True)
+
+    class Meta:
+        model = Book
+        fields = ("id", "name", "image_url", "created_at", "updated_at")
+        read_only_fields = fields
+
+    def get_image_url(self, obj):
+        request = self.context.get("request")
+        if obj.image and hasattr(obj.image, "url"):
+            return request.build_absolute_uri(obj.image.url) if request else obj.image.url
+        return None
+
+
+class AuthorExpandedSerializer(AuthorWithStatsSerializer):
+    """Author with its prefetched ``expanded_books``; stats fields are kept only with ``book_stats`` context."""
+
+    books = CompactBookSerializer(source="expanded_books", many=True, read_only=True)
+
+    class Meta(AuthorWithStatsSerializer.Meta):
+        fields = AuthorWithStatsSerializer.Meta.fields + ("books",)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if not self.context.get("book_stats"):
+            self.fields.pop("books_count")
+            self.fields.pop("latest_book_at")
+
+
 class AuthorCreateSerializer(serializers.ModelSerializer):
     """
     Serializer for creating/updating Author instances including image upload.
@@ -68,9 +115,9 @@ class BookSerializer(serializers.ModelSerializer):
         model = Book
         fields = (
             "id", "name", "content", "image", "image_url",
-            "author", "author_id", "created_at", "updated_at"
+            "author", "author_id", "author_name", "created_at", "updated_at"
         )
-        read_only_fields = ("id", "created_at", "updated_at", "author", "image_url")
+        read_only_fields = ("id", "created_at", "updated_at", "author", "author_name", "image_url")
 
     def get_image_url(self, obj):
         request = self.context.get("request")
@@ -97,7 +144,9 @@ class BookSerializer(serializers.ModelSerializer):
 
 
 class BookCreateUpdateSerializer(serializers.ModelSerializer):
-    author_id = serializers.PrimaryKeyRelatedField(source="author", queryset=Author.objects.all())
+    author_id = serializers.PrimaryKeyRelatedField(
+        source="author", queryset=Author.objects.filter(pending_deletion=False)
+    )
     image = UploadImageField(required=False, allow_null=True)
 
     class Meta:
@@ -136,3 +185,32 @@ class AnalyticsSerializer(serializers.Serializer):
     booksGrowthPct = serializers.FloatField()
     authorsGrowthPct = serializers.FloatField()
     buckets = MonthBucketSerializer(many=True)
+
+
+class TombstoneSerializer(serializers.ModelSerializer):
+    type = serializers.CharField(source="object_type")
+    id = serializers.IntegerField(source="object_id")
+
+    class Meta:
+        model = Tombstone
+        fields = ("type", "id", "deleted_at")
+
+
+class SyncChangesSerializer(serializers.Serializer):
+    authors = AuthorSerializer(many=True)
+    books = BookSerializer(many=True)
+    deleted = TombstoneSerializer(many=True)
+    cursor = serializers.CharField(help_text="Pass as `since` on the next call.")
+    has_more = serializers.BooleanField(help_text="More changes are pending; call again right away.")
+
+
+class AuthorDeletionScheduledSerializer(serializers.Serializer):
+    task_id = serializers.CharField()
+    status_url = serializers.URLField(help_text="Poll for progress; also sent as the `Location` header.")
+
+
+class AuthorDeletionSerializer(serializers.Serializer):
+    task_id = serializers.CharField()
+    state = serializers.CharField(help_text="`PENDING` until a worker picks the task up, then `PROGRESS`, `SUCCESS`.")
+    deleted = serializers.IntegerField(allow_null=True, help_text="Books deleted so far.")
+    total = serializers.IntegerField(allow_null=True, help_text="Books the author had when the deletion started.")
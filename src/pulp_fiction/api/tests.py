@@ -1,9 +1,25 @@
+import os
+import tempfile
+from types import SimpleNamespace
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.test import override_settings
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
 
 from accounts.models import User
+from core.testing import query_budget
+from pulp_fiction.api.router import router
+from pulp_fiction.cache import warm_user_payloads
 from pulp_fiction.models import Author, Book
+from pulp_fiction.sync import encode_cursor
+from pulp_fiction.tasks import delete_author_in_batches
 
 
 class AuthorBookAPITests(APITestCase):
@@ -55,3 +71,286 @@ class AuthorBookAPITests(APITestCase):
         self.assertEqual(len(resp.data), 1)
         self.assertEqual(resp.data[0]["author"]["id"], self.author.id)
 
+
+class JWTAuthenticatedAPITestCase(APITestCase):
+    """Authenticates with a bearer token so CurrentUserMiddleware scopes querysets to the user."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(email="jwt@example.com", password="testpass123", name="JWT Tester")
+        token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+
+class AuthorDeletionTests(JWTAuthenticatedAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.author = Author.objects.create(name="Prolific", created_by=self.user)
+        Book.objects.bulk_create(
+            Book(name=f"Book {i}", author=self.author, created_by=self.user) for i in range(5)
+        )
+        self.url = reverse("pulp_fiction_api:author-detail", args=[self.author.id])
+
+    def test_small_author_is_deleted_inline(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        with override_settings(MEDIA_ROOT=media_root.name):
+            self.author.image.save("author.png", ContentFile(b"png"))
+            image_path = self.author.image.path
+            with self.captureOnCommitCallbacks(execute=True):
+                resp = self.client.delete(self.url)
+        self.assertEqual(resp.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(Book.objects.filter(author_id=self.author.id).exists())
+        self.assertFalse(os.path.exists(image_path))
+
+    @override_settings(AUTHOR_SYNC_DELETE_MAX_BOOKS=3, AUTHOR_DELETE_BATCH_SIZE=2)
+    def test_prolific_author_is_hidden_then_deleted_in_background(self):
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            resp = self.client.delete(self.url)
+        self.assertEqual(resp.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(resp["Location"], resp.data["status_url"])
+        self.author.refresh_from_db()
+        self.assertTrue(self.author.pending_deletion)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_404_NOT_FOUND)
+
+        for callback in callbacks:
+            callback()
+        self.assertFalse(Author.objects.filter(pk=self.author.id).exists())
+        self.assertFalse(Book.objects.filter(author_id=self.author.id).exists())
+
+    def test_background_progress_is_readable_by_the_owner(self):
+        with self.captureOnCommitCallbacks(execute=False):
+            resp = self.client.delete(self.url + "?background=1")
+        status_url, task_id = resp["Location"], resp.data["task_id"]
+
+        result = SimpleNamespace(state="PENDING", info=None)
+        with mock.patch.object(delete_author_in_batches, "AsyncResult", return_value=result) as async_result:
+            self.assertEqual(self.client.get(status_url).data["state"], "PENDING")
+            async_result.assert_called_once_with(task_id)
+
+            result.state, result.info = "PROGRESS", {"deleted": 2, "total": 5, "created_by": self.user.pk}
+            resp = self.client.get(status_url)
+            self.assertEqual(resp.data, {"task_id": task_id, "state": "PROGRESS", "deleted": 2, "total": 5})
+
+            result.info["created_by"] = self.user.pk + 1
+            self.assertEqual(self.client.get(status_url).status_code, status.HTTP_404_NOT_FOUND)
+
+
+class AuthorBookStatsTests(JWTAuthenticatedAPITestCase):
+    def setUp(self):
+        super().setUp()
+        for i in range(3):
+            author = Author.objects.create(name=f"Author {i}", created_by=self.user)
+            Book.objects.bulk_create(
+                Book(name=f"Book {j}", author=author, created_by=self.user) for j in range(i)
+            )
+
+    def test_list_includes_stats_in_one_query(self):
+        url = reverse("pulp_fiction_api:author-list") + "?book_stats=1"
+        # JWT user lookups (middleware and DRF), page count and the annotated page
+        with self.assertNumQueries(4):
+            resp = self.client.get(url)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual([a["books_count"] for a in resp.data["results"]], [0, 1, 2])
+        self.assertIsNone(resp.data["results"][0]["latest_book_at"])
+        self.assertIsNotNone(resp.data["results"][2]["latest_book_at"])
+
+    def test_stats_are_opt_in(self):
+        resp = self.client.get(reverse("pulp_fiction_api:author-all"))
+        self.assertNotIn("books_count", resp.data[0])
+        resp = self.client.get(reverse("pulp_fiction_api:author-all") + "?book_stats=1")
+        self.assertEqual(resp.data[2]["books_count"], 2)
+
+
+class AuthorExpandBooksTests(JWTAuthenticatedAPITestCase):
+    def setUp(self):
+        super().setUp()
+        for i in range(4):
+            author = Author.objects.create(name=f"Author {i}", created_by=self.user)
+            Book.objects.bulk_create(
+                Book(name=f"Book {j}", author=author, created_by=self.user) for j in range(3 * i)
+            )
+
+    def test_expand_is_one_extra_query_and_bounded(self):
+        url = reverse("pulp_fiction_api:author-all")
+        with self.assertNumQueries(4):  # two JWT user lookups, authors, and one windowed books query
+            resp = self.client.get(url + "?expand=books:2&book_stats=1")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual([len(a["books"]) for a in resp.data], [0, 2, 2, 2])
+        self.assertEqual(resp.data[3]["books_count"], 9)
+        self.assertNotIn("author", resp.data[1]["books"][0])
+
+    def test_default_limit_and_validation(self):
+        url = reverse("pulp_fiction_api:author-list")
+        resp = self.client.get(url + "?expand=books")
+        self.assertEqual(len(resp.data["results"][3]["books"]), 5)
+        self.assertNotIn("books_count", resp.data["results"][3])
+        self.assertEqual(self.client.get(url + "?expand=books:500").status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(url + "?expand=owner").status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class BatchGetTests(JWTAuthenticatedAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.author = Author.objects.create(name="Author", created_by=self.user)
+        self.books = [Book.objects.create(name=f"Book {i}", author=self.author, created_by=self.user) for i in range(3)]
+        other = User.objects.create_user(email="other@example.com", password="password", name="Other")
+        self.foreign = Book.objects.create(
+            name="Foreign", author=Author.objects.create(name="Other", created_by=other), created_by=other
+        )
+
+    def test_get_preserves_order_and_reports_missing(self):
+        ids = [self.books[2].pk, self.foreign.pk, self.books[0].pk, 999999]
+        url = reverse("pulp_fiction_api:book-batch-get")
+        with self.assertNumQueries(3):  # two JWT user lookups and one pk__in query
+            resp = self.client.get(url + "?ids=" + ",".join(map(str, ids)))
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual([b["id"] for b in resp.data["results"]], [self.books[2].pk, self.books[0].pk])
+        self.assertEqual(resp.data["missing"], [self.foreign.pk, 999999])
+
+    def test_post_and_limits(self):
+        url = reverse("pulp_fiction_api:author-batch-get")
+        resp = self.client.post(url, {"ids": [self.author.pk, self.author.pk]}, format="json")
+        self.assertEqual([a["id"] for a in resp.data["results"]], [self.author.pk])
+        self.assertEqual(self.client.post(url, {"ids": []}, format="json").status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(url + "?ids=1,x").status_code, status.HTTP_400_BAD_REQUEST)
+        too_many = list(range(1, settings.BATCH_GET_MAX_IDS + 2))
+        resp = self.client.post(url, {"ids": too_many}, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class BookAuthorNameTests(JWTAuthenticatedAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse("pulp_fiction_api:book-list")
+        for author_name, book_names in (("Zola", ["A", "C"]), ("Austen", ["B"])):
+            author = Author.objects.create(name=author_name, created_by=self.user)
+            for name in book_names:
+                Book.objects.create(name=name, author=author, created_by=self.user)
+
+    def names(self, query):
+        resp = self.client.get(self.url + query)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        return [(book["author_name"], book["name"]) for book in resp.data["results"]]
+
+    def test_sort_and_filter_by_author_name(self):
+        self.assertEqual(self.names("?ordering=author_name"), [("Austen", "B"), ("Zola", "A"), ("Zola", "C")])
+        self.assertEqual(self.names("?ordering=-author_name"), [("Zola", "C"), ("Zola", "A"), ("Austen", "B")])
+        self.assertEqual(self.names("?author_name=Zola"), [("Zola", "A"), ("Zola", "C")])
+        self.assertEqual(self.client.get(self.url + "?ordering=content").status_code, status.HTTP_400_BAD_REQUEST)
+
+
+@override_settings(SYNC_SETTLE_SECONDS=0)
+class SyncChangesTests(JWTAuthenticatedAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse("pulp_fiction_api:sync-changes")
+        self.author = Author.objects.create(name="Author", created_by=self.user)
+        self.books = [Book.objects.create(name=f"Book {i}", author=self.author, created_by=self.user) for i in range(3)]
+
+    def test_full_then_delta_sync(self):
+        resp = self.client.get(self.url)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual((len(resp.data["authors"]), len(resp.data["books"]), resp.data["deleted"]), (1, 3, []))
+        self.assertFalse(resp.data["has_more"])
+
+        self.books[0].name = "Renamed"
+        self.books[0].save()
+        deleted_pk = self.books[1].pk
+        self.books[1].delete()
+        resp = self.client.get(self.url, {"since": resp.data["cursor"]})
+        self.assertEqual(resp.data["authors"], [])
+        self.assertEqual([b["name"] for b in resp.data["books"]], ["Renamed"])
+        self.assertEqual([(d["type"], d["id"]) for d in resp.data["deleted"]], [("book", deleted_pk)])
+
+        resp = self.client.get(self.url, {"since": resp.data["cursor"]})
+        self.assertEqual((resp.data["authors"], resp.data["books"], resp.data["deleted"]), ([], [], []))
+
+    @override_settings(SYNC_PAGE_SIZE=2)
+    def test_pages_by_cursor(self):
+        seen, cursor, has_more = [], None, True
+        while has_more:
+            resp = self.client.get(self.url, {"since": cursor} if cursor else {})
+            seen += [b["id"] for b in resp.data["books"]]
+            cursor, has_more = resp.data["cursor"], resp.data["has_more"]
+        self.assertEqual(seen, [b.pk for b in self.books])
+
+    def test_invalid_and_expired_cursor(self):
+        self.assertEqual(self.client.get(self.url, {"since": "garbage"}).status_code, status.HTTP_400_BAD_REQUEST)
+        old = timezone.now() - timezone.timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS + 1)
+        cursor = encode_cursor({name: (old, None) for name in ("authors", "books", "deleted")})
+        self.assertEqual(self.client.get(self.url, {"since": cursor}).status_code, status.HTTP_410_GONE)
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class UserPayloadCacheTests(JWTAuthenticatedAPITestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        Author.objects.create(name="Cached", created_by=self.user)
+
+    def test_warm_then_invalidate_on_write(self):
+        self.assertEqual(warm_user_payloads(self.user), 2)
+        with self.assertNumQueries(2):  # JWT user lookups in CurrentUserMiddleware and DRF, no author queries
+            resp = self.client.get(reverse("pulp_fiction_api:author-all"))
+        self.assertEqual([a["name"] for a in resp.data], ["Cached"])
+
+        Author.objects.create(name="Fresh", created_by=self.user)
+        resp = self.client.get(reverse("pulp_fiction_api:author-all"))
+        self.assertEqual([a["name"] for a in resp.data], ["Cached", "Fresh"])
+
+
+class QueryCountScalingTests(JWTAuthenticatedAPITestCase):
+    """Every GET endpoint of the router runs the same number of queries for 1, 10 and 100 rows.
+
+    Detail routes are requested for the first row created, whose author also gains a book per added row, so
+    ``?expand=books`` on it covers a growing related set.
+    """
+
+    sizes = (1, 10, 100)
+    param_variants = {"author": [{}, {"expand": "books"}, {"book_stats": "1"}]}
+
+    def endpoints(self):
+        for _, viewset, basename in router.registry:
+            actions = [("list", "list", False)] if hasattr(viewset, "list") else []
+            actions += [("retrieve", "detail", True)] if hasattr(viewset, "retrieve") else []
+            actions += [
+                (a.__name__, a.url_name, a.detail)
+                for a in viewset.get_extra_actions()
+                if "get" in a.mapping and "(?P<" not in a.url_path
+            ]
+            for action_name, url_name, detail in actions:
+                for params in self.param_variants.get(basename, [{}]):
+                    yield viewset, action_name, f"pulp_fiction_api:{basename}-{url_name}", detail, params
+
+    def grow_to(self, size):
+        existing = Author.objects.filter(created_by=self.user).count()
+        authors = Author.objects.bulk_create(
+            Author(name=f"Author {i}", created_by=self.user) for i in range(existing, size)
+        )
+        first = Author.objects.earliest("pk")
+        Book.objects.bulk_create(
+            book
+            for author in authors
+            for book in (
+                Book(name=f"Book by {author.name}", author=author, created_by=self.user),
+                Book(name=f"Sequel {author.name}", author=first, created_by=self.user),
+            )
+        )
+
+    def test_query_count_is_constant(self):
+        baselines = {}
+        for size in self.sizes:
+            self.grow_to(size)
+            for viewset, action_name, url_name, detail, params in self.endpoints():
+                kwargs = {"pk": viewset.queryset.model.objects.earliest("pk").pk} if detail else None
+                url = reverse(url_name, kwargs=kwargs)
+                if action_name == "batch_get":
+                    ids = viewset.queryset.model.objects.values_list("pk", flat=True)[: settings.BATCH_GET_MAX_IDS]
+                    params = {"ids": ",".join(map(str, ids))}
+                key = (url, tuple(params))
+                with self.subTest(url=url, params=params, rows=size):
+                    # The smallest library sets the baseline; larger ones must fit in the same budget
+                    with query_budget(baselines.get(key, float("inf"))) as captured:
+                        resp = self.client.get(url, params)
+                    self.assertEqual(resp.status_code, status.HTTP_200_OK)
+                    baselines.setdefault(key, len(captured))
@@ -1,31 +1,69 @@
-from drf_spectacular.utils import extend_schema, extend_schema_view
-from rest_framework import viewsets
+from celery import states
+from django.conf import settings
+from django.db.models import Prefetch
+from django.urls import reverse
+from django.utils.functional import cached_property
+from drf_spectacular.utils import OpenApiParameter, OpenApiResponse, extend_schema, extend_schema_view
+from rest_framework import status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.parsers import FormParser
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 
-from django.db.models import Count
-from django.db.models.functions import TruncMonth
-from django.utils import timezone
-
-from core.mixins import UserScopedQuerysetMixin
+from core.mixins import BatchRetrieveMixin, UserScopedQuerysetMixin
+from core.parsers import FastJSONParser, StreamingMultiPartParser
 from core.user_context import get_current_user
+from pulp_fiction.cache import get_analytics_payload, get_author_list_payload
 from pulp_fiction.models import Author, Book
+from pulp_fiction.sync import ExpiredCursor, InvalidCursor, collect_changes
+from pulp_fiction.tasks import delete_author, delete_author_in_batches, delete_books, schedule_author_deletion
 
 from .serializers import (
-    AuthorSerializer,
-    BookSerializer,
     AnalyticsSerializer,
     AuthorCreateSerializer,
+    AuthorDeletionScheduledSerializer,
+    AuthorDeletionSerializer,
+    AuthorExpandedSerializer,
+    AuthorSerializer,
+    AuthorWithStatsSerializer,
     BookCreateUpdateSerializer,
+    BookSerializer,
+    SyncChangesSerializer,
+)
+
+BOOK_STATS_PARAMETER = OpenApiParameter(
+    "book_stats",
+    bool,
+    description="Include `books_count` and `latest_book_at`, computed in the same query.",
+)
+EXPAND_DEFAULT_BOOKS = 5
+EXPAND_MAX_BOOKS = 50
+EXPAND_PARAMETER = OpenApiParameter(
+    "expand",
+    str,
+    description=(
+        f"`books` or `books:N` embeds each author's N latest books (default {EXPAND_DEFAULT_BOOKS}, "
+        f"max {EXPAND_MAX_BOOKS}), loaded with one extra query for the whole page."
+    ),
 )
 
+BOOK_ORDERING_FIELDS = ("name", "author_name", "created_at", "updated_at")
+BOOK_LIST_PARAMETERS = [
+    OpenApiParameter("author", int, description="Only books of this author."),
+    OpenApiParameter("author_name", str, description="Only books whose author has exactly this name."),
+    OpenApiParameter(
+        "ordering",
+        str,
+        description=f"One of {', '.join(BOOK_ORDERING_FIELDS)}, `-` prefixed for descending (default `name`).",
+    ),
+]
+
 
 @extend_schema_view(
-    list=extend_schema(responses=AuthorSerializer),
-    retrieve=extend_schema(responses=AuthorSerializer),
+    list=extend_schema(responses=AuthorExpandedSerializer, parameters=[BOOK_STATS_PARAMETER, EXPAND_PARAMETER]),
+    retrieve=extend_schema(responses=AuthorExpandedSerializer, parameters=[BOOK_STATS_PARAMETER, EXPAND_PARAMETER]),
     create=extend_schema(
         request=AuthorCreateSerializer,
         responses=AuthorSerializer,
@@ -41,37 +79,130 @@ from .serializers import (
         responses=AuthorSerializer,
         description="Partially update an author (multipart/form-data with optional image)",
     ),
-    destroy=extend_schema(responses=None),
+    destroy=extend_schema(
+        responses={
+            204: OpenApiResponse(description="Author deleted"),
+            202: OpenApiResponse(
+                AuthorDeletionScheduledSerializer,
+                description="Author hidden, books are being deleted in the background",
+            ),
+        },
+        description=(
+            "Delete an author. Authors with many books (or any author when `?background=1` is passed) "
+            "are hidden immediately and their books are removed in batches by a background task, whose progress "
+            "`status_url` reports."
+        ),
+    ),
 )
-class AuthorViewSet(UserScopedQuerysetMixin, viewsets.ModelViewSet):
-    queryset = Author.objects.all()
+class AuthorViewSet(BatchRetrieveMixin, UserScopedQuerysetMixin, viewsets.ModelViewSet):
+    queryset = Author.objects.filter(pending_deletion=False)
     permission_classes = [IsAuthenticated]
+    throttle_scope = None  # set per action
     lookup_field = "pk"
-    parser_classes = (MultiPartParser, FormParser, JSONParser)
+    parser_classes = (StreamingMultiPartParser, FormParser, FastJSONParser)
 
     def get_serializer_class(self):
         if self.action in {"create", "update", "partial_update"}:
             return AuthorCreateSerializer
+        if self.expand_books is not None:
+            return AuthorExpandedSerializer
+        if self.with_book_stats:
+            return AuthorWithStatsSerializer
         return AuthorSerializer
 
+    def get_serializer_context(self):
+        return {**super().get_serializer_context(), "book_stats": self.with_book_stats}
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+        if self.with_book_stats:
+            qs = qs.with_book_stats()
+        if self.expand_books is not None:
+            # A sliced Prefetch is evaluated with ROW_NUMBER() OVER (PARTITION BY author_id): one query per page
+            latest = Book.objects.order_by("-created_at", "-pk")[: self.expand_books]
+            qs = qs.prefetch_related(Prefetch("books", queryset=latest, to_attr="expanded_books"))
+        return qs
+
+    @cached_property
+    def expand_books(self):
+        """Number of books to embed per author from ``?expand=books[:N]``, or ``None``."""
+        if self.action not in {"list", "retrieve", "all", "batch_get"} or self.request is None:
+            return None
+        expand = self.request.query_params.get("expand")
+        if not expand:
+            return None
+        name, _, limit = expand.partition(":")
+        if name != "books":
+            raise ValidationError({"expand": ["Only `books` can be expanded."]})
+        if not limit:
+            return EXPAND_DEFAULT_BOOKS
+        if not limit.isdigit() or not 1 <= int(limit) <= EXPAND_MAX_BOOKS:
+            raise ValidationError({"expand": [f"Book limit must be between 1 and {EXPAND_MAX_BOOKS}."]})
+        return int(limit)
+
+    @property
+    def with_book_stats(self):
+        if self.action not in {"list", "retrieve", "all", "batch_get"} or self.request is None:
+            return False
+        return self.request.query_params.get("book_stats") in {"1", "true"}
+
     def get_parser_classes(self):  # drf-spectacular will inspect this per action
         if self.action in {"create", "update", "partial_update"}:
-            return [MultiPartParser, FormParser]  # limit to multipart/form-data for write operations
-        return [JSONParser]
+            return [StreamingMultiPartParser, FormParser]  # limit to multipart/form-data for write operations
+        return [FastJSONParser]
+
+    def destroy(self, request, *args, **kwargs):
+        instance = self.get_object()
+        if request.query_params.get("background") in {"1", "true"} or self._has_many_books(instance):
+            task_id = schedule_author_deletion(Author.objects.filter(pk=instance.pk)).get(instance.pk)
+            if task_id is None:  # hidden by a concurrent request since get_object()
+                raise NotFound
+            status_url = request.build_absolute_uri(reverse("pulp_fiction_api:author-deletion", args=[task_id]))
+            serializer = AuthorDeletionScheduledSerializer({"task_id": task_id, "status_url": status_url})
+            return Response(serializer.data, status=status.HTTP_202_ACCEPTED, headers={"Location": status_url})
+        self.perform_destroy(instance)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    def perform_destroy(self, instance):
+        # Books first and in bulk, so deleting the author does not cascade through the per-row delete signals
+        delete_books(instance.books.all())
+        delete_author(instance)
+
+    @extend_schema(responses=AuthorDeletionSerializer, description="Progress of a background author deletion.")
+    @action(detail=False, methods=["get"], url_path=r"deletions/(?P<task_id>[0-9a-f-]{36})")
+    def deletion(self, request, task_id):
+        result = delete_author_in_batches.AsyncResult(task_id)
+        info = result.info if isinstance(result.info, dict) else {}
+        # Unknown and not yet started tasks are both PENDING and carry nothing; anything else must be the user's
+        if result.state != states.PENDING and info.get("created_by") != request.user.pk:
+            raise NotFound
+        return Response(AuthorDeletionSerializer({**info, "task_id": task_id, "state": result.state}).data)
+
+    @staticmethod
+    def _has_many_books(author):
+        limit = settings.AUTHOR_SYNC_DELETE_MAX_BOOKS
+        # Fetch at most limit + 1 ids instead of counting every book of a prolific author
+        return len(author.books.order_by().values_list("pk", flat=True)[: limit + 1]) > limit
 
     @extend_schema(
-        responses=AuthorSerializer(many=True),
+        responses=AuthorExpandedSerializer(many=True),
+        parameters=[BOOK_STATS_PARAMETER, EXPAND_PARAMETER],
         description="Return all authors without pagination."
     )
-    @action(detail=False, methods=["get"], pagination_class=None)
+    @action(detail=False, methods=["get"], pagination_class=None, throttle_scope="heavy")
     def all(self, request):
-        authors = self.get_queryset()
-        serializer = self.get_serializer(authors, many=True)
-        return Response(serializer.data)
+        if self.expand_books is not None:
+            return Response(self.get_serializer(self.get_queryset(), many=True).data)
+        # Served from the per-user cache; cached entries carry relative image URLs
+        authors = [
+            {**author, "image_url": author["image_url"] and request.build_absolute_uri(author["image_url"])}
+            for author in get_author_list_payload(request.user, with_stats=self.with_book_stats)
+        ]
+        return Response(authors)
 
 
 @extend_schema_view(
-    list=extend_schema(responses=BookSerializer),
+    list=extend_schema(responses=BookSerializer, parameters=BOOK_LIST_PARAMETERS),
     retrieve=extend_schema(responses=BookSerializer),
     create=extend_schema(
         request=BookCreateUpdateSerializer,
@@ -89,12 +220,12 @@ class AuthorViewSet(UserScopedQuerysetMixin, viewsets.ModelViewSet):
         description="Partially update a book (multipart/form-data).",
     ),
 )
-class BookViewSet(UserScopedQuerysetMixin, viewsets.ModelViewSet):
-    queryset = Book.objects.select_related("author").all()
+class BookViewSet(BatchRetrieveMixin, UserScopedQuerysetMixin, viewsets.ModelViewSet):
+    queryset = Book.objects.select_related("author").filter(author__pending_deletion=False)
     serializer_class = BookSerializer
     permission_classes = [IsAuthenticated]
     lookup_field = "pk"
-    parser_classes = (MultiPartParser, FormParser, JSONParser)
+    parser_classes = (StreamingMultiPartParser, FormParser, FastJSONParser)
 
     def get_serializer_class(self):
         if self.action in {"create", "update", "partial_update"}:
@@ -103,14 +234,25 @@ class BookViewSet(UserScopedQuerysetMixin, viewsets.ModelViewSet):
 
     def get_parser_classes(self):
         if self.action in {"create", "update", "partial_update"}:
-            return [MultiPartParser, FormParser]
-        return [JSONParser]
+            return [StreamingMultiPartParser, FormParser]
+        return [FastJSONParser]
 
     def get_queryset(self):
         qs = super().get_queryset()
         author_id = self.request.query_params.get("author")
         if author_id:
             qs = qs.filter(author_id=author_id)
+        # author_name is denormalized onto the book, so neither filter nor sort needs the author join
+        author_name = self.request.query_params.get("author_name")
+        if author_name:
+            qs = qs.filter(author_name=author_name)
+        ordering = self.request.query_params.get("ordering")
+        if ordering:
+            field = ordering.removeprefix("-")
+            if field not in BOOK_ORDERING_FIELDS:
+                raise ValidationError({"ordering": [f"Choose one of {', '.join(BOOK_ORDERING_FIELDS)}."]})
+            direction = ordering[: len(ordering) - len(field)]
+            qs = qs.order_by(ordering, *(f"{direction}{tiebreak}" for tiebreak in ("name", "pk") if tiebreak != field))
         return qs
 
 
@@ -119,89 +261,36 @@ class BookViewSet(UserScopedQuerysetMixin, viewsets.ModelViewSet):
 )
 class AnalyticsView(viewsets.ViewSet):
     permission_classes = [IsAuthenticated]
+    throttle_scope = "heavy"
 
     def list(self, request):
-        now = timezone.now()
-        last30 = now - timezone.timedelta(days=30)
-        prev30_start = now - timezone.timedelta(days=60)
-        prev30_end = last30
-
-        user = get_current_user()
-
-        user_filter = {"created_by": user} if user else {}
-
-        # Totals
-        total_books = Book.objects.filter(**user_filter).count()
-        total_authors = Author.objects.filter(**user_filter).count()
-
-        # New entities
-        new_books_last30 = Book.objects.filter(created_at__gte=last30, **user_filter).count()
-        new_books_prev30 = Book.objects.filter(created_at__gte=prev30_start, created_at__lt=prev30_end, **user_filter).count()
-        new_authors_last30 = Author.objects.filter(created_at__gte=last30, **user_filter).count()
-        new_authors_prev30 = Author.objects.filter(created_at__gte=prev30_start, created_at__lt=prev30_end, **user_filter).count()
-
-        def pct_change(current: int, prev: int) -> float:
-            if prev == 0:
-                return 0.0 if current == 0 else 100.0
-            return ((current - prev) / prev) * 100.0
-
-        books_growth_pct = pct_change(new_books_last30, new_books_prev30)
-        authors_growth_pct = pct_change(new_authors_last30, new_authors_prev30)
-
-        # Helper to shift months like JS new Date(year, month - i, 1)
-        def shift_month(dt: timezone.datetime, offset: int) -> timezone.datetime:
-            base_month = dt.month - 1
-            total = base_month + offset
-            year = dt.year + total // 12
-            month = total % 12 + 1
-            return timezone.datetime(year=year, month=month, day=1, tzinfo=dt.tzinfo)
-
-        # Determine earliest bucket's first day
-        current_month_start = timezone.datetime(year=now.year, month=now.month, day=1, tzinfo=now.tzinfo)
-        start_month = shift_month(current_month_start, -5)
-
-        # Aggregate per month using TruncMonth
-        book_months = (
-            Book.objects.filter(created_at__gte=start_month, **user_filter)
-            .annotate(month=TruncMonth("created_at"))
-            .values("month")
-            .annotate(count=Count("id"))
-            .order_by("month")
-        )
-        author_months = (
-            Author.objects.filter(created_at__gte=start_month, **user_filter)
-            .annotate(month=TruncMonth("created_at"))
-            .values("month")
-            .annotate(count=Count("id"))
-            .order_by("month")
-        )
-        # Build a dict for quick lookup
-        books_by_month = {bm["month"].date(): bm["count"] for bm in book_months}
-        authors_by_month = {am["month"].date(): am["count"] for am in author_months}
-
-        # Prepare labels and ensure 6 buckets (including current month)
-        buckets = []
-        for i in range(5, -1, -1):
-            month_dt = shift_month(current_month_start, -i)
-            month_key = month_dt.date()
-            label = month_dt.strftime("%b")
-            buckets.append(
-                {
-                    "label": label,
-                    "books": int(books_by_month.get(month_key, 0)),
-                    "authors": int(authors_by_month.get(month_key, 0)),
-                }
-            )
-
-        payload = {
-            "totalBooks": int(total_books),
-            "totalAuthors": int(total_authors),
-            "newBooksLast30": int(new_books_last30),
-            "newAuthorsLast30": int(new_authors_last30),
-            "booksGrowthPct": float(books_growth_pct),
-            "authorsGrowthPct": float(authors_growth_pct),
-            "buckets": buckets,
-        }
-
+        payload = get_analytics_payload(get_current_user())
         serializer = AnalyticsSerializer(payload)
         return Response(serializer.data)
+
+
+class SyncView(viewsets.ViewSet):
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter("since", str, description="`cursor` from the previous call; omit for a full sync."),
+        ],
+        responses={
+            200: SyncChangesSerializer,
+            410: OpenApiResponse(description="The cursor is older than the tombstone retention; sync from scratch."),
+        },
+        description="Authors and books created or updated, and ids deleted, since the given cursor.",
+    )
+    @action(detail=False, url_path="changes")
+    def changes(self, request):
+        try:
+            changes, cursor, has_more = collect_changes(get_current_user(), request.query_params.get("since"))
+        except ExpiredCursor as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_410_GONE)
+        except InvalidCursor as exc:
+            raise ValidationError({"since": str(exc)})
+        serializer = SyncChangesSerializer(
+            {**changes, "cursor": cursor, "has_more": has_more}, context={"request": request}
+        )
+        return Response(serializer.data)
@@ -0,0 +1,68 @@
+"""Read-through cache for the per-user payloads hit on every dashboard load.
+
+Both payloads are stored without request context (relative image URLs) so they can be precomputed by
+Celery; views absolutize URLs on the way out. Entries are dropped by signals whenever a user's authors or
+books change and otherwise expire after USER_PAYLOAD_CACHE_TIMEOUT seconds.
+"""
+from django.conf import settings
+from django.core.cache import cache
+
+from core.cache import model_cache_key
+from pulp_fiction.analytics import build_analytics_payload
+from pulp_fiction.api.serializers import AuthorSerializer, AuthorWithStatsSerializer
+from pulp_fiction.models import Author, Book
+
+
+def analytics_cache_key(user_id):
+    return model_cache_key(Book, user_id, "analytics")
+
+
+def author_list_cache_key(user_id, with_stats=False):
+    return model_cache_key(Author, user_id, "all", "stats") if with_stats else model_cache_key(Author, user_id, "all")
+
+
+def build_author_list_payload(user, with_stats=False):
+    authors = Author.objects.filter(created_by=user, pending_deletion=False)
+    if with_stats:
+        return list(AuthorWithStatsSerializer(authors.with_book_stats(), many=True).data)
+    return list(AuthorSerializer(authors, many=True).data)
+
+
+def get_analytics_payload(user):
+    return cache.get_or_set(
+        analytics_cache_key(user.pk), lambda: build_analytics_payload(user), settings.USER_PAYLOAD_CACHE_TIMEOUT
+    )
+
+
+def get_author_list_payload(user, with_stats=False):
+    return cache.get_or_set(
+        author_list_cache_key(user.pk, with_stats),
+        lambda: build_author_list_payload(user, with_stats),
+        settings.USER_PAYLOAD_CACHE_TIMEOUT,
+    )
+
+
+def invalidate_user_payloads(user_id):
+    cache.delete_many(
+        [analytics_cache_key(user_id), author_list_cache_key(user_id), author_list_cache_key(user_id, with_stats=True)]
+    )
+
+
+def invalidate_queryset_owners(queryset):
+    """Invalidate payloads of every owner in ``queryset``; for bulk updates that bypass signals."""
+    owner_ids = queryset.order_by().exclude(created_by=None).values_list("created_by_id", flat=True).distinct()
+    for owner_id in owner_ids:
+        invalidate_user_payloads(owner_id)
+
+
+def warm_user_payloads(user, force=False):
+    """Precompute and store both payloads for ``user``; returns the number of entries written."""
+    builders = {
+        analytics_cache_key(user.pk): build_analytics_payload,
+        author_list_cache_key(user.pk): build_author_list_payload,
+    }
+    if not force:
+        cached = cache.get_many(list(builders))
+        builders = {key: build for key, build in builders.items() if key not in cached}
+    cache.set_many({key: build(user) for key, build in builders.items()}, settings.USER_PAYLOAD_CACHE_TIMEOUT)
+    return len(builders)
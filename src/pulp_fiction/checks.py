@@ -0,0 +1,48 @@
+from django.core.checks import Error, Tags, register
+from django.db import connections, migrations
+from django.db.migrations.loader import MigrationLoader
+
+from .partitioning import partition_count
+
+
+def _alters_book_pk(operation):
+    if isinstance(operation, migrations.SeparateDatabaseAndState):
+        return any(_alters_book_pk(op) for op in operation.database_operations)
+    if getattr(operation, "model_name_lower", None) != "book":
+        return False
+    if isinstance(operation, migrations.AlterField | migrations.RemoveField):
+        return operation.name_lower == "id"
+    if isinstance(operation, migrations.RenameField):
+        return operation.old_name_lower == "id"
+    if isinstance(operation, migrations.AddField):
+        return operation.field.primary_key
+    return False
+
+
+@register(Tags.database)
+def check_partitioned_book_pk(app_configs, databases=None, **kwargs):
+    """Refuse unapplied migrations that change Book's primary key once the table is hash partitioned.
+
+    The partitioned table has no PRIMARY KEY constraint (see pulp_fiction.partitioning), while the migration state
+    still has ``Book.id`` as the primary key, so the schema editor would alter a constraint that does not exist.
+    """
+    errors = []
+    for alias in databases or ():
+        connection = connections[alias]
+        if not partition_count(connection):
+            continue
+        loader = MigrationLoader(connection)
+        for key, migration in loader.disk_migrations.items():
+            if key in loader.applied_migrations or not any(map(_alters_book_pk, migration.operations)):
+                continue
+            errors.append(
+                Error(
+                    f"Migration {key[0]}.{key[1]} changes Book's primary key, but the book table is partitioned "
+                    "and has no PRIMARY KEY constraint.",
+                    hint="Wrap the operation in SeparateDatabaseAndState and write the SQL for the partitioned "
+                    "table by hand (any new unique constraint must include created_by_id).",
+                    obj=f"{key[0]}.{key[1]}",
+                    id="pulp_fiction.E001",
+                )
+            )
+    return errors
@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db.models import F, OuterRef, Subquery
+from django.utils import timezone
+
+from pulp_fiction.models import Author, Book
+
+
+class Command(BaseCommand):
+    help = "Copy author names onto books whose denormalized author_name is missing or out of date."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=settings.MAINTENANCE_BATCH_SIZE, help="Books checked per UPDATE."
+        )
+
+    def handle(self, *args, **options):
+        author_name = Subquery(Author.objects.filter(pk=OuterRef("author_id")).values("name")[:1])
+        updated, last_pk = 0, 0
+        while True:
+            pks = list(
+                Book.objects.filter(pk__gt=last_pk).order_by("pk").values_list("pk", flat=True)[: options["batch_size"]]
+            )
+            if not pks:
+                break
+            stale = Book.objects.filter(pk__in=pks).exclude(author_name=F("author__name"))
+            # Bump updated_at like signals.sync_author_name, so delta sync clients pick the change up
+            updated += stale.update(author_name=author_name, updated_at=timezone.now())
+            last_pk = pks[-1]
+        self.stdout.write(f"Updated {updated} books.")
@@ -0,0 +1,114 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from core.benchmarks import LATENCY_COLUMNS, latency_summary, query_runner, time_each
+
+PLAIN = "bench_book_plain"
+PARTITIONED = "bench_book_hashed"
+
+# Mirrors pulp_fiction_book: unique_together, Meta.indexes and the foreign key indexes
+COLUMNS = """
+    id bigint NOT NULL,
+    name varchar(255) NOT NULL,
+    content text NOT NULL,
+    author_id bigint NOT NULL,
+    created_by_id bigint,
+    created_at timestamptz NOT NULL,
+    updated_at timestamptz NOT NULL,
+    image varchar(100)
+"""
+INDEXES = (
+    "UNIQUE (name, author_id, created_by_id)",
+    "(name, author_id, created_by_id)",
+    "(created_by_id, updated_at)",
+    "(author_id)",
+    "(created_by_id)",
+)
+
+QUERIES = {
+    # BookViewSet.list: first page and its COUNT(*)
+    "list": "SELECT * FROM {table} WHERE created_by_id = %(user)s ORDER BY name LIMIT 20",
+    "count": "SELECT count(*) FROM {table} WHERE created_by_id = %(user)s",
+    # analytics: books per month over the last six months
+    "analytics": (
+        "SELECT date_trunc('month', created_at), count(*) FROM {table} "
+        "WHERE created_by_id = %(user)s AND created_at >= now() - interval '6 months' GROUP BY 1 ORDER BY 1"
+    ),
+}
+
+
+class Command(BaseCommand):
+    help = "Compare book list and analytics query latency on a plain and a hash partitioned copy (PostgreSQL)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=50_000_000, help="Books generated per table.")
+        parser.add_argument("--users", type=int, default=10_000, help="Distinct owners.")
+        parser.add_argument("--partitions", type=int, default=32, help="Hash partitions of the partitioned copy.")
+        parser.add_argument("--queries", type=int, default=200, help="Timed executions per query and table.")
+        parser.add_argument("--keep", action="store_true", help="Keep the tables; later runs reuse them.")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("This benchmark requires PostgreSQL.")
+        tables = {PLAIN: 0, PARTITIONED: options["partitions"]}
+        try:
+            for table, partitions in tables.items():
+                self._create(table, partitions, options["rows"], options["users"])
+            # The same random owners for both tables; each query gets an untimed pass to warm the buffer cache
+            users = random.Random(0).choices(range(1, options["users"] + 1), k=options["queries"])
+            params = [{"user": user} for user in users]
+            self.stdout.write(f"{'query':<10} {'table':<18} {LATENCY_COLUMNS}")
+            with connection.cursor() as cursor:
+                for name, sql in QUERIES.items():
+                    for table in tables:
+                        timings = time_each(query_runner(cursor, sql.format(table=table)), params)
+                        self.stdout.write(f"{name:<10} {table:<18} {latency_summary(timings)}")
+        finally:
+            if not options["keep"]:
+                with connection.cursor() as cursor:
+                    cursor.execute(f"DROP TABLE IF EXISTS {PLAIN}, {PARTITIONED}")
+
+    def _create(self, table, partitions, rows, users):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT to_regclass(%s)", [table])
+            if cursor.fetchone()[0] is not None:
+                self.stdout.write(f"Reusing {table}")
+                return
+            self.stdout.write(f"Creating {table} with {rows} rows...")
+            started = time.monotonic()
+            # Partitioned parents cannot be unlogged, only their partitions
+            if partitions:
+                cursor.execute(f"CREATE TABLE {table} ({COLUMNS}) PARTITION BY HASH (created_by_id)")
+            else:
+                cursor.execute(f"CREATE UNLOGGED TABLE {table} ({COLUMNS})")
+            for remainder in range(partitions):
+                cursor.execute(
+                    f"CREATE UNLOGGED TABLE {table}_p{remainder} PARTITION OF {table} "
+                    f"FOR VALUES WITH (MODULUS {partitions}, REMAINDER {remainder})"
+                )
+            for start in range(1, rows + 1, 1_000_000):
+                cursor.execute(
+                    f"""
+                    INSERT INTO {table}
+                    SELECT g, 'Book ' || g, '', 1 + g %% (%(users)s * 20), 1 + (g * 7919) %% %(users)s,
+                        now() - (g %% 730) * interval '1 day', now() - (g %% 365) * interval '1 day', NULL
+                    FROM generate_series(%(start)s, %(end)s) AS g
+                    """,
+                    {"users": users, "start": start, "end": min(start + 999_999, rows)},
+                )
+            # The key pulp_fiction.partitioning gives the partitioned table, or the plain table's primary key
+            cursor.execute(
+                f"ALTER TABLE {table} ADD UNIQUE NULLS NOT DISTINCT (id, created_by_id)"
+                if partitions
+                else f"ALTER TABLE {table} ADD PRIMARY KEY (id)"
+            )
+            for columns in INDEXES:
+                if columns.startswith("UNIQUE"):
+                    cursor.execute(f"ALTER TABLE {table} ADD {columns}")
+                else:
+                    cursor.execute(f"CREATE INDEX ON {table} {columns}")
+            cursor.execute(f"VACUUM ANALYZE {table}")
+            self.stdout.write(f"Created {table} in {time.monotonic() - started:.0f}s")
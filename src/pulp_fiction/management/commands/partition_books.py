@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from pulp_fiction.partitioning import partition_book_table, partition_count
+
+
+class Command(BaseCommand):
+    help = "Hash partition the book table by owner while the application keeps running (PostgreSQL only)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--partitions", type=int, default=settings.BOOK_PARTITIONS, help="Number of partitions.")
+        parser.add_argument("--batch-size", type=int, default=5000, help="Rows copied per transaction.")
+        parser.add_argument("--pause", type=float, default=0, help="Seconds to sleep between batches.")
+        parser.add_argument("--status", action="store_true", help="Only report the current partition count.")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("Book partitioning requires PostgreSQL.")
+        current = partition_count(connection)
+        if options["status"] or current:
+            self.stdout.write(f"Book table has {current} partitions." if current else "Book table is not partitioned.")
+            return
+        if options["partitions"] < 2:
+            raise CommandError("Pass --partitions (at least 2) or set BOOK_PARTITIONS.")
+        copied = partition_book_table(connection, options["partitions"], options["batch_size"], options["pause"])
+        self.stdout.write(f"Book table split into {options['partitions']} partitions, {copied} rows copied.")
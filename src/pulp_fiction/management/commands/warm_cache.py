@@ -0,0 +1,38 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from pulp_fiction.cache import warm_user_payloads
+from pulp_fiction.tasks import recently_active_user_ids, warm_recent_users_cache
+
+
+class Command(BaseCommand):
+    help = "Precompute cached analytics and author list payloads for recently active users."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=settings.CACHE_WARM_ACTIVE_DAYS, help="Login window.")
+        parser.add_argument("--limit", type=int, default=settings.CACHE_WARM_MAX_USERS, help="Maximum users.")
+        parser.add_argument("--concurrency", type=int, default=4, help="Users warmed in parallel.")
+        parser.add_argument("--async", action="store_true", dest="use_celery", help="Enqueue Celery tasks instead.")
+
+    def handle(self, *args, **options):
+        if options["use_celery"]:
+            warm_recent_users_cache.delay(days=options["days"], limit=options["limit"])
+            self.stdout.write("Cache warm-up enqueued.")
+            return
+
+        user_ids = recently_active_user_ids(options["days"], options["limit"])
+        with ThreadPoolExecutor(max_workers=max(options["concurrency"], 1)) as executor:
+            written = sum(executor.map(self._warm, user_ids))
+        self.stdout.write(f"Warmed {written} cache entries for {len(user_ids)} users.")
+
+    @staticmethod
+    def _warm(user_id):
+        try:
+            user = get_user_model().objects.get(pk=user_id)
+            return warm_user_payloads(user, force=True)
+        finally:
+            connection.close()  # each worker thread opens its own connection
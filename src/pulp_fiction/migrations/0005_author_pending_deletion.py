@@ -0,0 +1,18 @@
+# Generated by Django 5.1.15 on 2026-10-19 02:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pulp_fiction', '0004_remove_book_book_name_author_idx_alter_author_name_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='author',
+            name='pending_deletion',
+            field=models.BooleanField(default=False, verbose_name='Pending deletion'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.1.15 on 2026-10-19 03:11
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pulp_fiction', '0005_author_pending_deletion'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_type', models.CharField(choices=[('author', 'Author'), ('book', 'Book')], max_length=16, verbose_name='Object type')),
+                ('object_id', models.BigIntegerField(verbose_name='Object id')),
+                ('deleted_at', models.DateTimeField(auto_now_add=True, verbose_name='Deleted at')),
+            ],
+            options={
+                'verbose_name': 'Tombstone',
+                'verbose_name_plural': 'Tombstones',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='author',
+            index=models.Index(fields=['created_by', 'updated_at'], name='author_creator_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['created_by', 'updated_at'], name='book_creator_updated_idx'),
+        ),
+        migrations.AddField(
+            model_name='tombstone',
+            name='created_by',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Created by'),
+        ),
+        migrations.AddIndex(
+            model_name='tombstone',
+            index=models.Index(fields=['created_by', 'deleted_at'], name='tombstone_creator_deleted_idx'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+from django.conf import settings
+from django.db import migrations
+
+
+def partition_books(apps, schema_editor):
+    """Partition a still empty book table right away (BOOK_PARTITIONS); a populated one is left to the operator.
+
+    Migrations run in the container entrypoint before gunicorn starts, and the online copy of a large table can
+    take hours, so it belongs in ``manage.py partition_books`` rather than in a deploy.
+    """
+    connection = schema_editor.connection
+    if connection.vendor != "postgresql" or not settings.BOOK_PARTITIONS:
+        return
+    from pulp_fiction.partitioning import TABLE, partition_book_table
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT EXISTS (SELECT 1 FROM {TABLE})")
+        populated = cursor.fetchone()[0]
+    if populated:
+        print(
+            f"\n  {TABLE} already holds rows and was left unpartitioned. "
+            "Run `manage.py partition_books` to convert it online."
+        )
+        return
+    partition_book_table(connection, settings.BOOK_PARTITIONS)
+
+
+class Migration(migrations.Migration):
+    # partition_book_table() manages its own transactions
+    atomic = False
+
+    dependencies = [
+        ("pulp_fiction", "0006_sync_tombstones"),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_books, migrations.RunPython.noop),
+    ]
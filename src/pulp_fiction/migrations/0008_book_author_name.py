@@ -0,0 +1,24 @@
+# Generated by Django 5.1.15 on 2026-10-19 03:32
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pulp_fiction', '0007_book_partitioning'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='book',
+            name='author_name',
+            field=models.CharField(blank=True, editable=False, max_length=255, verbose_name='Author name'),
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['created_by', 'author_name', 'name'], name='book_creator_author_name_idx'),
+        ),
+    ]
@@ -1,8 +1,19 @@
+from django.conf import settings
 from django.db import models
+from django.db.models import Count, Max
 from django.utils.translation import gettext_lazy as _
+
 from core.mixins import UserReferenceMixin
 
 
+class AuthorQuerySet(models.QuerySet):
+    def with_book_stats(self):
+        """Annotate ``books_count`` and ``latest_book_at`` in the same query (one GROUP BY over books)."""
+        qs = self.annotate(books_count=Count("books"), latest_book_at=Max("books__created_at"))
+        # Meta.ordering is not applied to GROUP BY queries, which would leave pagination unordered
+        return qs if qs.query.order_by else qs.order_by(*self.model._meta.ordering)
+
+
 class Author(UserReferenceMixin, models.Model):
     name = models.CharField(_("Name"), max_length=255)
     details = models.TextField(_("Details"), blank=True)
@@ -11,20 +22,42 @@ class Author(UserReferenceMixin, models.Model):
 
     image = models.ImageField(_("Image"), upload_to="images/author/", null=True, blank=True)
 
+    # Set while the author's books are being removed in the background (see pulp_fiction.tasks).
+    pending_deletion = models.BooleanField(_("Pending deletion"), default=False)
+
+    objects = AuthorQuerySet.as_manager()
+
     class Meta:
         verbose_name = _("Author")
         verbose_name_plural = _("Authors")
         unique_together = ("name", "created_by")
         ordering = ["name"]
+        indexes = [
+            models.Index(fields=["created_by", "updated_at"], name="author_creator_updated_idx"),
+        ]
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._loaded_name = self.name
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # pulp_fiction.signals.sync_author_name skips the books UPDATE when the name did not change
+        instance._loaded_name = instance.__dict__.get("name")  # noqa: SLF001
+        return instance
+
 
 class Book(UserReferenceMixin, models.Model):
     name = models.CharField(_("Name"), max_length=255)
     content = models.TextField(_("Content"), blank=True)
     author = models.ForeignKey(Author, on_delete=models.CASCADE, related_name="books")
+    # Copy of author.name so books can be listed, sorted and filtered by author without a join; kept in sync by
+    # save() and, on author rename, by pulp_fiction.signals.sync_author_name
+    author_name = models.CharField(_("Author name"), max_length=255, blank=True, editable=False)
     created_at = models.DateTimeField(_("Created at"), auto_now_add=True)
     updated_at = models.DateTimeField(_("Updated at"), auto_now=True)
 
@@ -33,11 +66,62 @@ class Book(UserReferenceMixin, models.Model):
     class Meta:
         verbose_name = _("Book")
         verbose_name_plural = _("Books")
+        # The table may be hash partitioned by created_by (pulp_fiction.partitioning): unique constraints must
+        # include it, and no other table may reference books with a foreign key. A partitioned table has no PRIMARY
+        # KEY constraint although id stays the primary key in the migration state, so migrations must not alter id
+        # (or DEFAULT_AUTO_FIELD) except through SeparateDatabaseAndState; the pulp_fiction.E001 check enforces it
         unique_together = ("name", "author", "created_by")
         ordering = ["name"]
         indexes = [
             models.Index(fields=["name", "author", "created_by"], name="book_name_creator_author_idx"),
+            models.Index(fields=["created_by", "updated_at"], name="book_creator_updated_idx"),
+            models.Index(fields=["created_by", "author_name", "name"], name="book_creator_author_name_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.author_name})"
+
+    def save(self, *args, **kwargs):
+        # A loaded author costs nothing; otherwise only a changed author_id is worth a query
+        author = self._state.fields_cache.get("author")
+        if author is not None:
+            self.author_name = author.name
+        elif self.author_id is not None and self.author_id != getattr(self, "_loaded_author_id", None):
+            self.author_name = Author.objects.values_list("name", flat=True).get(pk=self.author_id)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"author", "author_id"} & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, "author_name"}
+        super().save(*args, **kwargs)
+        self._loaded_author_id = self.author_id
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # save() only looks the author's name up again when author_id moves away from this
+        instance._loaded_author_id = instance.__dict__.get("author_id")  # noqa: SLF001
+        return instance
+
+
+class Tombstone(models.Model):
+    """Deleted author or book, kept for SYNC_TOMBSTONE_RETENTION_DAYS so clients can replay deletions."""
+
+    AUTHOR = "author"
+    BOOK = "book"
+    TYPE_CHOICES = [(AUTHOR, _("Author")), (BOOK, _("Book"))]
+
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+", verbose_name=_("Created by")
+    )
+    object_type = models.CharField(_("Object type"), max_length=16, choices=TYPE_CHOICES)
+    object_id = models.BigIntegerField(_("Object id"))
+    deleted_at = models.DateTimeField(_("Deleted at"), auto_now_add=True)
+
+    class Meta:
+        verbose_name = _("Tombstone")
+        verbose_name_plural = _("Tombstones")
+        indexes = [
+            models.Index(fields=["created_by", "deleted_at"], name="tombstone_creator_deleted_idx"),
         ]
 
     def __str__(self):
-        return f"{self.name} ({self.author.name})"
+        return f"{self.object_type} {self.object_id}"
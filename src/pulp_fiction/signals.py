@@ -0,0 +1,36 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from pulp_fiction.cache import invalidate_user_payloads
+from pulp_fiction.models import Author, Book, Tombstone
+
+
+@receiver([post_save, post_delete], sender=Author)
+@receiver([post_save, post_delete], sender=Book)
+def invalidate_owner_payloads(sender, instance, **kwargs):
+    if instance.created_by_id:
+        invalidate_user_payloads(instance.created_by_id)
+
+
+@receiver(post_delete, sender=Author)
+@receiver(post_delete, sender=Book)
+def record_tombstone(sender, instance, **kwargs):
+    if instance.created_by_id:
+        Tombstone.objects.create(
+            created_by_id=instance.created_by_id,
+            object_type=Tombstone.AUTHOR if sender is Author else Tombstone.BOOK,
+            object_id=instance.pk,
+        )
+
+
+@receiver(post_save, sender=Author)
+def sync_author_name(sender, instance, created, update_fields=None, **kwargs):
+    """Copy a renamed author's name onto its books in one UPDATE (bumping updated_at for delta sync)."""
+    if created or (update_fields is not None and "name" not in update_fields):
+        return
+    if instance.name == getattr(instance, "_loaded_name", None):
+        return
+    Book.objects.filter(author=instance).exclude(author_name=instance.name).update(
+        author_name=instance.name, updated_at=timezone.now()
+    )
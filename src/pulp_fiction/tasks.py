@@ -0,0 +1,131 @@
+from celery import shared_task, uuid
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+
+from core.maintenance import delete_in_batches, maintenance_job
+from pulp_fiction.cache import invalidate_user_payloads, warm_user_payloads
+from pulp_fiction.models import Author, Book, Tombstone
+
+
+def _delete_files(field, names):
+    storage = field.storage
+    for name in names:
+        if name:
+            storage.delete(name)
+
+
+def delete_books(queryset):
+    """Delete the given books with one DELETE, one tombstone INSERT and one cache invalidation per owner.
+
+    Book's post_delete receivers (pulp_fiction.signals) keep Django from fast-deleting and write one tombstone
+    per row, so multi-row deletes go through here instead; ``queryset`` may be sliced. Image files are removed
+    once the transaction commits. Returns the number of books deleted.
+    """
+    with transaction.atomic():
+        rows = list(queryset.select_for_update().values_list("pk", "created_by_id", "image"))
+        if not rows:
+            return 0
+        Tombstone.objects.bulk_create(
+            Tombstone(created_by_id=owner_id, object_type=Tombstone.BOOK, object_id=pk)
+            for pk, owner_id, _ in rows
+            if owner_id
+        )
+        # Nothing references books (see Book.Meta), so one DELETE without the collector or signals is enough
+        deleted = Book.objects.filter(pk__in=[pk for pk, _, _ in rows])._raw_delete(Book.objects.db)  # noqa: SLF001
+        for owner_id in {owner_id for _, owner_id, _ in rows if owner_id}:
+            transaction.on_commit(lambda pk=owner_id: invalidate_user_payloads(pk))
+        images = [image for _, _, image in rows]
+        transaction.on_commit(lambda: _delete_files(Book._meta.get_field("image"), images))
+    return deleted
+
+
+def delete_author(author):
+    """Delete an author whose books are already gone (see :func:`delete_books`), then its image once committed."""
+    image = author.image.name
+    author.delete()
+    transaction.on_commit(lambda: _delete_files(Author._meta.get_field("image"), [image]))
+
+
+def schedule_author_deletion(queryset):
+    """Hide the given authors and hand the removal of their books over to Celery.
+
+    Returns ``{author id: task id}`` for the scheduled authors; the task ids are assigned up front because the
+    tasks are only sent once the transaction commits.
+    """
+    authors = list(queryset.filter(pending_deletion=False).values_list("pk", "created_by_id"))
+    if not authors:
+        return {}
+    task_ids = {pk: uuid() for pk, _ in authors}
+    Author.objects.filter(pk__in=task_ids).update(pending_deletion=True)
+    for owner_id in {owner_id for _, owner_id in authors if owner_id}:
+        invalidate_user_payloads(owner_id)
+    for author_id, task_id in task_ids.items():
+        transaction.on_commit(
+            lambda pk=author_id, task_id=task_id: delete_author_in_batches.apply_async((pk,), task_id=task_id)
+        )
+    return task_ids
+
+
+@shared_task(bind=True, ignore_result=False)
+def delete_author_in_batches(self, author_id, batch_size=None):
+    """Delete an author's books in bounded batches, then the author itself.
+
+    Each batch is its own short transaction (see :func:`delete_books`), so locks are held only for a few hundred
+    rows at a time. Image files are removed from storage once the rows referencing them are gone. Progress and
+    the result carry the author's owner so pulp_fiction.api.views.AuthorViewSet.deletion can check who asks.
+    """
+    batch_size = batch_size or settings.AUTHOR_DELETE_BATCH_SIZE
+    author = Author.objects.filter(pk=author_id).only("pk", "image", "created_by").first()
+    if author is None:
+        return {"deleted": 0, "total": 0, "created_by": None}
+
+    books = Book.objects.filter(author_id=author_id).order_by()
+    progress = {"deleted": 0, "total": books.count(), "created_by": author.created_by_id}
+
+    while batch_deleted := delete_books(books.order_by("pk")[:batch_size]):
+        progress["deleted"] += batch_deleted
+        if not self.request.is_eager:
+            self.update_state(state="PROGRESS", meta=progress)
+
+    delete_author(author)
+    return progress
+
+
+def recently_active_user_ids(days=None, limit=None):
+    """Ids of active users seen in the last ``days`` days, most recent login first."""
+    days = settings.CACHE_WARM_ACTIVE_DAYS if days is None else days
+    limit = settings.CACHE_WARM_MAX_USERS if limit is None else limit
+    since = timezone.now() - timezone.timedelta(days=days)
+    return list(
+        get_user_model()
+        .objects.filter(is_active=True, last_login__gte=since)
+        .order_by("-last_login")
+        .values_list("pk", flat=True)[:limit]
+    )
+
+
+@shared_task(ignore_result=True, rate_limit=settings.CACHE_WARM_RATE_LIMIT)
+def warm_user_cache(user_id, force=False):
+    user = get_user_model().objects.filter(pk=user_id, is_active=True).first()
+    if user is not None:
+        warm_user_payloads(user, force=force)
+
+
+@shared_task(ignore_result=True)
+@maintenance_job(lock_timeout=600)
+def warm_recent_users_cache(days=None, limit=None):
+    """Fan out warm-up of recently active users; the per-task rate limit bounds database load."""
+    user_ids = recently_active_user_ids(days, limit)
+    for user_id in user_ids:
+        warm_user_cache.delay(user_id, force=True)
+    return len(user_ids)
+
+
+@shared_task(ignore_result=True)
+@maintenance_job()
+def prune_tombstones(days=None):
+    days = settings.SYNC_TOMBSTONE_RETENTION_DAYS if days is None else days
+    expired = Tombstone.objects.filter(deleted_at__lt=timezone.now() - timezone.timedelta(days=days))
+    return delete_in_batches(expired, settings.MAINTENANCE_BATCH_SIZE)
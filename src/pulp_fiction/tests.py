@@ -1,7 +1,24 @@
-from django.test import TestCase
+from contextlib import redirect_stdout
+from importlib import import_module
+from io import StringIO
+from types import SimpleNamespace
+from unittest import mock, skipUnless
+
+from django.apps import apps
 from django.contrib.auth import get_user_model
-from core.user_context import set_current_user, clear_current_user
-from .models import Author, Book
+from django.core.management import call_command
+from django.db import IntegrityError, connection, migrations, models, transaction
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from core.user_context import clear_current_user, set_current_user
+
+from .checks import check_partitioned_book_pk
+from .models import Author, Book, Tombstone
+from .partitioning import partition_book_table, partition_count
+from .tasks import delete_author_in_batches, delete_books
 
 
 class UserReferenceMixinTests(TestCase):
@@ -62,3 +79,181 @@ class UserReferenceMixinTests(TestCase):
         clear_current_user()
         self.assertEqual(author.created_by, self.user)
         self.assertEqual(author.updated_by, other)
+
+
+class AdminChangelistQueryCountTests(TestCase):
+    def setUp(self):
+        self.admin = get_user_model().objects.create_superuser(email="admin@example.com", name="Admin", password="x")
+        self.client.force_login(self.admin)
+
+    def _add_books(self, count):
+        for i in range(count):
+            author = Author.objects.create(name=f"Author {Author.objects.count()}", created_by=self.admin)
+            Book.objects.create(name=f"Book {i}", author=author, created_by=self.admin)
+
+    def _changelist_queries(self, model_name):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(reverse(f"admin:pulp_fiction_{model_name}_changelist"))
+        self.assertEqual(resp.status_code, 200)
+        return len(ctx)
+
+    def test_query_count_does_not_grow_with_rows(self):
+        self._add_books(2)
+        baseline = {name: self._changelist_queries(name) for name in ("author", "book")}
+        self._add_books(20)
+        for name, queries in baseline.items():
+            self.assertEqual(self._changelist_queries(name), queries, name)
+
+
+class BookAuthorNameTests(TestCase):
+    def setUp(self):
+        self.author = Author.objects.create(name="Old Name")
+        self.books = [Book.objects.create(name=f"Book {i}", author=self.author) for i in range(3)]
+
+    def test_saved_books_copy_author_name(self):
+        self.assertEqual(self.books[0].author_name, "Old Name")
+        self.books[0].author = Author.objects.create(name="Other")
+        self.books[0].save(update_fields=["author"])
+        self.assertEqual(Book.objects.get(pk=self.books[0].pk).author_name, "Other")
+
+    def test_rename_updates_books_in_one_query(self):
+        self.author.name = "New Name"
+        with self.assertNumQueries(2):  # the author and its books
+            self.author.save()
+        self.assertEqual(set(Book.objects.values_list("author_name", flat=True)), {"New Name"})
+        updated = Book.objects.get(pk=self.books[0].pk).updated_at
+        self.assertGreater(updated, self.books[0].updated_at)
+
+    def test_unchanged_author_is_not_looked_up_again(self):
+        book = Book.objects.get(pk=self.books[0].pk)
+        book.name = "Renamed"
+        with self.assertNumQueries(1):
+            book.save()
+        other = Author.objects.create(name="Other")
+        book.author_id = other.pk
+        with self.assertNumQueries(2):  # the new author's name, then the book
+            book.save()
+        self.assertEqual(Book.objects.get(pk=book.pk).author_name, "Other")
+
+    def test_saving_author_without_rename_skips_books(self):
+        author = Author.objects.get(pk=self.author.pk)
+        author.details = "Edited"
+        with self.assertNumQueries(1):
+            author.save()
+        author.name = "New Name"
+        author.save()
+        author.name = "Old Name"
+        author.save()
+        self.assertEqual(set(Book.objects.values_list("author_name", flat=True)), {"Old Name"})
+
+    def test_backfill_command(self):
+        Book.objects.filter(pk=self.books[0].pk).update(author_name="")
+        before = timezone.now()
+        call_command("backfill_author_names", "--batch-size", "2", stdout=StringIO())
+        self.assertEqual(set(Book.objects.values_list("author_name", flat=True)), {"Old Name"})
+        self.assertEqual(
+            set(Book.objects.filter(updated_at__gte=before).values_list("pk", flat=True)), {self.books[0].pk}
+        )
+
+
+@skipUnless(connection.vendor == "postgresql", "Book partitioning requires PostgreSQL")
+class BookPartitioningTests(TransactionTestCase):
+    # partition_book_table() commits each step itself, so it cannot run inside TestCase's transaction
+
+    def setUp(self):
+        if partition_count(connection):
+            self.skipTest("The test database is already partitioned (BOOK_PARTITIONS)")
+        self.user = get_user_model().objects.create_user(email="owner@example.com", name="Owner", password="x")
+        self.author = Author.objects.create(name="Author", created_by=self.user)
+        self.books = [Book.objects.create(name=f"Book {i}", author=self.author, created_by=self.user) for i in range(5)]
+
+    def write_between_batches(self, seconds):
+        # After the first batch (books 0 and 1): touch copied and not yet copied rows, and add one
+        if Book.objects.filter(name="Added").exists():
+            return
+        Book.objects.filter(pk=self.books[0].pk).update(name="Renamed 0")
+        Book.objects.filter(pk=self.books[1].pk).update(created_by=self.other)
+        Book.objects.filter(pk__in=[self.books[2].pk, self.books[3].pk]).delete()
+        Book.objects.filter(pk=self.books[4].pk).update(name="Renamed 4")
+        Book.objects.create(name="Added", author=self.author, created_by=self.user)
+
+    @override_settings(BOOK_PARTITIONS=4)
+    def test_migration_leaves_populated_table_to_the_command(self):
+        migration = import_module("pulp_fiction.migrations.0007_book_partitioning")
+        with redirect_stdout(StringIO()) as out:
+            migration.partition_books(apps, SimpleNamespace(connection=connection))
+        self.assertEqual(partition_count(connection), 0)
+        self.assertIn("manage.py partition_books", out.getvalue())
+
+    def test_online_conversion_keeps_rows_ids_and_constraints(self):
+        self.other = get_user_model().objects.create_user(email="other@example.com", name="Other", password="x")
+        with mock.patch("pulp_fiction.partitioning.time.sleep", side_effect=self.write_between_batches):
+            # Books 0 and 1; the trigger already mirrored book 4 and the new one when the backfill reaches them
+            self.assertEqual(partition_book_table(connection, 4, batch_size=2, pause=1), 2)
+        self.assertEqual(partition_count(connection), 4)
+        expected = [("Renamed 0", self.user), ("Book 1", self.other), ("Renamed 4", self.user), ("Added", self.user)]
+        self.assertEqual(
+            list(Book.objects.order_by("pk").values_list("name", "created_by")),
+            [(name, user.pk) for name, user in expected],
+        )
+
+        book = Book.objects.create(name="Book 5", author=self.author, created_by=self.user)
+        self.assertGreater(book.pk, Book.objects.get(name="Added").pk)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Book.objects.create(name="Book 5", author=self.author, created_by=self.user)
+        self.assertEqual(partition_book_table(connection, 4), 0)
+
+
+class PartitionedBookPkCheckTests(SimpleTestCase):
+    def migration(self, name, *operations):
+        return type("Migration", (migrations.Migration,), {"operations": list(operations)})(name, "pulp_fiction")
+
+    def check_with(self, partitions, *pending):
+        loader = SimpleNamespace(
+            disk_migrations={("pulp_fiction", m.name): m for m in pending}, applied_migrations={}
+        )
+        with (
+            mock.patch("pulp_fiction.checks.partition_count", return_value=partitions),
+            mock.patch("pulp_fiction.checks.MigrationLoader", return_value=loader),
+        ):
+            return check_partitioned_book_pk(None, databases=["default"])
+
+    def test_flags_pending_pk_changes_on_a_partitioned_table(self):
+        alter_id = migrations.AlterField("book", "id", models.AutoField(primary_key=True))
+        pending = [
+            self.migration("0100_alter_id", alter_id),
+            self.migration("0101_rename_id", migrations.RenameField("Book", "id", "book_id")),
+            self.migration("0102_by_hand", migrations.SeparateDatabaseAndState(state_operations=[alter_id])),
+            self.migration("0103_author_id", migrations.AlterField("author", "id", models.AutoField(primary_key=True))),
+            self.migration("0104_book_name", migrations.AlterField("book", "name", models.CharField(max_length=9))),
+        ]
+        errors = self.check_with(4, *pending)
+        self.assertEqual([e.obj for e in errors], ["pulp_fiction.0100_alter_id", "pulp_fiction.0101_rename_id"])
+        self.assertEqual({e.id for e in errors}, {"pulp_fiction.E001"})
+        self.assertEqual(self.check_with(0, *pending), [])
+
+
+class BulkBookDeletionTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(email="owner@example.com", name="Owner", password="x")
+        self.author = Author.objects.create(name="Author", created_by=self.user)
+        Book.objects.bulk_create(Book(name=f"Book {i}", author=self.author, created_by=self.user) for i in range(5))
+        self.book_ids = list(Book.objects.order_by("pk").values_list("pk", flat=True))
+
+    def test_delete_books_writes_tombstones_in_one_insert(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(delete_books(Book.objects.order_by("pk")[:3]), 3)
+        statements = [q["sql"].split()[0] for q in queries.captured_queries if "SAVEPOINT" not in q["sql"]]
+        self.assertEqual(statements, ["SELECT", "INSERT", "DELETE"])
+        self.assertEqual(
+            sorted(Tombstone.objects.filter(object_type=Tombstone.BOOK).values_list("object_id", flat=True)),
+            self.book_ids[:3],
+        )
+
+    def test_background_deletion_records_every_row(self):
+        delete_author_in_batches.apply(args=[self.author.pk], kwargs={"batch_size": 2})
+        self.assertFalse(Book.objects.exists())
+        self.assertEqual(
+            sorted(Tombstone.objects.values_list("object_type", "object_id")),
+            [("author", self.author.pk)] + [("book", pk) for pk in self.book_ids],
+        )